@@ -1,6 +1,19 @@
 import asyncio
 import json
 import logging
+import mmap
+import os
+import pickle
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Optional, Union
 
@@ -11,6 +24,11 @@ from bs4 import BeautifulSoup
 from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
+
+from .heatmap import ChangeHeatMap
+from .manifestcache import ManifestCache
+from .snapshots import SnapshotStore, columns_from_map, snapshot_key
 
 log = logging.getLogger("red.sabby.denuvowatch")
 
@@ -23,9 +41,17 @@ HEADERS = {
 MANIFESTHUB_OWNER = "SSMGAlt"
 MANIFESTHUB_REPO = "ManifestHub2"
 MANIFESTHUB_RAW = f"https://raw.githubusercontent.com/{MANIFESTHUB_OWNER}/{MANIFESTHUB_REPO}"
+# Concurrent manifest downloads allowed against the ManifestHub2 host, and
+# worker processes used to parse them.
+MANIFESTHUB_CONCURRENCY = 8
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
 
 # HubCapManifest — authenticated API; serves decrypted manifest bundles.
 HUBCAP_BASE = "https://hubcapmanifest.com/api/v1"
+# HubCap ZIPs are spooled to disk in chunks of this size; members larger than
+# the threshold are decompressed to a temp file and mmapped for parsing.
+HUBCAP_CHUNK = 1 << 16
+HUBCAP_SPOOL_THRESHOLD = 8 << 20
 
 # Steam depot manifest section magics (little-endian uint32).
 MANIFEST_PAYLOAD_MAGIC = 0x71F617D0
@@ -34,6 +60,23 @@ MANIFEST_PAYLOAD_MAGIC = 0x71F617D0
 # attached .txt instead of inline embed fields.
 DIFF_INLINE_LIMIT = 25
 
+# How long a key's cached HubCap quota is trusted before re-syncing from
+# /user/stats, and how soon to retry a key whose quota couldn't be read.
+HUBCAP_QUOTA_TTL = 15 * 60
+HUBCAP_QUOTA_RETRY = 60
+
+# /exeloc autocomplete: max suggestions (Discord's cap), and how long HubCap
+# library search results are reused, for up to this many distinct queries.
+AUTOCOMPLETE_LIMIT = 25
+HUBCAP_SEARCH_TTL = 5 * 60
+HUBCAP_SEARCH_CACHE_SIZE = 256
+
+# Background `cacheall`: games fetched at once per source, and the minimum
+# gap between edits of the live progress message.
+CACHE_MH_CONCURRENCY = 4
+CACHE_HC_CONCURRENCY = 2
+CACHE_STATUS_EVERY = 5.0
+
 
 def _read_varint(buf: bytes, i: int):
     shift = 0
@@ -83,17 +126,62 @@ def _decrypt_filename(enc_b64: bytes, key: bytes) -> str:
     the first 16 bytes being the ECB-encrypted IV. Requires the 32-byte AES
     depot key. Raises on failure.
     """
+    name = decrypt_filenames([enc_b64], key)[0]
+    if name is None:
+        raise ValueError("not a valid encrypted filename")
+    return name
+
+
+def decrypt_filenames(encrypted: list, key: bytes) -> list:
+    """Decrypt a whole manifest's worth of filenames with one key schedule.
+
+    Returns a list parallel to `encrypted` holding the decrypted name, or None
+    where an entry isn't valid base64 / block-aligned ciphertext. CBC
+    decryption is P[i] = D(C[i]) XOR C[i-1], so every block of every name —
+    IVs included — goes through a single AES-ECB decryptor in one call, and
+    the chaining XOR is done afterwards per name as one big-int XOR.
+    """
     import base64
+    import binascii
 
     from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
-    data = base64.b64decode(enc_b64)
-    iv = Cipher(algorithms.AES(key), modes.ECB()).decryptor().update(data[:16])
-    body = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor().update(data[16:])
-    pad = body[-1]
-    if 1 <= pad <= 16:
-        body = body[:-pad]
-    return body.rstrip(b"\x00").decode("utf-8", "replace")
+    blobs = []
+    for enc in encrypted:
+        try:
+            if isinstance(enc, (bytes, bytearray)) and not enc.isascii():
+                raise ValueError("non-ascii ciphertext")
+            data = base64.b64decode(enc)
+        except (binascii.Error, ValueError):
+            blobs.append(None)
+            continue
+        body_len = (len(data) - 16) & ~15
+        blobs.append(data[:16 + body_len] if body_len > 0 else None)
+
+    valid = [d for d in blobs if d is not None]
+    if not valid:
+        return [None] * len(encrypted)
+    plain = Cipher(algorithms.AES(key), modes.ECB()).decryptor().update(b"".join(valid))
+
+    out = []
+    pos = 0
+    from_bytes = int.from_bytes
+    for data in blobs:
+        if data is None:
+            out.append(None)
+            continue
+        n = len(data)
+        iv = plain[pos:pos + 16]
+        body = plain[pos + 16:pos + n]
+        pos += n
+        # XOR each decrypted body block with the previous ciphertext block.
+        chain = iv + data[16:n - 16]
+        body = (from_bytes(body, "big") ^ from_bytes(chain, "big")).to_bytes(n - 16, "big")
+        pad = body[-1]
+        if 1 <= pad <= 16:
+            body = body[:-pad]
+        out.append(body.rstrip(b"\x00").decode("utf-8", "replace"))
+    return out
 
 
 def _looks_like_path(name: str) -> bool:
@@ -106,6 +194,217 @@ def _looks_like_path(name: str) -> bool:
     return ("/" in name) or ("\\" in name) or ("." in name)
 
 
+def _varint_at(buf, i: int):
+    """Decode a varint at buf[i]; returns (value, next_index). Single-byte fast path."""
+    b = buf[i]
+    if b < 0x80:
+        return b, i + 1
+    result = b & 0x7F
+    shift = 7
+    i += 1
+    while True:
+        b = buf[i]
+        i += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, i
+        shift += 7
+
+
+def _skip_field(buf, i: int, wt: int) -> int:
+    if wt == 0:
+        return _varint_at(buf, i)[1]
+    if wt == 2:
+        ln, i = _varint_at(buf, i)
+        return i + ln
+    if wt == 5:
+        return i + 4
+    if wt == 1:
+        return i + 8
+    raise ValueError(f"unsupported protobuf wire type {wt}")
+
+
+def iter_manifest_entries(blob, depot_key: Optional[bytes] = None):
+    """Lazily yield (path, size, sha_hex) for every file in a manifest blob.
+
+    Same output as parse_manifest_records, but decodes in place: the blob is
+    walked by offset through a memoryview, so no per-FileMapping sub-buffers
+    are copied and no intermediate dicts are built. Accepts any bytes-like
+    object (bytes, bytearray, mmap, memoryview). Directories are skipped.
+    """
+    if len(blob) < 8:
+        return
+    magic, length = struct.unpack_from("<II", blob, 0)
+    if magic != MANIFEST_PAYLOAD_MAGIC:
+        return
+    mv = memoryview(blob)
+    if mv.format != "B":
+        mv = mv.cast("B")
+    if depot_key:
+        # Encrypted names are decrypted in one batch per manifest (one AES
+        # key schedule for the whole depot), so this path can't be lazy.
+        yield from _decrypt_manifest_entries(mv, length, depot_key)
+        return
+    for name_s, name_e, size, sha_s, sha_e in _iter_file_mappings(mv, length):
+        name = str(mv[name_s:name_e], "utf-8", "replace").rstrip("\x00")
+        yield name.replace("\\", "/"), size, mv[sha_s:sha_e].hex()
+
+
+def _decrypt_manifest_entries(mv: memoryview, length: int, depot_key: bytes):
+    entries = []
+    pending = []
+    for name_s, name_e, size, sha_s, sha_e in _iter_file_mappings(mv, length):
+        name = str(mv[name_s:name_e], "utf-8", "replace").rstrip("\x00")
+        if not _looks_like_path(name):
+            pending.append((len(entries), name_s, name_e))
+        entries.append([name, size, mv[sha_s:sha_e].hex()])
+    if pending:
+        try:
+            names = decrypt_filenames(
+                [mv[s:e].tobytes() for _idx, s, e in pending], depot_key
+            )
+        except Exception:
+            names = ()
+        for (idx, _s, _e), decrypted in zip(pending, names):
+            if decrypted is not None and _looks_like_path(decrypted):
+                entries[idx][0] = decrypted
+    for name, size, sha in entries:
+        yield name.replace("\\", "/"), size, sha
+
+
+def _iter_file_mappings(mv: memoryview, length: int):
+    """Yield (name_start, name_end, size, sha_start, sha_end) offsets per file."""
+    i = 8
+    end = min(8 + length, len(mv))
+    while i < end:
+        key, i = _varint_at(mv, i)
+        if key != 0x0A:  # anything but field 1 (repeated FileMapping), wire type 2
+            i = _skip_field(mv, i, key & 7)
+            continue
+        ln, j = _varint_at(mv, i)
+        i = fend = j + ln
+
+        name_s = name_e = -1
+        sha_s = sha_e = 0
+        size = flags = 0
+        while j < fend:
+            k, j = _varint_at(mv, j)
+            wt = k & 7
+            if wt == 0:
+                v, j = _varint_at(mv, j)
+                if k == 0x10:    # field 2: size
+                    size = v
+                elif k == 0x18:  # field 3: flags
+                    flags = v
+            elif wt == 2:
+                ln, j = _varint_at(mv, j)
+                if k == 0x0A:    # field 1: filename
+                    name_s, name_e = j, j + ln
+                elif k == 0x22:  # field 4: sha
+                    sha_s, sha_e = j, j + ln
+                j += ln
+            else:
+                j = _skip_field(mv, j, wt)
+
+        # flag 0x40 = directory; skip those.
+        if name_s < 0 or flags & 0x40:
+            continue
+        yield name_s, name_e, size, sha_s, sha_e
+
+
+class ManifestColumns:
+    """File listing held as parallel columns instead of one dict per file.
+
+    `paths[i]`, `sizes[i]` and `shas[i]` describe the same file. Several
+    manifests (depots) can be appended into one instance.
+    """
+
+    __slots__ = ("paths", "sizes", "shas")
+
+    def __init__(self):
+        self.paths: list = []
+        self.sizes = array("Q")
+        self.shas: list = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def extend(self, paths, sizes, shas) -> "ManifestColumns":
+        self.paths.extend(paths)
+        self.sizes.extend(sizes)
+        self.shas.extend(shas)
+        return self
+
+    def add_manifest(self, blob, depot_key: Optional[bytes] = None) -> "ManifestColumns":
+        paths, sizes, shas = self.paths.append, self.sizes.append, self.shas.append
+        for path, size, sha in iter_manifest_entries(blob, depot_key):
+            paths(path)
+            sizes(size)
+            shas(sha)
+        return self
+
+    def exe_paths(self) -> list:
+        return sorted({p for p in self.paths if p.lower().endswith(".exe")}, key=str.lower)
+
+    def file_map(self) -> dict:
+        """{path: {"sha", "size"}} — the shape stored in file snapshots."""
+        return {
+            p: {"sha": h, "size": s}
+            for p, s, h in zip(self.paths, self.sizes, self.shas)
+        }
+
+
+def parse_manifest_columns(blob, depot_key: Optional[bytes] = None) -> ManifestColumns:
+    return ManifestColumns().add_manifest(blob, depot_key)
+
+
+def _manifest_columns_job(blob: bytes, depot_key: Optional[bytes]):
+    """Parse-pool entry point: (paths, sizes, shas) for one depot manifest."""
+    cols = parse_manifest_columns(blob, depot_key)
+    return cols.paths, cols.sizes, cols.shas
+
+
+def iter_zip_manifests(fp):
+    """Yield (member_name, blob) for each `.manifest` inside a ZIP file object.
+
+    Members are handled one at a time. Small ones are read into memory; big
+    ones are inflated to a temp file and yielded as a read-only mmap, so
+    memory use doesn't grow with the size of the ZIP or of any one manifest.
+    A yielded mmap is only valid until the next iteration.
+    """
+    with zipfile.ZipFile(fp) as zf:
+        for info in zf.infolist():
+            if not info.filename.lower().endswith(".manifest") or not info.file_size:
+                continue
+            if info.file_size <= HUBCAP_SPOOL_THRESHOLD:
+                yield info.filename, zf.read(info)
+                continue
+            with zf.open(info) as src, tempfile.TemporaryFile() as tmp:
+                shutil.copyfileobj(src, tmp, 1 << 20)
+                tmp.flush()
+                with mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield info.filename, mm
+
+
+def zip_manifest_columns(fp) -> ManifestColumns:
+    """All files of every manifest in a HubCap ZIP (decrypted; no depot key)."""
+    records = ManifestColumns()
+    for _name, blob in iter_zip_manifests(fp):
+        records.add_manifest(blob)
+    return records
+
+
+def zip_manifest_exes(fp) -> list:
+    """Sorted .exe paths across every manifest in a HubCap ZIP."""
+    seen = set()
+    for _name, blob in iter_zip_manifests(fp):
+        seen.update(
+            path for path, _size, _sha in iter_manifest_entries(blob)
+            if path.lower().endswith(".exe")
+        )
+    return sorted(seen, key=str.lower)
+
+
 def parse_manifest_records(blob: bytes, depot_key: Optional[bytes] = None):
     """Parse a raw Steam depot manifest blob into file records.
 
@@ -118,8 +417,19 @@ def parse_manifest_records(blob: bytes, depot_key: Optional[bytes] = None):
     available and a name doesn't look like a real path, this attempts to
     decrypt it and uses the result if it looks valid.
     """
-    import struct
+    return [
+        {"path": path, "size": size, "sha": sha}
+        for path, size, sha in iter_manifest_entries(blob, depot_key)
+    ]
 
+
+def parse_manifest_files(blob: bytes, depot_key: Optional[bytes] = None):
+    """Back-compat: list of (path, size) for exe extraction."""
+    return [(path, size) for path, size, _sha in iter_manifest_entries(blob, depot_key)]
+
+
+def _parse_manifest_records_reference(blob: bytes, depot_key: Optional[bytes] = None):
+    """The original generator-based decoder, kept as the `parsebench` baseline."""
     if len(blob) < 8:
         return []
     magic, length = struct.unpack_from("<II", blob, 0)
@@ -148,7 +458,6 @@ def parse_manifest_records(blob: bytes, depot_key: Optional[bytes] = None):
             continue
 
         name = raw_name.decode("utf-8", "replace").rstrip("\x00")
-        # If it doesn't look like a path and we have a key, try to decrypt.
         if not _looks_like_path(name) and depot_key:
             try:
                 decrypted = _decrypt_filename(raw_name.decode("ascii"), depot_key)
@@ -157,7 +466,6 @@ def parse_manifest_records(blob: bytes, depot_key: Optional[bytes] = None):
             except Exception:
                 pass
 
-        # flag 0x40 = directory; skip those.
         if flags & 0x40:
             continue
         records.append(
@@ -166,9 +474,222 @@ def parse_manifest_records(blob: bytes, depot_key: Optional[bytes] = None):
     return records
 
 
-def parse_manifest_files(blob: bytes, depot_key: Optional[bytes] = None):
-    """Back-compat: list of (path, size) for exe extraction."""
-    return [(r["path"], r["size"]) for r in parse_manifest_records(blob, depot_key)]
+def bench_manifest_parsers(blobs: list, runs: int = 3) -> dict:
+    """Time the reference and in-place decoders over (blob, depot_key) pairs.
+
+    CPU-bound; call it from a worker thread. Returns best-of-`runs` timings
+    and whether both decoders produced identical records.
+    """
+    def best(fn):
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            out = [fn(blob, key) for blob, key in blobs]
+            times.append(time.perf_counter() - t0)
+        return min(times), out
+
+    ref_time, ref_out = best(_parse_manifest_records_reference)
+    new_time, new_out = best(parse_manifest_records)
+    col_time, _ = best(parse_manifest_columns)
+    return {
+        "blobs": len(blobs),
+        "bytes": sum(len(b) for b, _ in blobs),
+        "files": sum(len(r) for r in new_out),
+        "reference": ref_time,
+        "records": new_time,
+        "columns": col_time,
+        "identical": ref_out == new_out,
+    }
+
+# A long hex run in a filename stem => almost certainly a content hash.
+_HASHED_STEM = re.compile(r"[0-9a-f]{16,}")
+_BUNDLE_EXTS = (".bundle", ".resource", ".ress", ".pak")
+
+
+def _bundle_group(path: str) -> str:
+    """Heat-map key for a content-hashed bundle: its directory plus `*.ext`."""
+    folder, _, base = path.rpartition("/")
+    ext = base.rpartition(".")[2] if "." in base else ""
+    key = f"*.{ext}" if ext else "*"
+    return f"{folder}/{key}" if folder else key
+
+
+class FileDiff:
+    """Result of diffing two file listings.
+
+    Unpacks like the old `(added, removed, modified, size_delta)` tuple.
+    Alongside the full lists it carries the same entries split into named
+    files and collapsed content-hashed bundles (`bundles[kind]` is
+    `(count, bytes)`), and `heat` — {path or bundle group: churn bytes} for
+    the change heat map — all filled in during the merge so nothing needs a
+    second pass.
+    """
+
+    __slots__ = (
+        "added", "removed", "modified", "size_delta",
+        "named_added", "named_removed", "named_modified", "bundles", "heat",
+    )
+
+    def __init__(self):
+        self.added: list = []          # (path, size)
+        self.removed: list = []        # (path, size)
+        self.modified: list = []       # (path, old_size, new_size)
+        self.size_delta = 0
+        self.named_added: list = []
+        self.named_removed: list = []
+        self.named_modified: list = []
+        self.bundles = {"added": [0, 0], "removed": [0, 0], "modified": [0, 0]}
+        self.heat: dict = {}
+
+    @property
+    def churn(self) -> int:
+        """Bytes touched by this diff (added + removed + new size of modified)."""
+        return sum(self.heat.values())
+
+    def __iter__(self):
+        return iter((self.added, self.removed, self.modified, self.size_delta))
+
+    @property
+    def total(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.modified)
+
+
+class HubCapKeyPool:
+    """Hands out HubCap keys from a locally cached view of their daily quota.
+
+    Remaining quota per key is fetched via `fetch_remaining(key)` (all stale
+    keys concurrently) and then trusted for HUBCAP_QUOTA_TTL; each charged
+    download decrements it locally, and a 429 marks the key exhausted until
+    the next sync. Keys are leased rather than just picked: the pool prefers
+    the key with the most quota left after subtracting its in-flight leases,
+    so concurrent fetches spread across keys instead of draining one.
+    """
+
+    def __init__(self, fetch_remaining):
+        self._fetch = fetch_remaining
+        self._keys: list = []
+        self._remaining: dict = {}   # key -> int, or None when unknown
+        self._synced: dict = {}      # key -> monotonic time of last sync
+        self._leases: dict = {}      # key -> in-flight lease count
+        self._lock = asyncio.Lock()
+
+    def set_keys(self, keys: list):
+        """Track exactly `keys`, keeping cached state for ones already known."""
+        self._keys = list(keys)
+        for state in (self._remaining, self._synced, self._leases):
+            for k in list(state):
+                if k not in self._keys:
+                    del state[k]
+
+    def _stale(self, key: str, now: float) -> bool:
+        synced = self._synced.get(key)
+        if synced is None:
+            return True
+        ttl = HUBCAP_QUOTA_TTL if self._remaining.get(key) is not None else HUBCAP_QUOTA_RETRY
+        return now - synced >= ttl
+
+    async def sync(self, force: bool = False):
+        """Re-read remaining quota for stale keys (or all, with force)."""
+        now = time.monotonic()
+        due = [k for k in self._keys if force or self._stale(k, now)]
+        if not due:
+            return
+        results = await asyncio.gather(*(self._fetch(k) for k in due))
+        now = time.monotonic()
+        for k, rem in zip(due, results):
+            self.update(k, rem, now)
+
+    def update(self, key: str, remaining: Optional[int], now: Optional[float] = None):
+        """Record a freshly observed remaining count for a key."""
+        if key not in self._keys:
+            return
+        self._remaining[key] = remaining
+        self._synced[key] = time.monotonic() if now is None else now
+
+    async def acquire(self) -> Optional[str]:
+        """Lease the best key, or None when every key is known exhausted.
+
+        Keys with known quota left (net of leases) win, most first; keys whose
+        quota is unknown are only a fallback, least-leased first.
+        """
+        async with self._lock:
+            await self.sync()
+            best = None
+            fallback = None
+            for k in self._keys:
+                leases = self._leases.get(k, 0)
+                rem = self._remaining.get(k)
+                if rem is None:
+                    if fallback is None or leases < self._leases.get(fallback, 0):
+                        fallback = k
+                elif rem - leases > 0 and (best is None or rem - leases > best[0]):
+                    best = (rem - leases, k)
+            key = best[1] if best is not None else fallback
+            if key is not None:
+                self._leases[key] = self._leases.get(key, 0) + 1
+            return key
+
+    def release(self, key: Optional[str]):
+        if key is not None and self._leases.get(key, 0) > 0:
+            self._leases[key] -= 1
+
+    def charge(self, key: str):
+        """A paid download went through on `key`; decrement its cached quota."""
+        rem = self._remaining.get(key)
+        if rem is not None:
+            self._remaining[key] = max(0, rem - 1)
+
+    def exhaust(self, key: str):
+        """HubCap answered 429 for `key`; treat it as empty until the next sync."""
+        if key in self._keys:
+            self._remaining[key] = 0
+            self._synced[key] = time.monotonic()
+
+    def total_remaining(self):
+        """(sum of known remaining, whether any key's quota is unknown)."""
+        known = [self._remaining.get(k) for k in self._keys]
+        return sum(r for r in known if r is not None), any(r is None for r in known)
+
+
+class ExeLookupIndex:
+    """In-memory name index of watched and exe-cached games for autocomplete.
+
+    Kept in step with Config by the cog (set_* after bulk writes, update_* /
+    remove_* for single entries), so a keystroke never touches Config.
+    Watchlist entries shadow cache entries for the same AppID.
+    """
+
+    def __init__(self):
+        self._watch: dict = {}    # appid_str -> (name_lower, name)
+        self._cached: dict = {}
+
+    @staticmethod
+    def _row(appid_str: str, name) -> tuple:
+        name = str(name or appid_str)
+        return name.lower(), name
+
+    def set_watchlist(self, games: dict):
+        self._watch = {a: self._row(a, g.get("name")) for a, g in games.items()}
+
+    def set_cached(self, cache: dict):
+        self._cached = {a: self._row(a, e.get("name")) for a, e in cache.items()}
+
+    def update_cached(self, appid_str: str, name):
+        self._cached[appid_str] = self._row(appid_str, name)
+
+    def search(self, cur_low: str, limit: int = AUTOCOMPLETE_LIMIT) -> list:
+        """[(appid_str, name, tag)] matching by name substring or AppID."""
+        out = []
+        for tag, rows, skip in (("watchlist", self._watch, None), ("cached", self._cached, self._watch)):
+            for appid_str, (low, name) in rows.items():
+                if len(out) >= limit:
+                    return out
+                if skip is not None and appid_str in skip:
+                    continue
+                if not cur_low or cur_low in low or cur_low in appid_str:
+                    out.append((appid_str, name, tag))
+        return out
+
 
 DEFAULT_GLOBALS = {
     "games": {},          # appid_str -> {name, denuvo, build_id, build_time, header}
@@ -181,8 +702,18 @@ DEFAULT_GLOBALS = {
     "hubcap_keys": [],     # list of HubCapManifest API keys (round-robined)
     # appid_str -> {"exes": [...], "build_id": str|None, "source": str, "cached_at": int}
     "exe_cache": {},
-    # appid_str -> {"build_id": str|None, "files": {path: sha}} for build diffs
+    # legacy: appid_str -> {"build_id", "files", "prev_build_id", "prev_files"};
+    # migrated into the on-disk SnapshotStore on load.
     "file_snapshots": {},
+    # appid_str -> {"build_id", "blob", "prev_build_id", "prev_blob"}, where
+    # blob digests point into the SnapshotStore.
+    "snapshot_index": {},
+    # Checkpoint of the running/paused background cacheall job, or None:
+    # {"mode", "force", "fresh", "queue": [appid_str], "done": [appid_str],
+    #  "deferred": [appid_str], "counts": {...}, "state", "channel_id", "started_at"}
+    "cache_job": None,
+    # Size limit of the on-disk parsed-manifest cache (ManifestCache).
+    "manifest_cache_mb": 512,
 }
 
 
@@ -215,13 +746,74 @@ class DenuvoWatch(commands.Cog):
         )
         self.config.register_global(**DEFAULT_GLOBALS)
         self.session = aiohttp.ClientSession(headers=HEADERS)
+        self.snapshots = SnapshotStore(cog_data_path(self) / "snapshots")
+        self.heatmap = ChangeHeatMap(cog_data_path(self) / "heatmap")
+        self.manifest_cache = ManifestCache(
+            cog_data_path(self) / "manifests", DEFAULT_GLOBALS["manifest_cache_mb"] << 20
+        )
         self._check_lock = asyncio.Lock()
+        self._hubcap_pool = HubCapKeyPool(self._hubcap_remaining)
+        self._mh_sem = asyncio.Semaphore(MANIFESTHUB_CONCURRENCY)
+        # None = not started yet, False = unavailable (parse in threads).
+        self._parse_pool: Union[ProcessPoolExecutor, bool, None] = None
+        self._exe_index = ExeLookupIndex()
+        # query_lower -> (monotonic time, [{"appid", "name"}]), oldest first.
+        self._hubcap_search_cache: dict = {}
+        self._cache_task: Optional[asyncio.Task] = None
+        self._cache_progress: dict = {}
+        self._cache_message: Optional[discord.Message] = None
         self.check_games.start()
 
+    async def cog_load(self):
+        await self._migrate_file_snapshots()
+        self._exe_index.set_watchlist(await self.config.games())
+        self._exe_index.set_cached(await self.config.exe_cache())
+        await self.manifest_cache.aset_limit((await self.config.manifest_cache_mb()) << 20)
+        job = await self.config.cache_job()
+        if job and job.get("state") == "running":
+            # Interrupted by an unload/restart; pick up where it stopped.
+            self._start_cache_job()
+
     def cog_unload(self):
         self.check_games.cancel()
+        if self._cache_task is not None:
+            self._cache_task.cancel()
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
         asyncio.create_task(self.session.close())
 
+    # ─── File snapshots ─────────────────────────────────────────────────────
+
+    async def _migrate_file_snapshots(self):
+        """Move legacy Config-stored file maps into the SnapshotStore (once)."""
+        legacy = await self.config.file_snapshots()
+        if not legacy:
+            return
+        index = await self.config.snapshot_index()
+        for appid_str, snap in legacy.items():
+            if appid_str in index:
+                continue
+            entry = {"build_id": snap.get("build_id"), "blob": None}
+            if snap.get("files"):
+                entry["blob"] = await self.snapshots.aput_map(snap["files"])
+            if snap.get("prev_files"):
+                entry["prev_build_id"] = snap.get("prev_build_id")
+                entry["prev_blob"] = await self.snapshots.aput_map(snap["prev_files"])
+            index[appid_str] = entry
+        await self.config.snapshot_index.set(index)
+        await self.config.file_snapshots.set({})
+        log.info("Migrated %d file snapshot(s) to disk.", len(legacy))
+
+    async def _prune_snapshots(self):
+        """Drop snapshot blobs no longer referenced by the index."""
+        index = await self.config.snapshot_index()
+        keep = set()
+        for entry in index.values():
+            keep.update(d for d in (entry.get("blob"), entry.get("prev_blob")) if d)
+        removed = await self.snapshots.aprune(keep)
+        if removed:
+            log.info("Pruned %d unreferenced snapshot blob(s).", removed)
+
     # ─── Steam helpers ──────────────────────────────────────────────────────
 
     async def fetch_app_details(self, appid: int) -> dict:
@@ -361,24 +953,76 @@ class DenuvoWatch(commands.Cog):
                     depot_key = None
             yield str(key), str(gid), depot_key
 
+    async def _run_parser(self, func, *args):
+        """Run a CPU-bound manifest parse in the process pool.
+
+        Falls back to a worker thread for good if the pool can't be used
+        (e.g. the platform can't spawn it or the cog module can't be imported
+        in the child).
+        """
+        if self._parse_pool is not False:
+            try:
+                if self._parse_pool is None:
+                    self._parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._parse_pool, func, *args)
+            except (BrokenProcessPool, pickle.PicklingError, ImportError, AttributeError, OSError) as e:
+                log.warning("Manifest parse pool unavailable (%r); using threads.", e)
+                if self._parse_pool:
+                    self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = False
+        return await asyncio.to_thread(func, *args)
+
+    async def _mh_depot_results(self, appid: int, metadata: dict):
+        """Fetch and parse every public depot concurrently.
+
+        Yields (depot_index, (paths, sizes, shas)) in completion order; depots
+        with no blob are skipped. Depots already in the manifest cache cost
+        neither a download nor a parse. Depots parsed without a decryption
+        key aren't cached, so their still-encrypted names are replaced once
+        ManifestHub has the key. Downloads share the cog-wide ManifestHub
+        semaphore.
+        """
+        async def one(idx, depot_id, gid, depot_key):
+            cols = await self.manifest_cache.aget(depot_id, gid)
+            if cols is not None:
+                return idx, cols
+            async with self._mh_sem:
+                blob = await self.mh_fetch_manifest_blob(appid, depot_id, gid)
+            if not blob:
+                return idx, None
+            cols = await self._run_parser(_manifest_columns_job, blob, depot_key)
+            if depot_key:
+                try:
+                    await self.manifest_cache.aput(depot_id, gid, cols)
+                except Exception:
+                    # Best-effort: a full disk mustn't fail the lookup itself.
+                    log.exception("manifest cache write failed for %s_%s", depot_id, gid)
+            return idx, cols
+
+        tasks = [
+            asyncio.create_task(one(i, *depot))
+            for i, depot in enumerate(self._public_depots(metadata))
+        ]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                idx, result = await fut
+                if result is not None:
+                    yield idx, result
+        finally:
+            for t in tasks:
+                t.cancel()
+
     async def _exe_paths_manifesthub(self, appid: int):
         """Return (name, exe_paths) for an app via ManifestHub2, or (None, None)."""
         metadata = await self.mh_fetch_metadata(appid)
         if metadata is None:
             return None, None
         name = metadata.get("name") or f"AppID {appid}"
-        exes = []
         seen = set()
-        for depot_id, gid, depot_key in self._public_depots(metadata):
-            blob = await self.mh_fetch_manifest_blob(appid, depot_id, gid)
-            if not blob:
-                continue
-            for path, _size in parse_manifest_files(blob, depot_key):
-                if path.lower().endswith(".exe") and path not in seen:
-                    seen.add(path)
-                    exes.append(path)
-        exes.sort(key=str.lower)
-        return name, exes
+        async for _idx, (paths, _sizes, _shas) in self._mh_depot_results(appid, metadata):
+            seen.update(p for p in paths if p.lower().endswith(".exe"))
+        return name, sorted(seen, key=str.lower)
 
     # ─── HubCapManifest (authenticated API) ──────────────────────────────────
 
@@ -393,37 +1037,19 @@ class DenuvoWatch(commands.Cog):
             await self.config.hubcap_key.set(None)
         return keys
 
-    async def _pick_hubcap_key(self) -> Optional[str]:
-        """Pick the key with the most daily quota left; skip exhausted ones.
+    @asynccontextmanager
+    async def _hubcap_lease(self):
+        """Lease a HubCap key from the pool for one fetch; yields None if none.
 
-        Prefers keys with a known positive remaining count (most first). Keys
-        whose remaining is unknown (network error) are used only as a fallback
-        when no key has known remaining. Returns None when every key is known
-        to be exhausted.
+        The key with the most cached quota left (net of other in-flight
+        leases) is chosen; exhausted keys are skipped.
         """
-        keys = await self._get_hubcap_keys()
-        if not keys:
-            return None
-        best_known = None       # (remaining, key) with remaining > 0
-        unknown_fallback = None
-        all_zero = True
-        for k in keys:
-            rem = await self._hubcap_remaining(k)
-            if rem is None:
-                if unknown_fallback is None:
-                    unknown_fallback = k
-                all_zero = False  # unknown isn't a confirmed zero
-                continue
-            if rem > 0:
-                all_zero = False
-                if best_known is None or rem > best_known[0]:
-                    best_known = (rem, k)
-        if best_known is not None:
-            return best_known[1]
-        if unknown_fallback is not None:
-            return unknown_fallback
-        # Every key returned a known 0 (all exhausted).
-        return None
+        self._hubcap_pool.set_keys(await self._get_hubcap_keys())
+        key = await self._hubcap_pool.acquire()
+        try:
+            yield key
+        finally:
+            self._hubcap_pool.release(key)
 
     async def _any_hubcap_key(self) -> Optional[str]:
         """First configured key (for free endpoints like search/status)."""
@@ -446,7 +1072,7 @@ class DenuvoWatch(commands.Cog):
             return None
 
     async def hubcap_search(self, query: str, key: str, limit: int = 20):
-        """Free library search. Returns list of {'appid': int, 'name': str}."""
+        """Free library search. Returns list of {'appid': int, 'name': str}, or None on failure."""
         try:
             async with self.session.get(
                 f"{HUBCAP_BASE}/search",
@@ -455,7 +1081,7 @@ class DenuvoWatch(commands.Cog):
                 timeout=aiohttp.ClientTimeout(total=10),
             ) as r:
                 if r.status != 200:
-                    return []
+                    return None
                 data = await r.json(content_type=None)
             out = []
             for item in data.get("results", []):
@@ -465,79 +1091,85 @@ class DenuvoWatch(commands.Cog):
                     out.append({"appid": int(gid), "name": name})
             return out
         except Exception:
-            return []
+            return None
 
-    async def _exe_paths_hubcap(self, appid: int, key: str):
-        """Return (name, exe_paths) via HubCap manifest ZIP, or (None, None).
+    async def _hubcap_download(self, appid: int, key: str, params=None, total: int = 60):
+        """Stream a HubCap manifest ZIP into a temp file; None on failure.
 
-        Costs one daily download. Returns (None, None) when HubCap has no
-        manifest or the request fails, so the caller can fall back.
+        Costs one daily download on success. The caller owns (and must close)
+        the returned file, which is rewound to the start.
         """
-        import io
-        import zipfile
-
-        status = await self.hubcap_status(appid, key)
-        if not status or status.get("status") != "available":
-            return None, None
-        name = status.get("game_name") or f"AppID {appid}"
-
+        fp = tempfile.TemporaryFile()
         try:
             async with self.session.get(
                 f"{HUBCAP_BASE}/manifest/{appid}",
+                params=params,
                 headers={"Authorization": f"Bearer {key}"},
-                timeout=aiohttp.ClientTimeout(total=60),
+                timeout=aiohttp.ClientTimeout(total=total),
             ) as r:
+                if r.status == 429:
+                    self._hubcap_pool.exhaust(key)
                 if r.status != 200:
                     log.warning("HubCap manifest %s -> HTTP %s", appid, r.status)
-                    return None, None
-                data = await r.read()
+                    fp.close()
+                    return None
+                self._hubcap_pool.charge(key)
+                async for chunk in r.content.iter_chunked(HUBCAP_CHUNK):
+                    fp.write(chunk)
         except Exception:
             log.exception("HubCap manifest download failed for %s", appid)
+            fp.close()
+            return None
+        fp.seek(0)
+        return fp
+
+    async def _exe_paths_hubcap(self, appid: int, key: str):
+        """Return (name, exe_paths) via HubCap manifest ZIP, or (None, None).
+
+        Costs one daily download. Returns (None, None) when HubCap has no
+        manifest or the request fails, so the caller can fall back.
+        """
+        status = await self.hubcap_status(appid, key)
+        if not status or status.get("status") != "available":
             return None, None
+        name = status.get("game_name") or f"AppID {appid}"
 
-        exes = []
-        seen = set()
+        fp = await self._hubcap_download(appid, key)
+        if fp is None:
+            return None, None
         try:
-            with zipfile.ZipFile(io.BytesIO(data)) as zf:
-                for info in zf.infolist():
-                    if not info.filename.lower().endswith(".manifest"):
-                        continue
-                    blob = zf.read(info)
-                    # HubCap serves decrypted manifests; no depot key needed.
-                    for path, _size in parse_manifest_files(blob):
-                        if path.lower().endswith(".exe") and path not in seen:
-                            seen.add(path)
-                            exes.append(path)
+            # HubCap serves decrypted manifests; no depot key needed.
+            exes = await asyncio.to_thread(zip_manifest_exes, fp)
         except Exception:
             log.exception("HubCap manifest ZIP parse failed for %s", appid)
             return None, None
-
-        exes.sort(key=str.lower)
+        finally:
+            fp.close()
         return name, exes
 
     async def _records_manifesthub(self, appid: int):
-        """Return (name, [records]) of all files via ManifestHub2, or (None, None)."""
+        """Return (name, ManifestColumns) of all files via ManifestHub2, or (None, None)."""
         metadata = await self.mh_fetch_metadata(appid)
         if metadata is None:
             return None, None
         name = metadata.get("name") or f"AppID {appid}"
-        records = []
-        for depot_id, gid, depot_key in self._public_depots(metadata):
-            blob = await self.mh_fetch_manifest_blob(appid, depot_id, gid)
-            if not blob:
-                continue
-            records.extend(parse_manifest_records(blob, depot_key))
+        # Depots finish in any order; slot them by index and concatenate in
+        # depot order so a path present in several depots resolves the same
+        # way every time.
+        parts = {}
+        async for idx, cols in self._mh_depot_results(appid, metadata):
+            parts[idx] = cols
+        records = ManifestColumns()
+        for idx in sorted(parts):
+            records.extend(*parts[idx])
         return name, records
 
     async def _records_hubcap(self, appid: int, key: str, force_update: bool = False):
-        """Return (name, [records]) of all files via HubCap, or (None, None).
+        """Return (name, ManifestColumns) of all files via HubCap, or (None, None).
 
         When force_update is True, HubCap regenerates the manifest from Steam
         before serving (needed to get a freshly-pushed build's file list).
         """
-        import io
-        import zipfile
-
         status = await self.hubcap_status(appid, key)
         if not status or status.get("status") != "available":
             return None, None
@@ -546,30 +1178,16 @@ class DenuvoWatch(commands.Cog):
         if status.get("needs_update"):
             force_update = True
         params = {"force_update": "true"} if force_update else None
-        try:
-            async with self.session.get(
-                f"{HUBCAP_BASE}/manifest/{appid}",
-                params=params,
-                headers={"Authorization": f"Bearer {key}"},
-                timeout=aiohttp.ClientTimeout(total=120),
-            ) as r:
-                if r.status != 200:
-                    return None, None
-                data = await r.read()
-        except Exception:
-            log.exception("HubCap manifest download failed for %s", appid)
+        fp = await self._hubcap_download(appid, key, params, total=120)
+        if fp is None:
             return None, None
-
-        records = []
         try:
-            with zipfile.ZipFile(io.BytesIO(data)) as zf:
-                for info in zf.infolist():
-                    if not info.filename.lower().endswith(".manifest"):
-                        continue
-                    records.extend(parse_manifest_records(zf.read(info)))
+            records = await asyncio.to_thread(zip_manifest_columns, fp)
         except Exception:
             log.exception("HubCap manifest ZIP parse failed for %s", appid)
             return None, None
+        finally:
+            fp.close()
         return name, records
 
     async def get_file_map(self, appid: int, allow_hubcap: bool = True):
@@ -579,14 +1197,14 @@ class DenuvoWatch(commands.Cog):
         """
         name, records = await self._records_manifesthub(appid)
         if not records and allow_hubcap:
-            key = await self._pick_hubcap_key()
-            if key:
-                hc_name, hc_records = await self._records_hubcap(appid, key)
-                if hc_records is not None:
-                    name, records = hc_name, hc_records
+            async with self._hubcap_lease() as key:
+                if key:
+                    hc_name, hc_records = await self._records_hubcap(appid, key)
+                    if hc_records is not None:
+                        name, records = hc_name, hc_records
         if records is None:
             return name, None
-        return name, {r["path"]: {"sha": r["sha"], "size": r["size"]} for r in records}
+        return name, records.file_map()
 
     async def get_file_map_fresh(self, appid: int):
         """Like get_file_map but prioritises an up-to-date source.
@@ -595,69 +1213,91 @@ class DenuvoWatch(commands.Cog):
         HubCap with force_update. Falls back to ManifestHub2 only when no key.
         Returns (name, {path:{sha,size}}) or (name, None).
         """
-        key = await self._pick_hubcap_key()
-        if key:
-            hc_name, hc_records = await self._records_hubcap(appid, key, force_update=True)
-            if hc_records is not None:
-                return hc_name, {
-                    r["path"]: {"sha": r["sha"], "size": r["size"]} for r in hc_records
-                }
+        async with self._hubcap_lease() as key:
+            if key:
+                hc_name, hc_records = await self._records_hubcap(appid, key, force_update=True)
+                if hc_records is not None:
+                    return hc_name, hc_records.file_map()
         # No key (or HubCap failed): fall back to the free mirror.
         return await self.get_file_map(appid)
 
-    @staticmethod
-    def _entry_sha(entry):
-        """Read sha from a snapshot entry (supports legacy sha-string format)."""
-        if isinstance(entry, dict):
-            return entry.get("sha")
-        return entry  # legacy: value was the sha string itself
-
-    @staticmethod
-    def _entry_size(entry):
-        """Read size from a snapshot entry, or None for legacy entries."""
-        if isinstance(entry, dict):
-            return entry.get("size")
-        return None
-
     @classmethod
-    def _diff_file_maps(cls, old: dict, new: dict):
-        """Diff two file maps.
-
-        Returns (added, removed, modified, size_delta) where:
-          - added/removed: list of (path, size)
-          - modified: list of (path, old_size, new_size)
-          - size_delta: total byte change (new total - old total over changed files)
-        Handles both new {path:{sha,size}} and legacy {path: sha} formats.
-        """
-        old_paths = set(old)
-        new_paths = set(new)
-
-        added = sorted(
-            ((p, cls._entry_size(new[p])) for p in (new_paths - old_paths)),
-            key=lambda t: t[0].lower(),
-        )
-        removed = sorted(
-            ((p, cls._entry_size(old[p])) for p in (old_paths - new_paths)),
-            key=lambda t: t[0].lower(),
-        )
-        modified = sorted(
-            (
-                (p, cls._entry_size(old[p]), cls._entry_size(new[p]))
-                for p in (old_paths & new_paths)
-                if cls._entry_sha(old[p]) != cls._entry_sha(new[p])
-            ),
-            key=lambda t: t[0].lower(),
-        )
+    def _diff_file_maps(cls, old: dict, new: dict) -> FileDiff:
+        """Diff two {path: {sha, size}} maps (legacy {path: sha} accepted)."""
+        return cls._merge_diff(columns_from_map(old), columns_from_map(new))
 
-        size_delta = 0
-        for _p, s in added:
-            size_delta += s or 0
-        for _p, s in removed:
-            size_delta -= s or 0
-        for _p, os, ns in modified:
-            size_delta += (ns or 0) - (os or 0)
+    @classmethod
+    def _merge_diff(cls, old, new) -> FileDiff:
+        """Diff two (paths, sizes, shas) listings sorted by snapshot_key.
 
-        return added, removed, modified, size_delta
+        One linear merge walk; bundle summaries and the size delta are
+        accumulated as entries are classified. CPU-bound on big games, so the
+        cog runs it via asyncio.to_thread.
+        """
+        op, osz, osha = old
+        np_, nsz, nsha = new
+        d = FileDiff()
+        is_bundle = cls._is_hashed_bundle
+        bundles = d.bundles
+        heat = d.heat
+
+        def touch(key, size):
+            heat[key] = heat.get(key, 0) + (size or 0)
+
+        def add(path, size):
+            d.added.append((path, size))
+            d.size_delta += size or 0
+            if is_bundle(path):
+                bundles["added"][0] += 1
+                bundles["added"][1] += size or 0
+                touch(_bundle_group(path), size)
+            else:
+                d.named_added.append((path, size))
+                touch(path, size)
+
+        def remove(path, size):
+            d.removed.append((path, size))
+            d.size_delta -= size or 0
+            if is_bundle(path):
+                bundles["removed"][0] += 1
+                bundles["removed"][1] += size or 0
+                touch(_bundle_group(path), size)
+            else:
+                d.named_removed.append((path, size))
+                touch(path, size)
+
+        i = j = 0
+        no, nn = len(op), len(np_)
+        while i < no and j < nn:
+            a = op[i]
+            b = np_[j]
+            if a == b:
+                if osha[i] != nsha[j]:
+                    entry = (a, osz[i], nsz[j])
+                    d.modified.append(entry)
+                    d.size_delta += (nsz[j] or 0) - (osz[i] or 0)
+                    if is_bundle(a):
+                        bundles["modified"][0] += 1
+                        bundles["modified"][1] += nsz[j] or 0
+                        touch(_bundle_group(a), nsz[j])
+                    else:
+                        d.named_modified.append(entry)
+                        touch(a, nsz[j])
+                i += 1
+                j += 1
+            elif snapshot_key(a) < snapshot_key(b):
+                remove(a, osz[i])
+                i += 1
+            else:
+                add(b, nsz[j])
+                j += 1
+        while i < no:
+            remove(op[i], osz[i])
+            i += 1
+        while j < nn:
+            add(np_[j], nsz[j])
+            j += 1
+        return d
 
     async def _fetch_exes_fresh(self, appid: int, allow_hubcap: bool = True):
         """Fetch exe paths live: ManifestHub2 (free) first, HubCap if empty.
@@ -672,11 +1312,11 @@ class DenuvoWatch(commands.Cog):
 
         # 2) HubCap only if the free source had nothing useful.
         if allow_hubcap:
-            key = await self._pick_hubcap_key()
-            if key:
-                hc_name, hc_exes = await self._exe_paths_hubcap(appid, key)
-                if hc_exes is not None:
-                    return hc_name, hc_exes, "HubCapManifest"
+            async with self._hubcap_lease() as key:
+                if key:
+                    hc_name, hc_exes = await self._exe_paths_hubcap(appid, key)
+                    if hc_exes is not None:
+                        return hc_name, hc_exes, "HubCapManifest"
 
         # Free source existed but had zero exes -> report that (empty list).
         if exes is not None:
@@ -711,7 +1351,8 @@ class DenuvoWatch(commands.Cog):
                 "source": source,
                 "cached_at": int(datetime.now(timezone.utc).timestamp()),
             }
-            await self.config.exe_cache.set(cache)
+            await self.config.exe_cache.set_raw(appid_str, value=cache[appid_str])
+            self._exe_index.update_cached(appid_str, name)
             return name, exes, source
 
         # Fetch failed; fall back to a stale cache entry if we have one.
@@ -783,43 +1424,57 @@ class DenuvoWatch(commands.Cog):
         return text
 
     @classmethod
-    def _build_diff_txt(cls, name: str, appid: int, old_build: str, new_build: str, diff) -> str:
-        """Render the full diff as a plain-text report for a .txt attachment."""
+    def _write_diff_txt(cls, write, name: str, appid: int, old_build: str, new_build: str, diff):
+        """Render the full diff as a plain-text report, line by line via `write`."""
         added, removed, modified, size_delta = diff
-        out = []
-        out.append(f"{name} (AppID {appid}) — Build Updated")
-        out.append(f"Old build: {old_build}   New build: {new_build}")
-        out.append(
+        hs = cls._human_size
+        write(f"{name} (AppID {appid}) — Build Updated\n")
+        write(f"Old build: {old_build}   New build: {new_build}\n")
+        write(
             f"Changes: {len(added)} added, {len(removed)} removed, "
-            f"{len(modified)} modified"
+            f"{len(modified)} modified\n"
         )
-        out.append(f"Total size change: {cls._human_size(size_delta, signed=True)}")
-        out.append("")
+        write(f"Total size change: {hs(size_delta, signed=True)}\n\n")
 
         if modified:
-            out.append(f"=== MODIFIED ({len(modified)}) ===")
-            for p, os, ns in modified:
-                out.append(
-                    f"  {p}  ({cls._human_size(os)} -> {cls._human_size(ns)}, "
-                    f"{cls._human_size((ns or 0) - (os or 0), signed=True)})"
+            write(f"=== MODIFIED ({len(modified)}) ===\n")
+            for p, old_sz, new_sz in modified:
+                write(
+                    f"  {p}  ({hs(old_sz)} -> {hs(new_sz)}, "
+                    f"{hs((new_sz or 0) - (old_sz or 0), signed=True)})\n"
                 )
-            out.append("")
+            write("\n")
         if added:
-            out.append(f"=== ADDED ({len(added)}) ===")
-            for p, s in added:
-                out.append(f"  {p}  ({cls._human_size(s)})")
-            out.append("")
+            write(f"=== ADDED ({len(added)}) ===\n")
+            for p, sz in added:
+                write(f"  {p}  ({hs(sz)})\n")
+            write("\n")
         if removed:
-            out.append(f"=== REMOVED ({len(removed)}) ===")
-            for p, s in removed:
-                out.append(f"  {p}  ({cls._human_size(s)})")
-            out.append("")
-        return "\n".join(out)
+            write(f"=== REMOVED ({len(removed)}) ===\n")
+            for p, sz in removed:
+                write(f"  {p}  ({hs(sz)})\n")
+            write("\n")
+
+    @classmethod
+    def _diff_attachment(cls, name: str, appid: int, old_build: str, new_build: str, diff, filename: str):
+        """Write the diff report to a temp file and wrap it as a discord.File.
+
+        The report is streamed line by line to disk rather than built as one
+        string; the temp file is removed when discord.py closes it after send.
+        """
+        import io
+
+        fp = tempfile.TemporaryFile()
+        text = io.TextIOWrapper(fp, encoding="utf-8", newline="\n")
+        cls._write_diff_txt(text.write, name, appid, old_build, new_build, diff)
+        text.flush()
+        text.detach()
+        fp.seek(0)
+        return discord.File(fp, filename=filename)
 
     @staticmethod
-    def _diff_is_big(diff) -> bool:
-        added, removed, modified, _ = diff
-        return (len(added) + len(removed) + len(modified)) > DIFF_INLINE_LIMIT
+    def _diff_is_big(diff: FileDiff) -> bool:
+        return diff.total > DIFF_INLINE_LIMIT
 
     @staticmethod
     def _is_hashed_bundle(path: str) -> bool:
@@ -828,41 +1483,15 @@ class DenuvoWatch(commands.Cog):
         These get a fresh hash in their filename on every build, so they show
         as add+remove churn rather than meaningful named changes.
         """
-        import re
-
         base = path.rsplit("/", 1)[-1]
-        low = base.lower()
-        # Common hashed-asset extensions.
-        if not low.endswith((".bundle", ".resource", ".ress", ".pak")):
-            # Also catch hashed loose files like 'a1b2c3...d4' with no ext.
-            stem = base
-            ext = ""
-        else:
-            stem, _, ext = base.rpartition(".")
-        # A long hex run anywhere in the stem => almost certainly a content hash.
-        return bool(re.search(r"[0-9a-f]{16,}", stem.lower()))
-
-    @classmethod
-    def _split_bundles(cls, items, keyfn):
-        """Split diff entries into (named_entries, bundle_count, bundle_bytes).
-
-        keyfn(entry) -> (path, size_for_delta). Bundles are collapsed; named
-        files are returned as-is for normal display.
-        """
-        named = []
-        bundle_count = 0
-        bundle_bytes = 0
-        for entry in items:
-            path, size = keyfn(entry)
-            if cls._is_hashed_bundle(path):
-                bundle_count += 1
-                bundle_bytes += size or 0
-            else:
-                named.append(entry)
-        return named, bundle_count, bundle_bytes
+        stem = base
+        # Common hashed-asset extensions; hashed loose files have no ext.
+        if base.lower().endswith(_BUNDLE_EXTS):
+            stem = base.rpartition(".")[0]
+        return _HASHED_STEM.search(stem.lower()) is not None
 
     @staticmethod
-    def build_depot_embed(appid: int, old_build: str, new_build: str, new: dict, diff=None) -> discord.Embed:
+    def build_depot_embed(appid: int, old_build: str, new_build: str, new: dict, diff: Optional[FileDiff] = None) -> discord.Embed:
         name = new.get("name", f"AppID {appid}")
         url = f"https://store.steampowered.com/app/{appid}/"
         embed = discord.Embed(
@@ -878,11 +1507,12 @@ class DenuvoWatch(commands.Cog):
         if diff is not None:
             added, removed, modified, size_delta = diff
 
-            # Collapse content-hashed asset bundles (Unity etc.) into a summary;
-            # keep meaningful named files (exes, dlls, data) listed separately.
-            add_named, add_b, add_bb = DenuvoWatch._split_bundles(added, lambda e: (e[0], e[1]))
-            rem_named, rem_b, rem_bb = DenuvoWatch._split_bundles(removed, lambda e: (e[0], e[1]))
-            mod_named, mod_b, mod_bb = DenuvoWatch._split_bundles(modified, lambda e: (e[0], e[2]))
+            # Content-hashed asset bundles (Unity etc.) are collapsed into a
+            # summary; meaningful named files (exes, dlls, data) are listed.
+            add_named, rem_named, mod_named = diff.named_added, diff.named_removed, diff.named_modified
+            add_b = diff.bundles["added"][0]
+            rem_b = diff.bundles["removed"][0]
+            mod_b = diff.bundles["modified"][0]
 
             summary = (
                 f"🟢 {len(added)} added   "
@@ -907,9 +1537,9 @@ class DenuvoWatch(commands.Cog):
             if not big:
                 if mod_named:
                     lines = [
-                        f"{p}  ({DenuvoWatch._human_size(os)} → {DenuvoWatch._human_size(ns)}, "
-                        f"{DenuvoWatch._human_size((ns or 0) - (os or 0), signed=True)})"
-                        for p, os, ns in mod_named
+                        f"{p}  ({DenuvoWatch._human_size(old_sz)} → {DenuvoWatch._human_size(new_sz)}, "
+                        f"{DenuvoWatch._human_size((new_sz or 0) - (old_sz or 0), signed=True)})"
+                        for p, old_sz, new_sz in mod_named
                     ]
                     embed.add_field(
                         name=f"🟡 Modified files ({len(mod_named)})",
@@ -975,7 +1605,8 @@ class DenuvoWatch(commands.Cog):
                 notify_user = self._format_mention(await self.config.notify_user())
                 mention = self._format_mention(await self.config.mention())
                 allowed = discord.AllowedMentions(users=True, roles=True)
-                snapshots = await self.config.file_snapshots()
+                snapshot_index = await self.config.snapshot_index()
+                snapshots_written = False
                 log.info("Checking %d games…", len(games))
 
                 async def check_single(appid_str):
@@ -1013,29 +1644,39 @@ class DenuvoWatch(commands.Cog):
                     if old_build and new_build and old_build != new_build:
                         # Compute a depot file diff vs. the stored snapshot.
                         diff = None
-                        new_map = None
+                        new_cols = None
                         try:
                             _name, new_map = await self.get_file_map_fresh(appid)
+                            if new_map is not None:
+                                new_cols = await asyncio.to_thread(columns_from_map, new_map)
                         except Exception:
                             log.exception("file map fetch failed for %s", appid_str)
-                        snap = snapshots.get(appid_str)
-                        if new_map is not None and snap and snap.get("files"):
-                            diff = self._diff_file_maps(snap["files"], new_map)
+                        snap = snapshot_index.get(appid_str) or {}
+                        if new_cols is not None and snap.get("blob"):
+                            old_cols = await self.snapshots.aget(snap["blob"])
+                            if old_cols and old_cols[0]:
+                                diff = await asyncio.to_thread(self._merge_diff, old_cols, new_cols)
+                        # An empty diff means the manifest source is still serving
+                        # the old build's listing; recording it would skew the
+                        # averages and mark this build as seen before its real diff.
+                        if diff is not None and diff.total:
+                            try:
+                                await self.heatmap.arecord(
+                                    appid, new_build, diff.heat, diff.churn, diff.total
+                                )
+                            except Exception:
+                                log.exception("heat map update failed for %s", appid_str)
 
                         pings = [p for p in (mention, notify_user) if p]
                         content = " ".join(pings) if pings else None
                         embed = self.build_depot_embed(appid, old_build, new_build, new, diff)
                         file = None
                         if diff is not None and self._diff_is_big(diff):
-                            import io
-
-                            txt = self._build_diff_txt(
+                            file = await asyncio.to_thread(
+                                self._diff_attachment,
                                 new.get("name", f"AppID {appid}"),
                                 appid, old_build, new_build, diff,
-                            )
-                            file = discord.File(
-                                io.BytesIO(txt.encode("utf-8")),
-                                filename=f"depot_diff_{appid}_{new_build}.txt",
+                                f"depot_diff_{appid}_{new_build}.txt",
                             )
                         await channel.send(
                             content=content,
@@ -1047,14 +1688,17 @@ class DenuvoWatch(commands.Cog):
 
                         # Save the new snapshot, keeping the previous build's
                         # files so the last real diff can be replayed later.
-                        if new_map is not None:
-                            old_snap = snapshots.get(appid_str) or {}
-                            snapshots[appid_str] = {
+                        # Only this game's index entry is written.
+                        if new_cols is not None:
+                            entry = {
                                 "build_id": new_build,
-                                "files": new_map,
-                                "prev_build_id": old_snap.get("build_id"),
-                                "prev_files": old_snap.get("files"),
+                                "blob": await self.snapshots.aput_sorted(*new_cols),
+                                "prev_build_id": snap.get("build_id"),
+                                "prev_blob": snap.get("blob"),
                             }
+                            snapshot_index[appid_str] = entry
+                            await self.config.snapshot_index.set_raw(appid_str, value=entry)
+                            snapshots_written = True
 
                     games[appid_str] = {
                         "name": new["name"],
@@ -1065,7 +1709,9 @@ class DenuvoWatch(commands.Cog):
                     }
 
                 await self.config.games.set(games)
-                await self.config.file_snapshots.set(snapshots)
+                self._exe_index.set_watchlist(games)
+                if snapshots_written:
+                    await self._prune_snapshots()
                 log.info("Check complete.")
             except Exception:
                 log.exception("check_games crashed")
@@ -1176,6 +1822,7 @@ class DenuvoWatch(commands.Cog):
             "header": snapshot.get("header", ""),
         }
         await self.config.games.set(games)
+        self._exe_index.set_watchlist(games)
 
         embed = discord.Embed(
             title="✅ Added to Watchlist",
@@ -1216,6 +1863,8 @@ class DenuvoWatch(commands.Cog):
             appid_str, info = matches[0]
             del games[appid_str]
             await self.config.games.set(games)
+            self._exe_index.set_watchlist(games)
+            await self.heatmap.aclear(int(appid_str))
             await ctx.send(f"🗑️ Removed **{info['name']}** from the watchlist.")
             return
 
@@ -1231,6 +1880,8 @@ class DenuvoWatch(commands.Cog):
             name = current.get(chosen_id, {}).get("name", chosen_id)
             current.pop(chosen_id, None)
             await self.config.games.set(current)
+            self._exe_index.set_watchlist(current)
+            await self.heatmap.aclear(int(chosen_id))
             await inter.response.send_message(f"🗑️ Removed **{name}** from the watchlist.")
 
         select.callback = cb
@@ -1294,10 +1945,46 @@ class DenuvoWatch(commands.Cog):
         embed.timestamp = datetime.now(timezone.utc)
         await ctx.send(embed=embed)
 
+    async def _hubcap_search_cached(self, query: str) -> list:
+        """hubcap_search with a short-lived per-query cache.
+
+        A query is answered without the network when it, or a prefix of it
+        whose result list wasn't truncated, was searched within
+        HUBCAP_SEARCH_TTL (the prefix's results are filtered by substring).
+        Failed searches aren't cached.
+        """
+        q = query.lower()
+        now = time.monotonic()
+        cache = self._hubcap_search_cache
+        for n in range(len(q), 2, -1):
+            hit = cache.get(q[:n])
+            if hit is None or now - hit[0] >= HUBCAP_SEARCH_TTL:
+                continue
+            if n == len(q):
+                return hit[1]
+            if len(hit[1]) < AUTOCOMPLETE_LIMIT:
+                return [item for item in hit[1] if q in item["name"].lower()]
+        key = await self._any_hubcap_key()
+        if not key:
+            return []
+        results = await self.hubcap_search(query, key, limit=AUTOCOMPLETE_LIMIT)
+        if results is None:
+            # Don't cache a failure: an empty entry would also answer every
+            # longer query under this prefix for the whole TTL.
+            return []
+        cache.pop(q, None)
+        cache[q] = (now, results)
+        while len(cache) > HUBCAP_SEARCH_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        return results
+
     async def _exeloc_autocomplete(self, interaction: discord.Interaction, current: str):
-        """Suggest games: watchlist + cached first, then HubCap library search."""
+        """Suggest games: watchlist + cached first, then HubCap library search.
+
+        Served from the in-memory ExeLookupIndex; HubCap is only asked (via
+        its query cache) when the local index can't fill the list.
+        """
         current = (current or "").strip()
-        cur_low = current.lower()
         choices = []
         seen = set()
 
@@ -1308,41 +1995,21 @@ class DenuvoWatch(commands.Cog):
             label = f"{name} [{tag}]"[:100]
             choices.append(app_commands.Choice(name=label, value=str(appid_str)))
 
-        try:
-            games = await self.config.games()
-            cache = await self.config.exe_cache()
-        except Exception:
-            games, cache = {}, {}
-
-        # 1) Watchlist matches first.
-        for appid_str, info in games.items():
-            if len(choices) >= 25:
-                break
-            name = info.get("name", appid_str)
-            if not cur_low or cur_low in name.lower() or cur_low in appid_str:
-                add(appid_str, name, "watchlist")
-
-        # 2) Cached (not already shown).
-        for appid_str, entry in cache.items():
-            if len(choices) >= 25:
-                break
-            name = entry.get("name", appid_str)
-            if not cur_low or cur_low in str(name).lower() or cur_low in appid_str:
-                add(appid_str, name, "cached")
+        # 1) Watchlist matches first, 2) then cached games.
+        for appid_str, name, tag in self._exe_index.search(current.lower()):
+            add(appid_str, name, tag)
 
         # 3) HubCap library search for broader matches (free; needs 3+ chars).
-        if len(choices) < 25 and len(current) >= 3:
+        if len(choices) < AUTOCOMPLETE_LIMIT and len(current) >= 3:
             try:
-                key = await self._any_hubcap_key()
-                if key:
-                    for item in await self.hubcap_search(current, key, limit=25):
-                        if len(choices) >= 25:
-                            break
-                        add(str(item["appid"]), item["name"], "library")
+                for item in await self._hubcap_search_cached(current):
+                    if len(choices) >= AUTOCOMPLETE_LIMIT:
+                        break
+                    add(str(item["appid"]), item["name"], "library")
             except Exception:
                 pass
 
-        return choices[:25]
+        return choices[:AUTOCOMPLETE_LIMIT]
 
     @commands.hybrid_command(name="exeloc", description="List all .exe paths in the latest depot for a game")
     @app_commands.describe(query="Pick a watched/cached game, or type a name or AppID")
@@ -1518,6 +2185,8 @@ class DenuvoWatch(commands.Cog):
     async def dw_clear(self, ctx: commands.Context):
         """Clear the entire watchlist."""
         await self.config.games.set({})
+        self._exe_index.set_watchlist({})
+        await self.heatmap.aclear_all()
         await ctx.send("🗑️ Watchlist cleared.")
 
     async def _hubcap_remaining(self, key: str) -> Optional[int]:
@@ -1545,145 +2214,314 @@ class DenuvoWatch(commands.Cog):
         except Exception:
             return None
 
-    @denuvowatch.command(name="cacheall")
-    async def dw_cacheall(self, ctx: commands.Context, mode: str = ""):
-        """Cache .exe paths and file snapshots for the whole watchlist.
-
-        Modes (all SKIP games already cached at the current build):
-          (none)      — free source first, HubCap only if free has nothing.
-          fresh       — for games that need caching, pull from HubCap with
-                        force_update (accurate baseline). Still skips games
-                        already cached at the current build, so re-running it
-                        only spends quota on what's left.
-          force       — re-cache every game (ignore the unchanged-build skip).
-          forcefresh  — force + fresh: re-pull everything from HubCap.
+    # ── background cacheall job ──
 
-        Usage: `[p]denuvowatch cacheall`, `... fresh`, `... force`, `... forcefresh`
-        """
-        mode = (mode or "").strip().lower()
-        # `force` re-caches everything (ignore the unchanged-build skip).
-        # `fresh` uses HubCap force_update as the source but STILL skips games
-        # already cached at the current build. `forcefresh` does both.
-        force = mode in ("force", "true", "forcefresh")
-        fresh = mode in ("fresh", "forcefresh")
-        games = await self.config.games()
-        if not games:
-            await ctx.send("📭 Watchlist is empty.")
-            return
+    def _start_cache_job(self):
+        self._cache_task = asyncio.create_task(self._run_cache_job())
 
-        keys = await self._get_hubcap_keys()
-        cache = await self.config.exe_cache()
+    def _cache_job_running(self) -> bool:
+        return self._cache_task is not None and not self._cache_task.done()
 
-        cached_fresh = 0
-        skipped_unchanged = 0
-        used_hubcap = 0
-        hubcap_skipped_quota = 0
-        no_data = 0
-
-        snapshots = await self.config.file_snapshots()
-        status = await ctx.send(f"🔄 Caching {len(games)} game(s)…")
-
-        for i, (appid_str, info) in enumerate(games.items(), 1):
-            appid = int(appid_str)
-            current_build = info.get("build_id")
-            entry = cache.get(appid_str)
-
-            # Skip if already cached at this build and not forced.
-            if (
-                not force
-                and entry is not None
-                and entry.get("build_id") == current_build
-                and entry.get("exes") is not None
-                and snapshots.get(appid_str, {}).get("build_id") == current_build
-            ):
-                skipped_unchanged += 1
-                continue
+    async def _cache_one(self, appid_str: str, info: dict, job: dict, cache: dict,
+                         index: dict, keys: list, mh_sem, hc_sem) -> str:
+        """Warm one game's exe paths and file snapshot.
 
-            name = None
-            records = None
-            source = None
+        Returns the outcome: "skipped" (already cached at this build),
+        "manifesthub" / "hubcap" (cached from that source), "quota" (needed
+        HubCap but every key is exhausted), "nodata", or "kept" (fetch failed,
+        existing cache entry left alone).
+        """
+        appid = int(appid_str)
+        current_build = info.get("build_id")
+        entry = cache.get(appid_str)
 
-            if fresh and keys:
-                # Always pull fresh from HubCap (accurate baseline).
-                key = await self._pick_hubcap_key()
+        # Skip if already cached at this build and not forced.
+        if (
+            not job["force"]
+            and entry is not None
+            and entry.get("build_id") == current_build
+            and entry.get("exes") is not None
+            and index.get(appid_str, {}).get("build_id") == current_build
+        ):
+            return "skipped"
+
+        name = None
+        records = None
+        source = None
+        out_of_quota = False
+
+        if job["fresh"] and keys:
+            # Always pull fresh from HubCap (accurate baseline).
+            async with hc_sem, self._hubcap_lease() as key:
                 if key:
                     hc_name, hc_records = await self._records_hubcap(
                         appid, key, force_update=True
                     )
                     if hc_records is not None:
                         name, records, source = hc_name, hc_records, "HubCapManifest"
-                        used_hubcap += 1
                 else:
-                    hubcap_skipped_quota += 1
-            else:
-                # Free source first.
+                    out_of_quota = True
+        else:
+            # Free source first.
+            async with mh_sem:
                 name, records = await self._records_manifesthub(appid)
-                source = "ManifestHub2" if records else None
+            source = "ManifestHub2" if records else None
 
-                # HubCap fallback only when free had nothing, key present, quota left.
-                if not records and keys:
-                    key = await self._pick_hubcap_key()
+            # HubCap fallback only when free had nothing, key present, quota left.
+            if not records and keys:
+                async with hc_sem, self._hubcap_lease() as key:
                     if key:
                         hc_name, hc_records = await self._records_hubcap(appid, key)
                         if hc_records is not None:
                             name, records, source = hc_name, hc_records, "HubCapManifest"
-                            used_hubcap += 1
                     else:
-                        hubcap_skipped_quota += 1
+                        out_of_quota = True
 
-            if records is not None and source:
-                exes = sorted(
-                    {r["path"] for r in records if r["path"].lower().endswith(".exe")},
-                    key=str.lower,
+        if records is not None and source:
+            new_entry = {
+                "name": name or info.get("name"),
+                "exes": await asyncio.to_thread(records.exe_paths),
+                "build_id": current_build,
+                "source": source,
+                "cached_at": int(datetime.now(timezone.utc).timestamp()),
+            }
+            cache[appid_str] = new_entry
+            await self.config.exe_cache.set_raw(appid_str, value=new_entry)
+            self._exe_index.update_cached(appid_str, new_entry["name"])
+            # Seed/update the file snapshot used for future build diffs.
+            snap = {
+                "build_id": current_build,
+                "blob": await self.snapshots.aput(records.paths, records.sizes, records.shas),
+            }
+            index[appid_str] = snap
+            await self.config.snapshot_index.set_raw(appid_str, value=snap)
+            return "hubcap" if source == "HubCapManifest" else "manifesthub"
+        if out_of_quota:
+            return "quota"
+        return "nodata" if entry is None else "kept"
+
+    async def _run_cache_job(self):
+        """Work through the checkpointed cacheall job until done or out of quota.
+
+        Every finished game is recorded in the job's `done` list right away,
+        so a reload or crash resumes with only the remaining games. Games
+        skipped for lack of HubCap quota are parked in `deferred` and the job
+        pauses until `cacheall resume`.
+        """
+        await self.bot.wait_until_red_ready()
+        job = await self.config.cache_job()
+        if not job:
+            return
+        games = await self.config.games()
+        keys = await self._get_hubcap_keys()
+        cache = await self.config.exe_cache()
+        index = await self.config.snapshot_index()
+        done = set(job["done"])
+        todo = [a for a in job["queue"] if a not in done and a in games]
+        # Deferred games aren't in `done`, so they're back in `todo`; their
+        # quota skips are recounted from scratch on this pass.
+        job["deferred"] = []
+        job["counts"].pop("quota", None)
+        job["state"] = "running"
+        await self.config.cache_job.set(job)
+
+        progress = self._cache_progress = {
+            "started": time.monotonic(),
+            "processed": 0,
+            "total": len(todo),
+            "last_edit": 0.0,
+        }
+        mh_sem = asyncio.Semaphore(CACHE_MH_CONCURRENCY)
+        hc_sem = asyncio.Semaphore(CACHE_HC_CONCURRENCY)
+        checkpoint = asyncio.Lock()
+
+        async def work(appid_str):
+            try:
+                outcome = await self._cache_one(
+                    appid_str, games[appid_str], job, cache, index, keys, mh_sem, hc_sem
                 )
-                cache[appid_str] = {
-                    "name": name or info.get("name"),
-                    "exes": exes,
-                    "build_id": current_build,
-                    "source": source,
-                    "cached_at": int(datetime.now(timezone.utc).timestamp()),
-                }
-                # Seed/update the file snapshot used for future build diffs.
-                snapshots[appid_str] = {
-                    "build_id": current_build,
-                    "files": {r["path"]: {"sha": r["sha"], "size": r["size"]} for r in records},
-                }
-                cached_fresh += 1
-            elif entry is None:
-                no_data += 1
-
-            if i % 5 == 0:
-                try:
-                    await status.edit(content=f"🔄 Caching… {i}/{len(games)} processed")
-                except Exception:
-                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("cacheall failed for %s", appid_str)
+                outcome = "kept" if appid_str in cache else "nodata"
+            async with checkpoint:
+                job["counts"][outcome] = job["counts"].get(outcome, 0) + 1
+                (job["deferred"] if outcome == "quota" else job["done"]).append(appid_str)
+                await self.config.cache_job.set(job)
+                progress["processed"] += 1
+                now = time.monotonic()
+                if self._cache_message is not None and now - progress["last_edit"] >= CACHE_STATUS_EVERY:
+                    progress["last_edit"] = now
+                    try:
+                        await self._cache_message.edit(content=self._cache_status_text(job))
+                    except Exception:
+                        pass
+
+        await asyncio.gather(*(work(a) for a in todo))
+
+        if any(job["counts"].get(k) for k in ("manifesthub", "hubcap")):
+            await self._prune_snapshots()
+
+        lines = self._cache_summary_lines(job)
+        if job["deferred"]:
+            job["state"] = "paused"
+            await self.config.cache_job.set(job)
+            lines.append(
+                f"⏸️ {len(job['deferred'])} game(s) deferred until HubCap quota resets — "
+                "run `[p]denuvowatch cacheall resume` to finish them."
+            )
+        else:
+            await self.config.cache_job.set(None)
+
+        # Total remaining across all keys (re-synced, since this run spent some).
+        self._hubcap_pool.set_keys(keys)
+        await self._hubcap_pool.sync(force=True)
+        total_remaining, unknown = self._hubcap_pool.total_remaining()
+        if keys:
+            suffix = "+" if unknown else ""
+            lines.append(f"• HubCap remaining today: {total_remaining}{suffix} across {len(keys)} key(s)")
+
+        text = "\n".join(lines)
+        message, self._cache_message = self._cache_message, None
+        try:
+            if message is not None:
+                await message.edit(content=text)
+            else:
+                channel = self.bot.get_channel(job.get("channel_id") or 0)
+                if channel is not None:
+                    await channel.send(text)
+        except Exception:
+            log.exception("cacheall summary post failed")
 
-        await self.config.exe_cache.set(cache)
-        await self.config.file_snapshots.set(snapshots)
+    @staticmethod
+    def _format_eta(seconds: float) -> str:
+        seconds = int(seconds)
+        if seconds >= 3600:
+            return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+        if seconds >= 60:
+            return f"{seconds // 60}m {seconds % 60:02d}s"
+        return f"{seconds}s"
+
+    def _cache_status_text(self, job: dict) -> str:
+        """One-line live progress: done/total, throughput and ETA."""
+        total = len(job["queue"])
+        done = len(job["done"])
+        line = f"🔄 Caching… {done}/{total} done"
+        if job.get("deferred"):
+            line += f", {len(job['deferred'])} deferred"
+        progress = self._cache_progress
+        if self._cache_job_running() and progress.get("processed"):
+            elapsed = max(time.monotonic() - progress["started"], 1e-6)
+            rate = progress["processed"] / elapsed
+            left = progress["total"] - progress["processed"]
+            line += f" • {rate * 60:.1f} games/min • ETA ~{self._format_eta(left / rate)}"
+        return line
 
+    @staticmethod
+    def _cache_summary_lines(job: dict) -> list:
+        counts = job["counts"]
         lines = [
             "✅ **Cache complete.**",
-            f"• Cached/updated: {cached_fresh}",
-            f"• Skipped (build unchanged): {skipped_unchanged}",
-            f"• HubCap downloads used: {used_hubcap}",
+            f"• Cached/updated: {counts.get('manifesthub', 0) + counts.get('hubcap', 0)}",
+            f"• Skipped (build unchanged): {counts.get('skipped', 0)}",
+            f"• HubCap downloads used: {counts.get('hubcap', 0)}",
         ]
-        if hubcap_skipped_quota:
-            lines.append(f"• ⚠️ Skipped (all HubCap keys exhausted): {hubcap_skipped_quota} — kept existing cache")
-        if no_data:
-            lines.append(f"• No depot data anywhere: {no_data}")
-        # Total remaining across all keys.
-        total_remaining = 0
-        unknown = False
-        for k in keys:
-            rem = await self._hubcap_remaining(k)
-            if rem is None:
-                unknown = True
-            else:
-                total_remaining += rem
-        if keys:
-            suffix = "+" if unknown else ""
-            lines.append(f"• HubCap remaining today: {total_remaining}{suffix} across {len(keys)} key(s)")
-        await status.edit(content="\n".join(lines))
+        if counts.get("quota"):
+            lines.append(
+                f"• ⚠️ Skipped (all HubCap keys exhausted): {counts['quota']} — kept existing cache"
+            )
+        if counts.get("nodata"):
+            lines.append(f"• No depot data anywhere: {counts['nodata']}")
+        return lines
+
+    @denuvowatch.command(name="cacheall")
+    async def dw_cacheall(self, ctx: commands.Context, mode: str = ""):
+        """Cache .exe paths and file snapshots for the whole watchlist.
+
+        Runs in the background with bounded concurrency per source and
+        checkpoints each finished game, so it survives reloads.
+
+        Modes (all SKIP games already cached at the current build):
+          (none)      — free source first, HubCap only if free has nothing.
+          fresh       — for games that need caching, pull from HubCap with
+                        force_update (accurate baseline). Still skips games
+                        already cached at the current build, so re-running it
+                        only spends quota on what's left.
+          force       — re-cache every game (ignore the unchanged-build skip).
+          forcefresh  — force + fresh: re-pull everything from HubCap.
+        Job control:
+          status      — progress, throughput and ETA of the current job.
+          resume      — continue a paused job (e.g. after quota reset).
+          cancel      — stop and forget the current job (cached games stay).
+
+        Usage: `[p]denuvowatch cacheall`, `... fresh`, `... force`, `... forcefresh`
+        """
+        mode = (mode or "").strip().lower()
+        job = await self.config.cache_job()
+
+        if mode == "status":
+            if not job:
+                await ctx.send("ℹ️ No cacheall job in progress.")
+                return
+            state = "running" if self._cache_job_running() else job.get("state", "paused")
+            await ctx.send(f"{self._cache_status_text(job)}\nState: **{state}** (`{job.get('mode') or 'default'}` mode)")
+            return
+        if mode in ("cancel", "stop"):
+            if not job:
+                await ctx.send("ℹ️ No cacheall job in progress.")
+                return
+            if self._cache_job_running():
+                self._cache_task.cancel()
+                # Let in-flight checkpoint writes unwind before dropping the job.
+                await asyncio.wait([self._cache_task])
+            self._cache_message = None
+            await self.config.cache_job.set(None)
+            await ctx.send(f"🛑 Cacheall cancelled after {len(job['done'])}/{len(job['queue'])} game(s).")
+            return
+        if mode == "resume":
+            if not job:
+                await ctx.send("ℹ️ No cacheall job to resume.")
+                return
+            if self._cache_job_running():
+                await ctx.send(self._cache_status_text(job))
+                return
+            self._cache_message = await ctx.send(self._cache_status_text(job))
+            self._start_cache_job()
+            return
+
+        if job:
+            await ctx.send(
+                "⏳ A cacheall job is already in progress. Use `cacheall status`, "
+                "`cacheall resume` or `cacheall cancel`."
+            )
+            return
+
+        # `force` re-caches everything (ignore the unchanged-build skip).
+        # `fresh` uses HubCap force_update as the source but STILL skips games
+        # already cached at the current build. `forcefresh` does both.
+        force = mode in ("force", "true", "forcefresh")
+        fresh = mode in ("fresh", "forcefresh")
+        games = await self.config.games()
+        if not games:
+            await ctx.send("📭 Watchlist is empty.")
+            return
+
+        job = {
+            "mode": mode,
+            "force": force,
+            "fresh": fresh,
+            "queue": list(games),
+            "done": [],
+            "deferred": [],
+            "counts": {},
+            "state": "running",
+            "channel_id": ctx.channel.id,
+            "started_at": int(datetime.now(timezone.utc).timestamp()),
+        }
+        await self.config.cache_job.set(job)
+        self._cache_message = await ctx.send(f"🔄 Caching {len(games)} game(s) in the background…")
+        self._start_cache_job()
 
     @denuvowatch.command(name="difftest")
     async def dw_difftest(self, ctx: commands.Context, *, query: str):
@@ -1739,12 +2577,9 @@ class DenuvoWatch(commands.Cog):
         embed = self.build_depot_embed(appid, "OLD_TEST", "NEW_TEST", new_info, diff)
         file = None
         if self._diff_is_big(diff):
-            import io
-
-            txt = self._build_diff_txt(name, appid, "OLD_TEST", "NEW_TEST", diff)
-            file = discord.File(
-                io.BytesIO(txt.encode("utf-8")),
-                filename=f"depot_diff_{appid}_preview.txt",
+            file = await asyncio.to_thread(
+                self._diff_attachment, name, appid, "OLD_TEST", "NEW_TEST", diff,
+                f"depot_diff_{appid}_preview.txt",
             )
         await ctx.send(
             content="🧪 **Simulated diff preview** (no data changed):",
@@ -1765,9 +2600,10 @@ class DenuvoWatch(commands.Cog):
             await ctx.send(f"❌ Couldn't resolve `{query}` to a Steam game.")
             return
 
-        snapshots = await self.config.file_snapshots()
-        snap = snapshots.get(str(appid))
-        if not snap or not snap.get("prev_files"):
+        snap = (await self.config.snapshot_index()).get(str(appid)) or {}
+        old_cols = await self.snapshots.aget(snap.get("prev_blob"))
+        new_cols = await self.snapshots.aget(snap.get("blob"))
+        if not old_cols or not old_cols[0] or new_cols is None:
             await ctx.send(
                 "ℹ️ No previous-build snapshot stored for that game yet, so there's "
                 "no real diff to replay. It'll be available after the game's next "
@@ -1777,19 +2613,16 @@ class DenuvoWatch(commands.Cog):
 
         old_build = snap.get("prev_build_id") or "previous"
         new_build = snap.get("build_id") or "current"
-        diff = self._diff_file_maps(snap["prev_files"], snap["files"])
+        diff = await asyncio.to_thread(self._merge_diff, old_cols, new_cols)
 
         name = (games.get(str(appid), {}) or {}).get("name") or f"AppID {appid}"
         new_info = {"name": name, "build_time": None, "header": ""}
         embed = self.build_depot_embed(appid, old_build, new_build, new_info, diff)
         file = None
         if self._diff_is_big(diff):
-            import io
-
-            txt = self._build_diff_txt(name, appid, old_build, new_build, diff)
-            file = discord.File(
-                io.BytesIO(txt.encode("utf-8")),
-                filename=f"depot_diff_{appid}_{new_build}.txt",
+            file = await asyncio.to_thread(
+                self._diff_attachment, name, appid, old_build, new_build, diff,
+                f"depot_diff_{appid}_{new_build}.txt",
             )
         await ctx.send(
             content="🕑 **Replay of last build diff:**",
@@ -1797,11 +2630,73 @@ class DenuvoWatch(commands.Cog):
             file=file,
         )
 
+    @denuvowatch.command(name="heatmap")
+    async def dw_heatmap(self, ctx: commands.Context, query: str, top: int = 10):
+        """Show which files change most often across a game's build updates.
+
+        Built from every real build diff recorded since this was added (no
+        extra downloads). Content-hashed bundles are grouped per folder as
+        `*.ext`. Usage: `[p]denuvowatch heatmap <game> [top]`
+        """
+        games = await self.config.games()
+        appid = await self._resolve_appid(query, games)
+        if appid is None:
+            await ctx.send(f"❌ Couldn't resolve `{query}` to a Steam game.")
+            return
+        stats = await self.heatmap.aget(appid)
+        if not stats or not stats.get("builds"):
+            await ctx.send(
+                "ℹ️ No build diffs recorded for that game yet. Stats build up as "
+                "build updates are detected."
+            )
+            return
+
+        top = max(1, min(top, 25))
+        builds = stats["builds"]
+        churn = stats["churn"]
+        hottest = sorted(
+            stats["paths"].items(), key=lambda kv: (kv[1][0], kv[1][1]), reverse=True
+        )[:top]
+        name = (games.get(str(appid), {}) or {}).get("name") or f"AppID {appid}"
+
+        embed = discord.Embed(
+            title=f"🔥 Change heat map — {name}",
+            color=discord.Color.orange(),
+        )
+        embed.add_field(name="Builds recorded", value=str(builds), inline=True)
+        embed.add_field(
+            name="Avg patch size", value=self._human_size(churn // builds), inline=True
+        )
+        embed.add_field(
+            name="Avg files changed", value=f"{stats['files'] / builds:.1f}", inline=True
+        )
+        lines = [
+            f"{path}  ({hits}/{builds} builds, {self._human_size(nbytes)})"
+            for path, (hits, nbytes, _last) in hottest
+        ]
+        embed.add_field(
+            name=f"Hottest paths (top {len(hottest)})",
+            value=self._format_diff_lines(lines, max_items=top),
+            inline=False,
+        )
+        by_bytes = sorted((row[1] for row in stats["paths"].values()), reverse=True)
+        if churn and len(by_bytes) > 3:
+            share = sum(by_bytes[:3]) / churn
+            embed.add_field(
+                name="Concentration",
+                value=f"The 3 heaviest paths account for **{share:.0%}** of all patch churn.",
+                inline=False,
+            )
+        embed.set_footer(text=f"AppID {appid} • last recorded build {stats.get('last_build')}")
+        await ctx.send(embed=embed)
+
     @denuvowatch.command(name="cacheclear")
     async def dw_cacheclear(self, ctx: commands.Context):
         """Clear the cached exe-path data and file snapshots for all games."""
         await self.config.exe_cache.set({})
-        await self.config.file_snapshots.set({})
+        self._exe_index.set_cached({})
+        await self.config.snapshot_index.set({})
+        await self.snapshots.aprune((), min_age=0)
         await ctx.send("🗑️ Exe-path cache and file snapshots cleared.")
 
     @denuvowatch.command(name="cachestatus")
@@ -1821,6 +2716,103 @@ class DenuvoWatch(commands.Cog):
         embed.add_field(name="Cached games", value=str(len(cache)), inline=True)
         embed.add_field(name="Watchlist", value=str(len(games)), inline=True)
         embed.add_field(name="Stale (build moved)", value=str(stale), inline=True)
+        blobs, used = await self.snapshots.ausage()
+        embed.add_field(
+            name="File snapshots",
+            value=f"{blobs} on disk ({self._human_size(used)})",
+            inline=True,
+        )
+        await ctx.send(embed=embed)
+
+    @denuvowatch.group(name="manifestcache", invoke_without_command=True)
+    async def dw_manifestcache(self, ctx: commands.Context):
+        """Show the parsed depot-manifest cache: size, hit rate and evictions.
+
+        Manifests are immutable per depot+gid, so cached depots skip both the
+        ManifestHub2 download and the parse. Counters reset on reload.
+        """
+        st = self.manifest_cache.stats()
+        lookups = st["hits"] + st["misses"]
+        rate = f"{st['hits'] / lookups:.0%}" if lookups else "—"
+        embed = discord.Embed(title="📦 Manifest Cache", color=discord.Color.blurple())
+        embed.add_field(name="Depots cached", value=str(st["entries"]), inline=True)
+        embed.add_field(
+            name="Size",
+            value=f"{self._human_size(st['bytes'])} / {self._human_size(st['max_bytes'])}",
+            inline=True,
+        )
+        embed.add_field(name="Hit rate", value=f"{rate} ({st['hits']}/{lookups})", inline=True)
+        embed.add_field(
+            name="Evictions",
+            value=f"{st['evictions']} ({self._human_size(st['evicted_bytes'])})",
+            inline=True,
+        )
+        embed.set_footer(text="`manifestcache limit <MB>` • `manifestcache clear`")
+        await ctx.send(embed=embed)
+
+    @dw_manifestcache.command(name="limit")
+    async def dw_manifestcache_limit(self, ctx: commands.Context, megabytes: int):
+        """Set the cache size limit in MB (least recently used depots are evicted)."""
+        if megabytes < 16:
+            await ctx.send("❌ Limit must be at least 16 MB.")
+            return
+        await self.config.manifest_cache_mb.set(megabytes)
+        await self.manifest_cache.aset_limit(megabytes << 20)
+        await ctx.send(f"✅ Manifest cache limit set to **{megabytes} MB**.")
+
+    @dw_manifestcache.command(name="clear")
+    async def dw_manifestcache_clear(self, ctx: commands.Context):
+        """Delete every cached depot manifest."""
+        removed = await self.manifest_cache.aclear()
+        await ctx.send(f"🗑️ Removed {removed} cached depot manifest(s).")
+
+    @denuvowatch.command(name="parsebench")
+    async def dw_parsebench(self, ctx: commands.Context, query: str, runs: int = 3):
+        """Benchmark the manifest decoders on a game's real depot manifests.
+
+        Downloads the game's public manifests from ManifestHub2 (free, no
+        HubCap quota) and times the original decoder against the in-place one
+        in a worker thread. Nothing is cached or stored.
+        """
+        runs = max(1, min(runs, 10))
+        async with ctx.typing():
+            games = await self.config.games()
+            appid = await self._resolve_appid(query, games)
+            if appid is None:
+                await ctx.send(f"❌ Couldn't resolve `{query}` to a Steam game.")
+                return
+            metadata = await self.mh_fetch_metadata(appid)
+            blobs = []
+            for depot_id, gid, depot_key in self._public_depots(metadata or {}):
+                blob = await self.mh_fetch_manifest_blob(appid, depot_id, gid)
+                if blob:
+                    blobs.append((blob, depot_key))
+            if not blobs:
+                await ctx.send(f"❌ ManifestHub2 has no manifests for AppID `{appid}`.")
+                return
+            result = await asyncio.to_thread(bench_manifest_parsers, blobs, runs)
+
+        embed = discord.Embed(
+            title=f"⏱️ Manifest Parse — {(metadata or {}).get('name') or f'AppID {appid}'}",
+            color=discord.Color.blurple(),
+        )
+        embed.add_field(name="Manifests", value=str(result["blobs"]), inline=True)
+        embed.add_field(name="Size", value=self._human_size(result["bytes"]), inline=True)
+        embed.add_field(name="Files", value=f"{result['files']:,}", inline=True)
+        ref = result["reference"]
+        for label, key in (("Original", "reference"), ("In-place (records)", "records"), ("In-place (columns)", "columns")):
+            t = result[key]
+            embed.add_field(
+                name=label,
+                value=f"{t * 1000:.1f} ms" + (f" ({ref / t:.1f}×)" if key != "reference" and t else ""),
+                inline=True,
+            )
+        embed.add_field(
+            name="Output",
+            value="✅ identical" if result["identical"] else "⚠️ differs from the original decoder",
+            inline=False,
+        )
+        embed.set_footer(text=f"AppID {appid} • best of {runs} run(s)")
         await ctx.send(embed=embed)
 
     async def _validate_hubcap_key(self, key: str):
@@ -1922,17 +2914,22 @@ class DenuvoWatch(commands.Cog):
         lines = []
         total = 0
         unknown = False
+        pool = self._hubcap_pool
+        pool.set_keys(keys)
         for i, k in enumerate(keys, 1):
             info = await self._validate_hubcap_key(k)
             if info == "ratelimited":
+                pool.update(k, 0)
                 lines.append(f"{i}. `{self._mask_key(k)}` — ⏳ daily limit reached (0 left)")
                 continue
             if info is None:
+                pool.update(k, None)
                 lines.append(f"{i}. `{self._mask_key(k)}` — ❌ invalid/unreachable")
                 continue
             used = info.get("daily_usage", 0)
             limit = info.get("daily_limit", 0)
             rem = max(0, (limit or 0) - (used or 0))
+            pool.update(k, rem)
             total += rem
             lines.append(f"{i}. `{self._mask_key(k)}` — {rem} left ({used}/{limit})")
         embed = discord.Embed(
@@ -2031,6 +3028,7 @@ class DenuvoWatch(commands.Cog):
             added += 1
 
         await self.config.games.set(games)
+        self._exe_index.set_watchlist(games)
 
         lines = [f"✅ Imported **{added}** game(s). Watchlist now {len(games)}/{MAX_GAMES}."]
         if skipped_existing:
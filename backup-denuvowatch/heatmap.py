@@ -0,0 +1,115 @@
+"""
+ChangeHeatMap - per-game, per-path change statistics across build diffs.
+
+Every real build diff is folded into a small per-game record: how many builds
+were seen, their total churn, and for each path (content-hashed bundles
+grouped as `dir/*.ext`) how many builds touched it and how many bytes it
+accounted for. That answers "which files change every patch" without keeping
+any old file listings around.
+
+Records are zlib-compressed JSON, one file per AppID:
+
+    {"builds": int, "churn": int, "files": int, "last_build": str,
+     "paths": {path: [builds_touched, churn_bytes, last_build]}}
+
+To stay compact, a game keeps at most MAX_PATHS paths. Past that it's trimmed
+to TRIM_TO paths: the ones touched by the build being recorded are kept, then
+the most frequently changed of the rest. Trimming below the cap leaves room
+for newly appearing paths to build up counts over the next few builds instead
+of being dropped the moment they show up. A game's record is deleted when it leaves
+the watchlist.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+MAX_PATHS = 5000
+TRIM_TO = 4000
+SUFFIX = ".json.z"
+
+
+class ChangeHeatMap:
+    """Directory of per-AppID change statistics records."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, appid: int) -> Path:
+        return self.root / f"{int(appid)}{SUFFIX}"
+
+    def get(self, appid: int) -> Optional[dict]:
+        try:
+            raw = self._path(appid).read_bytes()
+        except FileNotFoundError:
+            return None
+        return json.loads(zlib.decompress(raw))
+
+    def record(self, appid: int, build_id: str, heat: dict, churn: int, files: int) -> bool:
+        """Fold one build diff in. `heat` is {path: churn_bytes}.
+
+        Returns False (and changes nothing) if this build was already recorded.
+        """
+        with self._lock:
+            stats = self.get(appid) or {
+                "builds": 0, "churn": 0, "files": 0, "last_build": None, "paths": {},
+            }
+            if stats["last_build"] == build_id:
+                return False
+            stats["builds"] += 1
+            stats["churn"] += churn
+            stats["files"] += files
+            stats["last_build"] = build_id
+            paths = stats["paths"]
+            for path, nbytes in heat.items():
+                row = paths.get(path)
+                if row is None:
+                    paths[path] = [1, nbytes, build_id]
+                else:
+                    row[0] += 1
+                    row[1] += nbytes
+                    row[2] = build_id
+            if len(paths) > MAX_PATHS:
+                keep = sorted(
+                    paths.items(),
+                    key=lambda kv: (kv[1][2] == build_id, kv[1][0], kv[1][1]),
+                    reverse=True,
+                )
+                stats["paths"] = dict(keep[:TRIM_TO])
+            target = self._path(appid)
+            tmp = target.with_suffix(".tmp")
+            tmp.write_bytes(zlib.compress(json.dumps(stats, separators=(",", ":")).encode("utf-8")))
+            os.replace(tmp, target)
+            return True
+
+    def clear(self, appid: int):
+        with self._lock:
+            self._path(appid).unlink(missing_ok=True)
+
+    def clear_all(self) -> int:
+        with self._lock:
+            removed = 0
+            for f in self.root.glob(f"*{SUFFIX}"):
+                f.unlink(missing_ok=True)
+                removed += 1
+            return removed
+
+    # ── async wrappers ──
+
+    async def aget(self, appid: int) -> Optional[dict]:
+        return await asyncio.to_thread(self.get, appid)
+
+    async def arecord(self, appid: int, build_id: str, heat: dict, churn: int, files: int) -> bool:
+        return await asyncio.to_thread(self.record, appid, build_id, heat, churn, files)
+
+    async def aclear(self, appid: int):
+        await asyncio.to_thread(self.clear, appid)
+
+    async def aclear_all(self) -> int:
+        return await asyncio.to_thread(self.clear_all)
@@ -0,0 +1,147 @@
+"""
+ManifestCache - size-bounded on-disk LRU of parsed depot manifests.
+
+A Steam manifest is immutable for a given `{depot}_{gid}`, so once a depot has
+been downloaded and parsed its file listing can be reused for every later
+/exeloc, difftest, lastdiff or cache rebuild until the depot gets a new gid.
+Entries hold the parsed (paths, sizes, shas) columns in the same compressed
+format as SnapshotStore blobs, in manifest order, which skips both the
+download and the parse on a hit.
+
+Recency is tracked in memory (seeded from file mtimes on start) and mirrored
+to mtimes on each hit, so LRU order survives a reload. When the total size
+goes over the limit, least-recently-used entries are evicted.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .snapshots import pack_columns, unpack_columns
+
+SUFFIX = ".cols"
+
+
+class ManifestCache:
+    """Parsed manifests keyed by depot+gid, evicted LRU past `max_bytes`."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        files = []
+        for f in self.root.glob(f"*{SUFFIX}"):
+            st = f.stat()
+            files.append((st.st_mtime, f.stem, st.st_size))
+        for _mtime, name, size in sorted(files):
+            self._entries[name] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def _name(depot_id, gid) -> str:
+        return f"{depot_id}_{gid}"
+
+    def _path(self, name: str) -> Path:
+        return self.root / f"{name}{SUFFIX}"
+
+    def get(self, depot_id, gid):
+        """Cached (paths, sizes, shas) for a depot manifest, or None."""
+        name = self._name(depot_id, gid)
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(name)
+            self.hits += 1
+        try:
+            path = self._path(name)
+            cols = unpack_columns(path.read_bytes())
+            os.utime(path)
+            return cols
+        except Exception:
+            # Unreadable entry: forget it and treat as a miss.
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+                self._drop(name)
+            return None
+
+    def put(self, depot_id, gid, cols):
+        name = self._name(depot_id, gid)
+        raw = pack_columns(*cols)
+        # A unique temp name per writer: two misses on the same depot+gid
+        # (say cacheall and /exeloc) may both be writing it at once.
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, self._path(name))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self.total_bytes -= self._entries.pop(name, 0)
+            self._entries[name] = len(raw)
+            self.total_bytes += len(raw)
+            self._evict()
+
+    def _drop(self, name: str) -> int:
+        size = self._entries.pop(name, 0)
+        self.total_bytes -= size
+        self._path(name).unlink(missing_ok=True)
+        return size
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds the limit.
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self.evicted_bytes += self._drop(oldest)
+            self.evictions += 1
+
+    def set_limit(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            for name in list(self._entries):
+                self._drop(name)
+            return count
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
+
+    # ── async wrappers ──
+
+    async def aget(self, depot_id, gid):
+        return await asyncio.to_thread(self.get, depot_id, gid)
+
+    async def aput(self, depot_id, gid, cols):
+        await asyncio.to_thread(self.put, depot_id, gid, cols)
+
+    async def aset_limit(self, max_bytes: int):
+        await asyncio.to_thread(self.set_limit, max_bytes)
+
+    async def aclear(self) -> int:
+        return await asyncio.to_thread(self.clear)
@@ -0,0 +1,255 @@
+"""
+SnapshotStore - content-addressed on-disk storage for depot file snapshots.
+
+A snapshot is a game's full file listing at one build ({path: {sha, size}}).
+Instead of keeping two of those per game inside Red Config JSON, each listing
+is packed into a compact binary blob and written once under the hash of its
+contents, so an unchanged listing seen again (same build re-cached, a build
+that only touched other depots' metadata) costs nothing. Config only keeps a
+small per-game index of blob digests.
+
+Blob layout (after the 5-byte header `DWS1` + codec byte), all little-endian:
+
+    uint32 count
+    uint32 path_bytes, then `count` UTF-8 paths joined by NUL
+    count x uint64 sizes
+    count x uint8  sha lengths, then the raw sha bytes back to back
+
+Rows are sorted by `snapshot_key` (case-folded path, then the exact path) —
+the order diffs are displayed in — so two snapshots can be compared by a
+single merge walk without re-sorting either side.
+The payload is zstd-compressed when `zstandard` is installed, zlib otherwise;
+the codec byte lets either build read blobs written by the other (reading a
+zstd blob still needs `zstandard`).
+"""
+
+import asyncio
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+MAGIC = b"DWS1"
+CODEC_ZLIB = b"z"
+CODEC_ZSTD = b"s"
+SUFFIX = ".snap"
+
+
+def _le(arr: array) -> array:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def snapshot_key(path: str):
+    return path.lower(), path
+
+
+def _sorted_paths(paths) -> list:
+    # Stable sort on the case-folded path over an exact-path sort gives
+    # snapshot_key order without building a key tuple per path.
+    return sorted(sorted(paths), key=str.lower)
+
+
+def sort_columns(paths, sizes, shas):
+    """Return (paths, sizes, shas) sorted by snapshot_key, one row per path."""
+    rows = {p: (s, h) for p, s, h in zip(paths, sizes, shas)}
+    order = _sorted_paths(rows)
+    return order, [rows[p][0] for p in order], [rows[p][1] for p in order]
+
+
+def encode_snapshot(paths, sizes, shas) -> bytes:
+    """Pack already-sorted path/size/sha columns into the uncompressed payload."""
+    names = "\0".join(paths).encode("utf-8")
+    size_col = array("Q", sizes)
+    sha_raw = [bytes.fromhex(h) for h in shas]
+    sha_len = array("B", (len(h) for h in sha_raw))
+    return b"".join((
+        struct.pack("<II", len(paths), len(names)),
+        names,
+        _le(size_col).tobytes(),
+        sha_len.tobytes(),
+        b"".join(sha_raw),
+    ))
+
+
+def decode_snapshot(payload: bytes):
+    """Unpack a payload into sorted (paths, sizes, shas) columns."""
+    count, name_len = struct.unpack_from("<II", payload, 0)
+    pos = 8
+    paths = payload[pos:pos + name_len].decode("utf-8").split("\0") if count else []
+    pos += name_len
+    sizes = array("Q")
+    sizes.frombytes(payload[pos:pos + 8 * count])
+    sizes = _le(sizes)
+    pos += 8 * count
+    lens = payload[pos:pos + count]
+    pos += count
+    shas = []
+    for ln in lens:
+        shas.append(payload[pos:pos + ln].hex())
+        pos += ln
+    return paths, sizes, shas
+
+
+def pack_columns(paths, sizes, shas) -> bytes:
+    """Encode columns (kept in the given order) as a compressed blob."""
+    return pack_payload(encode_snapshot(paths, sizes, shas))
+
+
+def pack_payload(payload: bytes) -> bytes:
+    """Compress an encode_snapshot payload into a blob."""
+    if zstandard is not None:
+        body = CODEC_ZSTD + zstandard.ZstdCompressor(level=10).compress(payload)
+    else:
+        body = CODEC_ZLIB + zlib.compress(payload, 6)
+    return MAGIC + body
+
+
+def unpack_columns(raw: bytes):
+    """Inverse of pack_columns: (paths, sizes, shas)."""
+    if raw[:4] != MAGIC:
+        raise ValueError("not a snapshot blob")
+    codec, body = raw[4:5], raw[5:]
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("snapshot is zstd-compressed but zstandard isn't installed")
+        payload = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == CODEC_ZLIB:
+        payload = zlib.decompress(body)
+    else:
+        raise ValueError(f"unknown snapshot codec {codec!r}")
+    return decode_snapshot(payload)
+
+
+def columns_from_map(file_map: dict):
+    """Split a {path: {sha, size}} map into parallel columns, in snapshot order."""
+    paths = _sorted_paths(file_map)
+    sizes, shas = [], []
+    for p in paths:
+        v = file_map[p]
+        if isinstance(v, dict):
+            sizes.append(int(v.get("size") or 0))
+            shas.append(v.get("sha") or "")
+        else:  # very old snapshots stored the bare sha
+            sizes.append(0)
+            shas.append(v or "")
+    return paths, sizes, shas
+
+
+class SnapshotStore:
+    """Directory of content-addressed snapshot blobs.
+
+    The sync methods do file I/O and (de)compression; the cog calls the
+    `a*` wrappers, which run them in a worker thread.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / f"{digest}{SUFFIX}"
+
+    def has(self, digest: Optional[str]) -> bool:
+        return bool(digest) and self._path(digest).exists()
+
+    def put(self, paths, sizes, shas) -> str:
+        """Store a listing; returns its digest. Existing blobs aren't rewritten."""
+        return self.put_sorted(*sort_columns(paths, sizes, shas))
+
+    def put_sorted(self, paths, sizes, shas) -> str:
+        """put() for columns already in sort_columns order."""
+        payload = encode_snapshot(paths, sizes, shas)
+        digest = hashlib.sha256(payload).hexdigest()
+        target = self._path(digest)
+        if target.exists():
+            # Refresh the mtime so a concurrent prune treats it as new.
+            os.utime(target)
+            return digest
+        # Unique temp name: two writers may store the same listing at once.
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pack_payload(payload))
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return digest
+
+    def put_map(self, file_map: dict) -> str:
+        return self.put_sorted(*columns_from_map(file_map))
+
+    def get(self, digest: Optional[str]):
+        """Return sorted (paths, sizes, shas) for a digest, or None if missing."""
+        if not digest:
+            return None
+        try:
+            raw = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            return None
+        return unpack_columns(raw)
+
+    def get_map(self, digest: Optional[str]) -> Optional[dict]:
+        """Return the {path: {sha, size}} map for a digest, or None if missing."""
+        cols = self.get(digest)
+        if cols is None:
+            return None
+        paths, sizes, shas = cols
+        return {p: {"sha": h, "size": s} for p, s, h in zip(paths, sizes, shas)}
+
+    def prune(self, keep: Iterable[str], min_age: float = 600) -> int:
+        """Delete blobs whose digest isn't in `keep`. Returns how many.
+
+        Blobs written in the last `min_age` seconds are spared: a writer may
+        have stored one but not yet recorded its digest in the index.
+        """
+        keep = set(keep)
+        cutoff = time.time() - min_age
+        removed = 0
+        for f in self.root.glob(f"*{SUFFIX}"):
+            if f.stem not in keep and f.stat().st_mtime < cutoff:
+                f.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def usage(self):
+        """(blob_count, total_bytes) currently on disk."""
+        count = total = 0
+        for f in self.root.glob(f"*{SUFFIX}"):
+            count += 1
+            total += f.stat().st_size
+        return count, total
+
+    # ── async wrappers ──
+
+    async def aput(self, paths, sizes, shas) -> str:
+        return await asyncio.to_thread(self.put, paths, sizes, shas)
+
+    async def aput_map(self, file_map: dict) -> str:
+        return await asyncio.to_thread(self.put_map, file_map)
+
+    async def aput_sorted(self, paths, sizes, shas) -> str:
+        return await asyncio.to_thread(self.put_sorted, paths, sizes, shas)
+
+    async def aget(self, digest: Optional[str]):
+        return await asyncio.to_thread(self.get, digest)
+
+    async def aprune(self, keep: Iterable[str], min_age: float = 600) -> int:
+        return await asyncio.to_thread(self.prune, list(keep), min_age)
+
+    async def ausage(self):
+        return await asyncio.to_thread(self.usage)
@@ -1,21 +1,34 @@
 import asyncio
+import bisect
+import codecs
+import random
 import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
 
 import io
 import discord
-import requests
 import json
 import aiohttp
+import yarl
 from bs4 import BeautifulSoup
 from dateutil import parser as date_parser
 from discord.ext import tasks
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
+
+from .store import GameStore
 
 # ─── Static config ─────────────────────────────────────────────────────────
-MAX_GAMES = 100
+MAX_GAMES = 2000
+
+# Superseded builds kept per game for `ddepots` and `dtrend`.
+HISTORY_KEEP = 500
+# Builds drawn in the `dtrend` size sparkline.
+TREND_POINTS = 40
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -52,6 +65,230 @@ SUBDLC_APPIDS = {
 
 OSLIST_FILTER = ["windows"]
 
+# Connection pool shared by every Steam / steamcmd request.
+HTTP_POOL_LIMIT = 32
+HTTP_PER_HOST_LIMIT = 8
+HTTP_DNS_TTL = 300
+HTTP_KEEPALIVE = 60
+HTTP_TIMEOUT = 10
+
+# Per-host request budgets: name -> (requests per second, burst).
+HOST_BUDGETS = {
+    "store_api": (1.0, 10),   # store.steampowered.com/api/*
+    "store_html": (1.0, 5),   # store.steampowered.com/app/* pages
+    "steamcmd": (5.0, 10),    # api.steamcmd.net
+}
+HTTP_MAX_RETRIES = 3
+HTTP_MAX_BACKOFF = 30.0
+
+# Default number of games snapshotted at once during a scan.
+SCAN_CONCURRENCY = 8
+
+# Store-page Denuvo scrapes: a game whose result is younger than the TTL and
+# hasn't flipped within DENUVO_RECENT_CHANGE is served from the cache.
+DENUVO_TTL_HOURS = 8
+DENUVO_RECENT_CHANGE = 3 * 86400
+# DLC depot sizes for ad-hoc `dcheck` totals: cached per DLC AppID, fetched
+# at most DLC_FANOUT at a time per game.
+DLC_TTL_HOURS = 12
+DLC_FANOUT = 8
+
+STORE_COOKIES = {"birthtime": "0", "mature_content": "1"}
+_DENUVO_RE = re.compile(rb"denuvo", re.IGNORECASE)
+
+# Tiered scanning: seconds between scans per tier. The loop ticks every
+# SCAN_TICK_MINUTES and only picks up games whose slot has come round.
+SCAN_TICK_MINUTES = 1
+SCAN_TIERS = {
+    "hot": 5 * 60,     # coming soon, or a build pushed in the last 3 days
+    "warm": 15 * 60,   # build in the last 30 days, or a regular patcher
+    "cold": 60 * 60,   # everything else
+}
+HOT_BUILD_AGE = 3 * 86400
+WARM_BUILD_AGE = 30 * 86400
+# Two or more builds inside this window marks a game as a regular patcher.
+PATCHER_WINDOW = 90 * 86400
+
+# Discord caps a message at 10 embeds and 6000 embed characters in total.
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARS_PER_MESSAGE = 6000
+
+# dimport: download chunk size, games snapshotted and committed per batch,
+# and minimum seconds between progress-message edits.
+IMPORT_CHUNK = 64 * 1024
+IMPORT_BATCH = 25
+IMPORT_PROGRESS_EVERY = 2.0
+
+# Change-feed mode: with a feed URL configured, each tick asks the feed which
+# apps changed since the last PICS change number and snapshots only those.
+# Warm and cold games the feed never mentions still get a full snapshot every
+# CHANGE_FEED_SWEEP seconds, since Denuvo/release changes are store-side; hot
+# games keep their normal tier interval so those alerts aren't delayed.
+CHANGE_FEED_SWEEP = 6 * 3600
+
+
+# ─── HTTP client ───────────────────────────────────────────────────────────
+class TokenBucket:
+    """Async token bucket that slows itself down when the host pushes back.
+
+    `throttle()` halves the refill rate (down to 1/8 of the configured rate)
+    after a 429/5xx; each success then creeps it back up towards the base.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self):
+        self.rate = max(self.base_rate / 8, self.rate / 2)
+        self.tokens = 0.0
+
+    def relax(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate * 1.1)
+
+
+@dataclass
+class ScanStats:
+    """Request counters for one check cycle."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    errors: int = 0
+    games: int = 0
+    duration: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[datetime] = None
+
+    def finish(self, games: int):
+        self.games = games
+        self.duration = time.monotonic() - self.started_at
+        self.finished_at = datetime.now(timezone.utc)
+
+    def summary(self) -> str:
+        return (
+            f"{self.games} games in {self.duration:.1f}s • {self.requests} requests, "
+            f"{self.retries} retries, {self.throttled} throttled, {self.errors} server errors"
+        )
+
+
+def _retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if value and value.isdigit():
+        return min(float(value), HTTP_MAX_BACKOFF)
+    return None
+
+
+class SteamClient:
+    """One pooled aiohttp session for all Steam and steamcmd I/O.
+
+    Keeps connections alive between requests, caps concurrent connections per
+    host and caches DNS, so a full watchlist scan reuses a handful of sockets
+    instead of opening a fresh TCP+TLS connection (and a worker thread) per call.
+
+    Every request draws from the token bucket of its `budget` (see
+    HOST_BUDGETS); 429s, 5xx and dropped connections are retried with
+    exponential backoff and counted in `stats`.
+
+    `base_url` (e.g. "http://127.0.0.1:8765") sends every request to that
+    host instead, keeping path and query; replay.py uses it to run scans
+    against recorded responses.
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = yarl.URL(base_url) if base_url else None
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_PER_HOST_LIMIT,
+            ttl_dns_cache=HTTP_DNS_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in HOST_BUDGETS.items()}
+        self.stats = ScanStats()
+
+    def set_budget(self, name: str, rate: float, burst: int):
+        self.buckets[name] = TokenBucket(rate, burst)
+
+    def begin_cycle(self) -> ScanStats:
+        """Start a fresh set of counters for a check cycle."""
+        self.stats = ScanStats()
+        return self.stats
+
+    async def fetch(self, url: str, budget: Optional[str] = None, **kwargs) -> tuple:
+        """GET `url` under a host budget. Returns (status, headers, body).
+
+        Raises aiohttp.ClientResponseError once retries on 429/5xx run out, and
+        on any other 4xx straight away.
+        """
+        bucket = self.buckets.get(budget)
+        if self.base_url is not None:
+            url = yarl.URL(url).with_scheme(self.base_url.scheme).with_host(
+                self.base_url.host
+            ).with_port(self.base_url.port)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                await bucket.acquire()
+            self.stats.requests += 1
+            try:
+                async with self.session.get(url, **kwargs) as r:
+                    if r.status == 429 or r.status >= 500:
+                        if r.status == 429:
+                            self.stats.throttled += 1
+                        else:
+                            self.stats.errors += 1
+                        if bucket is not None:
+                            bucket.throttle()
+                        if attempt >= HTTP_MAX_RETRIES:
+                            r.raise_for_status()
+                        delay = _retry_after(r.headers)
+                    else:
+                        r.raise_for_status()
+                        if bucket is not None:
+                            bucket.relax()
+                        return r.status, r.headers, await r.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= HTTP_MAX_RETRIES:
+                    raise
+                delay = None
+            attempt += 1
+            self.stats.retries += 1
+            if delay is None:
+                delay = min(HTTP_MAX_BACKOFF, 2 ** attempt + random.random())
+            await asyncio.sleep(delay)
+
+    async def get_json(self, url: str, budget: Optional[str] = None, **kwargs):
+        _, _, body = await self.fetch(url, budget, **kwargs)
+        return json.loads(body)
+
+    async def get_text(self, url: str, budget: Optional[str] = None, **kwargs) -> str:
+        _, _, body = await self.fetch(url, budget, **kwargs)
+        return body.decode("utf-8", "replace")
+
+    async def close(self):
+        await self.session.close()
+
 
 # ─── Steam helpers ─────────────────────────────────────────────────────────
 def format_size(size_bytes: int) -> str:
@@ -65,6 +302,54 @@ def format_size(size_bytes: int) -> str:
         return f"{size_bytes} B"
 
 
+def format_duration(seconds: float) -> str:
+    days = seconds / 86400
+    if days >= 1:
+        return f"{days:.1f}d"
+    return f"{seconds / 3600:.1f}h"
+
+
+_SPARK = "▁▂▃▄▅▆▇█"
+
+
+def summarize_build_series(series: list) -> dict:
+    """Size growth and patch cadence from a game's builds, oldest first.
+
+    Each item needs "build_id", "total_size" and "build_time" (falling back to
+    "recorded_at" for builds imported without a push time).
+    """
+    times = [b.get("build_time") or b.get("recorded_at") or 0 for b in series]
+    gaps = sorted(b - a for a, b in zip(times, times[1:]) if a and b and b > a)
+    now = time.time()
+    sizes = [b.get("total_size") or 0 for b in series]
+
+    largest = None
+    for prev, cur in zip(series, series[1:]):
+        if prev.get("total_size") and cur.get("total_size"):
+            jump = cur["total_size"] - prev["total_size"]
+            if largest is None or abs(jump) > abs(largest[1]):
+                largest = (cur["build_id"], jump)
+
+    known = [s for s in sizes[-TREND_POINTS:] if s]
+    spark = ""
+    if len(known) >= 2:
+        lo, hi = min(known), max(known)
+        span = (hi - lo) or 1
+        spark = "".join(_SPARK[int((s - lo) / span * (len(_SPARK) - 1))] for s in known)
+
+    return {
+        "first_time": min((t for t in times if t), default=int(now)),
+        "last_30d": sum(1 for t in times if t and now - t <= 30 * 86400),
+        "last_90d": sum(1 for t in times if t and now - t <= 90 * 86400),
+        "median_gap": gaps[len(gaps) // 2] if gaps else None,
+        "min_gap": gaps[0] if gaps else None,
+        "first_size": next((s for s in sizes if s), 0),
+        "last_size": sizes[-1],
+        "largest_jump": largest,
+        "sparkline": spark,
+    }
+
+
 def parse_release_date(date_str: str):
     """Best-effort parse of Steam's free-text release date. None if unparseable."""
     if not date_str:
@@ -75,186 +360,410 @@ def parse_release_date(date_str: str):
         return None
 
 
-def fetch_app_details(appid: int) -> dict:
+_MONTHS = {
+    m: i + 1 for i, m in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+_RELEASE_DAY_RE = re.compile(r"^(\d{1,2})\s+([a-z]+)\.?,?\s+(\d{4})$|^([a-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})$")
+_RELEASE_MONTH_RE = re.compile(r"^([a-z]+)\.?,?\s+(\d{4})$")
+_RELEASE_QUARTER_RE = re.compile(r"^q([1-4])\s+(\d{4})$")
+_RELEASE_YEAR_RE = re.compile(r"^(\d{4})$")
+_RELEASE_PRECISION_RANK = {"day": 0, "month": 1, "quarter": 2, "year": 3}
+
+
+def _month_number(word: str) -> Optional[int]:
+    return _MONTHS.get(word[:3])
+
+
+def normalize_release_date(date_str: Optional[str]) -> tuple:
+    """Turn Steam's free-text release date into (sort_key, precision).
+
+    Precision is "day", "month", "quarter", "year" or "tba". The key is
+    YYYYMMDD of the latest day the window could mean, times ten plus a
+    precision rank, so "Q3 2026" sorts after every dated day in September 2026
+    and exact dates win ties. Unparseable or TBA dates give (None, "tba").
+    Steam's usual formats are matched directly; dateutil is the fallback.
+    """
+    text = (date_str or "").strip().lower()
+    if not text:
+        return None, "tba"
+
+    def key(year: int, month: int, day: int, precision: str) -> tuple:
+        return (year * 10000 + month * 100 + day) * 10 + _RELEASE_PRECISION_RANK[precision], precision
+
+    m = _RELEASE_DAY_RE.match(text)
+    if m:
+        day, word, year = (m.group(1), m.group(2), m.group(3)) if m.group(1) else (m.group(5), m.group(4), m.group(6))
+        month = _month_number(word)
+        if month and 1 <= int(day) <= 31:
+            return key(int(year), month, int(day), "day")
+    m = _RELEASE_MONTH_RE.match(text)
+    if m and _month_number(m.group(1)):
+        return key(int(m.group(2)), _month_number(m.group(1)), 31, "month")
+    m = _RELEASE_QUARTER_RE.match(text)
+    if m:
+        return key(int(m.group(2)), int(m.group(1)) * 3, 31, "quarter")
+    m = _RELEASE_YEAR_RE.match(text)
+    if m:
+        return key(int(m.group(1)), 12, 31, "year")
+
+    parsed = parse_release_date(date_str)
+    if parsed is None or parsed.year == 1900:
+        return None, "tba"
+    return key(parsed.year, parsed.month, parsed.day, "day")
+
+
+def with_release_key(entry: dict) -> dict:
+    """Set (or drop) an entry's release_key/release_precision from its release_date."""
+    if entry.get("coming_soon") and entry.get("release_date"):
+        entry["release_key"], entry["release_precision"] = normalize_release_date(entry["release_date"])
+    else:
+        entry.pop("release_key", None)
+        entry.pop("release_precision", None)
+    return entry
+
+
+async def fetch_app_details(client: SteamClient, appid: int) -> dict:
     try:
-        r = requests.get(
+        payload = await client.get_json(
             "https://store.steampowered.com/api/appdetails",
+            "store_api",
             params={"appids": appid, "cc": "us", "l": "en"},
-            headers=HEADERS, timeout=10
         )
-        r.raise_for_status()
-        result = r.json().get(str(appid), {})
+        result = payload.get(str(appid), {})
         return result.get("data", {}) if result.get("success") else {}
     except Exception:
         return {}
 
 
-def fetch_build_id_only(appid: int) -> tuple:
-    """Fetch only build ID and timestamp for regular check cycles."""
+async def fetch_steamcmd_info(client: SteamClient, appid: int) -> dict:
+    """Fetch the raw steamcmd.net info block for an app. {} on failure.
+
+    One request carries the build ID, timestamp, depot manifests/sizes and the
+    DLC list, so callers parse everything they need from this single payload.
+    """
     try:
-        r = requests.get(
-            f"https://api.steamcmd.net/v1/info/{appid}",
-            headers=HEADERS, timeout=10
-        )
-        data = r.json()
-        public_branch = (
-            data.get("data", {})
-                .get(str(appid), {})
-                .get("depots", {})
-                .get("branches", {})
-                .get("public", {})
-        )
-        build_id = public_branch.get("buildid")
-        timeupdated = public_branch.get("timeupdated")
-        return str(build_id) if build_id else None, int(timeupdated) if timeupdated else None
+        data = await client.get_json(f"https://api.steamcmd.net/v1/info/{appid}", "steamcmd")
+        return data.get("data", {}).get(str(appid), {}) or {}
     except Exception:
-        return None, None
+        return {}
+
+
+def _public_manifest(depot_info: dict) -> tuple:
+    """(manifest_id, size) of a depot's public manifest."""
+    manifest = depot_info.get("manifests", {}).get("public")
+    if isinstance(manifest, dict):
+        return manifest.get("gid"), int(manifest.get("size", 0))
+    return manifest, 0
 
 
-def fetch_build_id(appid: int) -> tuple:
+def parse_build_info(appid: int, app_data: dict) -> tuple:
+    """Parse (build_id, timeupdated, manifests, depot_sizes) from a steamcmd info block."""
     try:
-        r = requests.get(
-            f"https://api.steamcmd.net/v1/info/{appid}",
-            headers=HEADERS, timeout=10
-        )
-        data = r.json()
-        depots = (
-            data.get("data", {})
-                .get(str(appid), {})
-                .get("depots", {})
-        )
-        public_branch = depots.get("branches", {}).get("public", {})
-        build_id = public_branch.get("buildid")
-        timeupdated = public_branch.get("timeupdated")
-
-        allowlist = DEPOT_ALLOWLIST.get(str(appid))
-        blacklist = DEPOT_BLACKLIST.get(str(appid), [])
-        manifests = {}
-        depot_sizes = {}
-
-        has_english_depot = any(
-            d.get("config", {}).get("language") == "english"
-            for did, d in depots.items()
-            if did.isdigit()
-        )
+        return _parse_build_info(appid, app_data)
+    except Exception:
+        return None, None, {}, {}
 
-        for depot_id, depot_info in depots.items():
-            if not depot_id.isdigit():
-                continue
-            if allowlist and depot_id not in allowlist:
-                continue
-            if not allowlist and depot_id in blacklist:
-                continue
 
-            depot_language = depot_info.get("config", {}).get("language")
-            if not allowlist and depot_language:
-                if not (has_english_depot and depot_language == "english"):
-                    continue
+def _parse_build_info(appid: int, app_data: dict) -> tuple:
+    depots = app_data.get("depots", {})
+    public_branch = depots.get("branches", {}).get("public", {})
+    build_id = public_branch.get("buildid")
+    timeupdated = public_branch.get("timeupdated")
 
-            depot_oslist = depot_info.get("config", {}).get("oslist")
-            if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
+    allowlist = DEPOT_ALLOWLIST.get(str(appid))
+    blacklist = DEPOT_BLACKLIST.get(str(appid), [])
+    manifests = {}
+    depot_sizes = {}
+
+    has_english_depot = any(
+        d.get("config", {}).get("language") == "english"
+        for did, d in depots.items()
+        if did.isdigit()
+    )
+
+    for depot_id, depot_info in depots.items():
+        if not depot_id.isdigit():
+            continue
+        if allowlist and depot_id not in allowlist:
+            continue
+        if not allowlist and depot_id in blacklist:
+            continue
+
+        depot_language = depot_info.get("config", {}).get("language")
+        if not allowlist and depot_language:
+            if not (has_english_depot and depot_language == "english"):
                 continue
 
-            manifest = depot_info.get("manifests", {}).get("public")
-            if isinstance(manifest, dict):
-                manifest_id = manifest.get("gid")
-                size = int(manifest.get("size", 0))
-            else:
-                manifest_id = manifest
-                size = 0
+        depot_oslist = depot_info.get("config", {}).get("oslist")
+        if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
+            continue
+
+        manifest_id, size = _public_manifest(depot_info)
+        if manifest_id:
+            manifests[depot_id] = str(manifest_id)
+        if size > 0:
+            depot_sizes[depot_id] = size
+
+    return (
+        str(build_id) if build_id else None,
+        int(timeupdated) if timeupdated else None,
+        manifests,
+        depot_sizes,
+    )
 
-            if manifest_id:
-                manifests[depot_id] = str(manifest_id)
-            if size > 0:
-                depot_sizes[depot_id] = size
 
-        # Fetch and merge sub-DLC depots
-        for dlc_appid in SUBDLC_APPIDS.get(str(appid), []):
-            try:
-                r2 = requests.get(
-                    f"https://api.steamcmd.net/v1/info/{dlc_appid}",
-                    headers=HEADERS, timeout=10
-                )
-                dlc_data = r2.json()
-                dlc_depots = (
-                    dlc_data.get("data", {})
-                            .get(str(dlc_appid), {})
-                            .get("depots", {})
-                )
-                for depot_id, depot_info in dlc_depots.items():
-                    if not depot_id.isdigit():
-                        continue
-
-                    depot_oslist = depot_info.get("config", {}).get("oslist")
-                    if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
-                        continue
-
-                    manifest = depot_info.get("manifests", {}).get("public")
-                    if isinstance(manifest, dict):
-                        manifest_id = manifest.get("gid")
-                        size = int(manifest.get("size", 0))
-                    else:
-                        manifest_id = manifest
-                        size = 0
-
-                    if manifest_id:
-                        manifests[depot_id] = str(manifest_id)
-                    if size > 0:
-                        depot_sizes[depot_id] = size
-            except Exception:
-                pass
+def parse_dlc_appids(app_data: dict) -> list:
+    listofdlc = app_data.get("extended", {}).get("listofdlc", "")
+    if not listofdlc:
+        return []
+    return [int(x) for x in listofdlc.split(",") if x.strip().isdigit()]
 
-        return str(build_id) if build_id else None, int(timeupdated) if timeupdated else None, manifests, depot_sizes
-    except Exception:
-        return None, None, {}, {}
 
-def get_dlc_appids_from_steamcmd(appid: int) -> list:
-    try:
-        r = requests.get(
-            f"https://api.steamcmd.net/v1/info/{appid}",
-            headers=HEADERS, timeout=10
+async def with_subdlc_depots(client: SteamClient, appid: int, manifests: dict, depot_sizes: dict) -> tuple:
+    """Merge the depots of hardcoded sub-DLC apps into a base app's depot maps.
+
+    Only apps listed in SUBDLC_APPIDS cost extra requests; everything else is
+    returned unchanged.
+    """
+    manifests = dict(manifests)
+    depot_sizes = dict(depot_sizes)
+    for dlc_appid in SUBDLC_APPIDS.get(str(appid), []):
+        merge_subdlc_depots(await fetch_steamcmd_info(client, dlc_appid), manifests, depot_sizes)
+    return manifests, depot_sizes
+
+
+def merge_subdlc_depots(app_data: dict, manifests: dict, depot_sizes: dict):
+    """Merge one sub-DLC's steamcmd depots into `manifests`/`depot_sizes` in place."""
+    for depot_id, depot_info in app_data.get("depots", {}).items():
+        if not depot_id.isdigit() or not isinstance(depot_info, dict):
+            continue
+
+        depot_oslist = depot_info.get("config", {}).get("oslist")
+        if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
+            continue
+
+        try:
+            manifest_id, size = _public_manifest(depot_info)
+        except (ValueError, TypeError):
+            continue
+        if manifest_id:
+            manifests[depot_id] = str(manifest_id)
+        if size > 0:
+            depot_sizes[depot_id] = size
+
+
+def dlc_depot_sizes(app_data: dict) -> dict[str, int]:
+    """{depot_id: bytes} for a DLC's steamcmd block; {} for non-DLC apps."""
+    depot_sizes = {}
+    app_type = app_data.get("common", {}).get("type", "").lower()
+    if app_type != "dlc":
+        return depot_sizes  # skip demos, base-game cross-refs, tools, etc.
+
+    for depot_id, depot_info in app_data.get("depots", {}).items():
+        if not depot_id.isdigit() or not isinstance(depot_info, dict):
+            continue
+
+        depot_oslist = depot_info.get("config", {}).get("oslist")
+        if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
+            continue
+
+        manifest = depot_info.get("manifests", {}).get("public")
+        size = 0
+        try:
+            if isinstance(manifest, dict):
+                size = int(manifest.get("size", 0))
+            elif "maxsize" in depot_info:
+                size = int(depot_info.get("maxsize", 0))
+        except (ValueError, TypeError):
+            pass
+
+        if size > 0:
+            depot_sizes[depot_id] = size
+    return depot_sizes
+
+
+class DlcSizeCache:
+    """TTL memo of DLC depot sizes, shared by every ad-hoc size lookup.
+
+    Per-DLC results are keyed by DLC AppID so games sharing DLC reuse them;
+    per-game totals are keyed by AppID and build ID so a repeat `dcheck` on
+    an unchanged build needs no requests at all. Concurrent lookups for the
+    same game share one in-flight task, and DLC fetches for a game are
+    capped at DLC_FANOUT at a time. A total is only memoised when every
+    fetch behind it succeeded; a partial one is returned uncached.
+    """
+
+    def __init__(self, ttl: float = DLC_TTL_HOURS * 3600):
+        self.ttl = ttl
+        self.dlcs: dict[int, tuple] = {}    # dlc appid -> (fetched_at, sizes)
+        self.totals: dict[int, tuple] = {}  # appid -> (fetched_at, build_id, sizes)
+        self._inflight: dict[int, asyncio.Task] = {}
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    async def _dlc(self, client: SteamClient, dlc_appid: int, sem: asyncio.Semaphore) -> Optional[dict]:
+        """A DLC's depot sizes, or None if the fetch failed."""
+        hit = self.dlcs.get(dlc_appid)
+        if hit is not None and self._fresh(hit[0]):
+            return hit[1]
+        async with sem:
+            app_data = await fetch_steamcmd_info(client, dlc_appid)
+        if not app_data:  # {} means the fetch failed; try again next time
+            return None
+        sizes = dlc_depot_sizes(app_data)
+        self.dlcs[dlc_appid] = (time.time(), sizes)
+        return sizes
+
+    async def _resolve(self, client: SteamClient, appid: int, snapshot: dict) -> dict:
+        # Base game depots (plus SUBDLC_APPIDS)
+        manifests = dict(snapshot["manifests"])
+        depot_sizes = dict(snapshot["depot_sizes"])
+        complete = True
+        for dlc_appid in SUBDLC_APPIDS.get(str(appid), []):
+            app_data = await fetch_steamcmd_info(client, dlc_appid)
+            complete = complete and bool(app_data)
+            merge_subdlc_depots(app_data, manifests, depot_sizes)
+        # All DLC AppIDs (store + steamcmd) came with the snapshot
+        sem = asyncio.Semaphore(DLC_FANOUT)
+        results = await asyncio.gather(
+            *(self._dlc(client, d, sem) for d in set(snapshot.get("dlc_appids", []))),
+            return_exceptions=True,
         )
-        data = r.json()
-        app_data = data.get("data", {}).get(str(appid), {})
-        extended = app_data.get("extended", {})
-        listofdlc = extended.get("listofdlc", "")
-        if not listofdlc:
-            return []
-        return [int(x) for x in listofdlc.split(",") if x.strip().isdigit()]
-    except Exception:
-        return []
+        for dlc_sizes in results:
+            if isinstance(dlc_sizes, dict):
+                depot_sizes.update(dlc_sizes)
+            else:
+                complete = False
+        if complete:
+            self.totals[appid] = (time.time(), snapshot.get("build_id"), depot_sizes)
+        return depot_sizes
+
+    async def sizes(self, client: SteamClient, appid: int, snapshot: dict) -> dict:
+        hit = self.totals.get(appid)
+        if hit is not None and self._fresh(hit[0]) and hit[1] == snapshot.get("build_id"):
+            return hit[2]
+        task = self._inflight.get(appid)
+        if task is None:
+            task = asyncio.create_task(self._resolve(client, appid, snapshot))
+            self._inflight[appid] = task
+            task.add_done_callback(lambda _: self._inflight.pop(appid, None))
+        return await asyncio.shield(task)
 
 
 def check_denuvo_api(data: dict) -> bool:
     return "denuvo" in data.get("drm_notice", "").lower()
 
 
-def check_denuvo_scrape(appid: int) -> bool:
+async def check_denuvo_scrape(client: SteamClient, appid: int) -> bool:
     try:
-        r = requests.get(
+        _, _, body = await client.fetch(
             f"https://store.steampowered.com/app/{appid}/",
-            headers=HEADERS,
-            cookies={"birthtime": "0", "mature_content": "1"},
-            timeout=10
+            "store_html",
+            cookies=STORE_COOKIES,
         )
-        soup = BeautifulSoup(r.text, "html.parser")
-        return "denuvo" in soup.get_text().lower()
+        return _DENUVO_RE.search(body) is not None
     except Exception:
         return False
 
 
-def has_denuvo(appid: int, data: dict) -> bool:
-    return check_denuvo_api(data) or check_denuvo_scrape(appid)
+class DenuvoCache:
+    """Per-AppID memo of store-page Denuvo scrapes.
+
+    Entries hold the last result plus the page's ETag/Last-Modified, so a
+    re-scrape is a conditional request that usually ends in a bodiless 304.
+    Games whose status has been stable for DENUVO_RECENT_CHANGE are only
+    re-scraped once their result is older than `ttl` seconds. An appdetails
+    DRM notice naming Denuvo doesn't refresh that TTL: once the notice stops
+    naming it, the page is re-checked straight away. Kept in memory; a reload
+    costs one fresh scrape per game.
+    """
+
+    def __init__(self, ttl: float = DENUVO_TTL_HOURS * 3600):
+        self.ttl = ttl
+        self.entries: dict[int, dict] = {}
+        # AppIDs whose last answer came from the DRM notice, not a scrape.
+        self.api_hits: set[int] = set()
+
+    def _record(self, appid: int, denuvo: bool, etag=None, last_modified=None):
+        now = time.time()
+        entry = self.entries.get(appid)
+        if entry is None:
+            # First sighting: nothing says it changed recently.
+            entry = self.entries[appid] = {"denuvo": denuvo, "changed_at": 0.0}
+        elif entry["denuvo"] != denuvo:
+            entry["denuvo"] = denuvo
+            entry["changed_at"] = now
+        entry["checked_at"] = now
+        entry["etag"] = etag
+        entry["last_modified"] = last_modified
+
+    def forget(self, appid: int):
+        self.entries.pop(appid, None)
+        self.api_hits.discard(appid)
+
+    async def check(self, client: SteamClient, appid: int, data: dict) -> bool:
+        # The appdetails DRM notice is authoritative when it names Denuvo.
+        if check_denuvo_api(data):
+            self.api_hits.add(appid)
+            return True
+
+        entry = self.entries.get(appid)
+        now = time.time()
+        if (
+            entry is not None
+            and appid not in self.api_hits
+            and now - entry["checked_at"] < self.ttl
+            and now - entry["changed_at"] > DENUVO_RECENT_CHANGE
+        ):
+            return entry["denuvo"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            status, resp_headers, body = await client.fetch(
+                f"https://store.steampowered.com/app/{appid}/",
+                "store_html",
+                headers=headers,
+                cookies=STORE_COOKIES,
+            )
+        except Exception:
+            # Keep the last known answer rather than reporting a false removal.
+            if appid in self.api_hits:
+                return True
+            return entry["denuvo"] if entry is not None else False
 
+        self.api_hits.discard(appid)
+        if status == 304 and entry is not None:
+            entry["checked_at"] = now
+            return entry["denuvo"]
+        denuvo = _DENUVO_RE.search(body) is not None
+        self._record(appid, denuvo, resp_headers.get("ETag"), resp_headers.get("Last-Modified"))
+        return denuvo
 
-def search_steam(query: str) -> list:
+
+async def has_denuvo(
+    client: SteamClient, appid: int, data: dict, cache: Optional[DenuvoCache] = None
+) -> bool:
+    if cache is not None:
+        return await cache.check(client, appid, data)
+    return check_denuvo_api(data) or await check_denuvo_scrape(client, appid)
+
+
+async def search_steam(client: SteamClient, query: str) -> list:
     try:
-        r = requests.get(
+        payload = await client.get_json(
             "https://store.steampowered.com/api/storesearch/",
+            "store_api",
             params={"term": query, "cc": "us", "l": "en"},
-            headers=HEADERS, timeout=10
         )
-        items = r.json().get("items", [])
+        items = payload.get("items", [])
         return [{"appid": i["id"], "name": i["name"]} for i in items]
     except Exception:
         return []
@@ -288,24 +797,77 @@ def truncate_to_sentence(text: str, max_words: int = 300, overhead: int = 20) ->
     return truncated.rstrip() + "…"
 
 
-def get_game_snapshot(appid: int) -> Optional[dict]:
-    data = fetch_app_details(appid)
+async def get_game_snapshot(
+    client: SteamClient, appid: int, denuvo_cache: Optional[DenuvoCache] = None
+) -> Optional[dict]:
+    """Store + steamcmd state for one app, from a single request to each.
+
+    Carries the base-app depot manifests/sizes and DLC list too, so a check
+    cycle never has to go back to steamcmd for the same AppID.
+    """
+    data = await fetch_app_details(client, appid)
     if not data:
         return None
-    build_id, build_time = fetch_build_id_only(appid)
+    app_data = await fetch_steamcmd_info(client, appid)
+    build_id, build_time, manifests, depot_sizes = parse_build_info(appid, app_data)
     release = data.get("release_date", {})
     coming_soon = release.get("coming_soon", False)
     release_date_str = release.get("date", "").strip()
     return {
         "name": data.get("name", f"AppID {appid}"),
-        "denuvo": has_denuvo(appid, data),
+        "denuvo": await has_denuvo(client, appid, data, denuvo_cache),
         "header": data.get("header_image", ""),
         "build_id": build_id,
         "build_time": build_time,
         "coming_soon": bool(coming_soon) if isinstance(coming_soon, bool) else coming_soon == "true",
         "release_date": release_date_str if (coming_soon and release_date_str) else None,
+        "manifests": manifests,
+        "depot_sizes": depot_sizes,
+        "dlc_appids": sorted(set(data.get("dlc", [])) | set(parse_dlc_appids(app_data))),
+        "change_number": app_data.get("_change_number"),
     }
 
+async def fetch_changed_apps(client: SteamClient, url: str, since: int) -> Optional[tuple]:
+    """Ask a PICS change feed what changed after change number `since`.
+
+    The feed is queried as `GET <url>?since=<n>` and must answer with
+    `{"change_number": <current>, "apps": {"<appid>": <change number>, ...}}`.
+    Returns (current, {appid_str: change_number}), or None if the feed is
+    unreachable or the reply doesn't fit that shape.
+    """
+    try:
+        data = await client.get_json(url, "steamcmd", params={"since": since})
+        current = int(data["change_number"])
+        apps = {str(int(a)): int(n) for a, n in (data.get("apps") or {}).items()}
+    except Exception:
+        return None
+    return current, apps
+
+
+def scan_tier(info: dict, build_count: int, now: float) -> str:
+    """Pick a scan tier from how recently (build_time) and how often (history) a game patches.
+
+    `build_count` is the number of builds recorded within PATCHER_WINDOW.
+    """
+    if info.get("coming_soon"):
+        return "hot"
+    age = now - (info.get("build_time") or 0)
+    if age < HOT_BUILD_AGE:
+        return "hot"
+    if age < WARM_BUILD_AGE or build_count >= 2:
+        return "warm"
+    return "cold"
+
+
+def next_scan_time(appid: int, interval: int, now: float) -> float:
+    """Start of the game's next slot.
+
+    Each AppID gets a fixed phase within its interval, so a tier's games are
+    spread evenly across the interval instead of all coming due together.
+    """
+    offset = (appid * 2654435761) % interval
+    return ((now + offset) // interval + 1) * interval - offset
+
 _TRADEMARK_CHARS = "™®©"
 _PUNCT_RE = re.compile(r"[:\-–—_'’,.!?]")
 _WS_RE = re.compile(r"\s+")
@@ -319,16 +881,119 @@ def normalize_game_name(name: str) -> str:
     name = _WS_RE.sub(" ", name).strip().lower()
     return name
 
-async def resolve_best_game_match(query: str) -> Optional[int]:
+
+class GameNameIndex:
+    """Watchlist name search kept in memory and updated per add/remove.
+
+    Names are normalised with `normalize_game_name`. Prefix lookups bisect
+    sorted lists of full names and of individual words; substring lookups
+    intersect trigram posting sets and then confirm the hit, so a keystroke
+    never walks the whole watchlist.
+    """
+
+    def __init__(self):
+        self.names: dict[str, str] = {}          # appid_str -> display name
+        self._norm: dict[str, str] = {}          # appid_str -> normalised name
+        self._by_norm: dict[str, set] = {}       # normalised name -> appids
+        self._full: list[tuple] = []             # sorted (norm, appid_str)
+        self._words: list[tuple] = []            # sorted (word, appid_str)
+        self._trigrams: dict[str, set] = {}      # trigram -> appids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def _grams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _prefixed(keys: list, prefix: str):
+        i = bisect.bisect_left(keys, (prefix, ""))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            yield keys[i][1]
+            i += 1
+
+    def rebuild(self, games: dict):
+        self.__init__()
+        for appid_str, info in games.items():
+            self.add(appid_str, info.get("name", ""))
+
+    def add(self, appid_str: str, name: str):
+        if appid_str in self.names:
+            if self.names[appid_str] == name:
+                return
+            self.remove(appid_str)
+        norm = normalize_game_name(name)
+        self.names[appid_str] = name
+        self._norm[appid_str] = norm
+        self._by_norm.setdefault(norm, set()).add(appid_str)
+        bisect.insort(self._full, (norm, appid_str))
+        for word in set(norm.split()):
+            bisect.insort(self._words, (word, appid_str))
+        for gram in self._grams(norm):
+            self._trigrams.setdefault(gram, set()).add(appid_str)
+
+    def remove(self, appid_str: str):
+        if appid_str not in self.names:
+            return
+        del self.names[appid_str]
+        norm = self._norm.pop(appid_str)
+        self._by_norm[norm].discard(appid_str)
+        if not self._by_norm[norm]:
+            del self._by_norm[norm]
+        self._full.pop(bisect.bisect_left(self._full, (norm, appid_str)))
+        for word in set(norm.split()):
+            self._words.pop(bisect.bisect_left(self._words, (word, appid_str)))
+        for gram in self._grams(norm):
+            posting = self._trigrams[gram]
+            posting.discard(appid_str)
+            if not posting:
+                del self._trigrams[gram]
+
+    def search(self, query: str, limit: int = 25) -> list:
+        """Ranked appid_strs: exact, name prefix, word prefix, then substring."""
+        q = normalize_game_name(query)
+        if not q:
+            return sorted(self.names, key=lambda a: self._norm[a])[:limit]
+
+        ranked: dict[str, int] = {}
+        for appid_str in self._by_norm.get(q, ()):
+            ranked[appid_str] = 0
+        for appid_str in self._prefixed(self._full, q):
+            ranked.setdefault(appid_str, 1)
+        last_word = q.split()[-1]
+        for appid_str in self._prefixed(self._words, last_word):
+            if appid_str not in ranked and q in self._norm[appid_str]:
+                ranked[appid_str] = 2
+        if len(q) >= 3:
+            postings = sorted((self._trigrams.get(g, set()) for g in self._grams(q)), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            for appid_str in candidates:
+                if appid_str not in ranked and q in self._norm[appid_str]:
+                    ranked[appid_str] = 3
+
+        hits = sorted(ranked, key=lambda a: (ranked[a], len(self._norm[a]), self._norm[a]))
+        return hits[:limit]
+
+    def resolve(self, query: str) -> list:
+        """AppIDs a command argument refers to: an AppID, an exact name, or search hits."""
+        if query.isdigit() and query in self.names:
+            return [query]
+        exact = self._by_norm.get(normalize_game_name(query))
+        if exact:
+            return sorted(exact)
+        return self.search(query)
+
+async def resolve_best_game_match(client: SteamClient, query: str) -> Optional[int]:
     """Search Steam and return the AppID of the best-matching actual game (filters DLC/tools/editors)."""
-    raw_candidates = await asyncio.to_thread(search_steam, query)
+    raw_candidates = await search_steam(client, query)
     raw_candidates = raw_candidates[:10]
     if not raw_candidates:
         return None
 
     game_candidates = []
     for c in raw_candidates:
-        details = await asyncio.to_thread(fetch_app_details, c["appid"])
+        details = await fetch_app_details(client, c["appid"])
         if details.get("type") == "game":
             game_candidates.append(c)
         if len(game_candidates) >= 5:
@@ -361,6 +1026,124 @@ async def resolve_best_game_match(query: str) -> Optional[int]:
 
     return game_candidates[0]["appid"]
 
+# ─── Import ────────────────────────────────────────────────────────────────
+class ImportFormatError(ValueError):
+    pass
+
+
+class WatchlistStreamParser:
+    """Incremental parser for `dexport` files.
+
+    Feed it text chunks as they arrive; `feed` returns the (appid, entry)
+    pairs completed so far. Accepts `{"games": {...}}` (other top-level keys
+    are skipped) or a bare `{appid: {...}}` mapping. Only the entry being
+    parsed is buffered, never the whole file.
+    """
+
+    _WS = " \t\r\n"
+
+    def __init__(self):
+        self.buf = ""
+        self.state = "start"  # start, top, entries, done
+        self.seen_any = False
+        self._decoder = json.JSONDecoder()
+
+    def _skip(self, chars: str = _WS) -> bool:
+        i = 0
+        while i < len(self.buf) and self.buf[i] in chars:
+            i += 1
+        self.buf = self.buf[i:]
+        return bool(self.buf)
+
+    def _value(self, final: bool):
+        """Decode one JSON value off the buffer, or raise IndexError if incomplete."""
+        if not self._skip():
+            if final:
+                raise ImportFormatError("the file ended mid-entry")
+            raise IndexError
+        try:
+            value, end = self._decoder.raw_decode(self.buf)
+        except json.JSONDecodeError as e:
+            if final:
+                raise ImportFormatError(str(e)) from None
+            raise IndexError from None
+        if end == len(self.buf) and not final:
+            raise IndexError  # a number/literal might continue in the next chunk
+        self.buf = self.buf[end:]
+        return value
+
+    def _key(self, final: bool) -> str:
+        """Decode `"key":` off the buffer."""
+        saved = self.buf
+        key = self._value(final)
+        if not isinstance(key, str):
+            raise ImportFormatError("expected an object key")
+        if not self._skip() or self.buf[0] != ":":
+            if final:
+                raise ImportFormatError("expected ':' after key")
+            self.buf = saved
+            raise IndexError
+        self.buf = self.buf[1:]
+        return key
+
+    def feed(self, text: str, final: bool = False) -> list:
+        self.buf += text
+        out = []
+        try:
+            while self.state != "done":
+                if not self._skip(self._WS + ","):
+                    break
+                if self.state == "start":
+                    if self.buf[0] != "{":
+                        raise ImportFormatError("the file isn't a JSON object")
+                    self.buf = self.buf[1:]
+                    self.state = "top"
+                elif self.buf[0] == "}":
+                    self.buf = self.buf[1:]
+                    self.state = "top" if self.state == "entries" else "done"
+                else:
+                    saved = self.buf
+                    key = self._key(final)
+                    if self.state == "top" and key == "games":
+                        if not self._skip():
+                            self.buf = saved
+                            break
+                        if self.buf[0] == "{":
+                            self.buf = self.buf[1:]
+                            self.state = "entries"
+                            continue
+                    try:
+                        value = self._value(final)
+                    except IndexError:
+                        self.buf = saved
+                        raise
+                    if self.state == "entries" or key.isdigit():
+                        self.seen_any = True
+                        out.append((key, value))
+        except IndexError:
+            pass  # wait for the next chunk
+        if final and self.state != "done":
+            raise ImportFormatError("the file ended before the JSON object closed")
+        return out
+
+
+def entry_from_snapshot(snapshot: dict, manifests: dict, depot_sizes: dict) -> dict:
+    """Watchlist entry for a freshly snapshotted game."""
+    entry = {
+        "name": snapshot["name"],
+        "denuvo": snapshot["denuvo"],
+        "build_id": snapshot["build_id"],
+        "build_time": snapshot.get("build_time"),
+    }
+    if snapshot.get("coming_soon"):
+        entry["coming_soon"] = True
+        if snapshot.get("release_date"):
+            entry["release_date"] = snapshot["release_date"]
+    entry["manifests"] = manifests
+    entry["depot_sizes"] = depot_sizes
+    return with_release_key(entry)
+
+
 # ─── Embed builders ────────────────────────────────────────────────────────
 def build_denuvo_embed(appid: int, change_type: str, old: dict, new: dict) -> discord.Embed:
     name = new.get("name", old.get("name", f"AppID {appid}"))
@@ -418,6 +1201,31 @@ def build_depot_embed(appid: int, old_build: str, new_build: str, new: dict) ->
     return embed
 
 
+async def send_batched(channel, notices: list, mention: str, allowed: discord.AllowedMentions):
+    """Post (embed, ping) notices packed into as few messages as Discord allows.
+
+    Order is kept; a message carries the mention if any embed in it pings.
+    """
+    batch, size = [], 0
+    batches = []
+    for embed, ping in notices:
+        if batch and (len(batch) >= EMBEDS_PER_MESSAGE or size + len(embed) > EMBED_CHARS_PER_MESSAGE):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append((embed, ping))
+        size += len(embed)
+    if batch:
+        batches.append(batch)
+
+    for batch in batches:
+        ping = mention and any(p for _, p in batch)
+        await channel.send(
+            content=mention if ping else None,
+            embeds=[e for e, _ in batch],
+            allowed_mentions=allowed,
+        )
+
+
 def build_release_embed(appid: int, old: dict, new: dict) -> discord.Embed:
     name = new.get("name", old.get("name", f"AppID {appid}"))
     url = f"https://store.steampowered.com/app/{appid}/"
@@ -551,6 +1359,26 @@ class ListView(discord.ui.View):
                 pass
 
 
+class UpcomingView(ListView):
+    """Paginated `dupcoming` list; rows arrive already sorted by release key."""
+
+    def _build_embed(self, page: int) -> discord.Embed:
+        start = page * self.page_size
+        slice_ = self.games[start : start + self.page_size]
+
+        embed = discord.Embed(
+            title=f"🚀 Upcoming Games ({len(self.games)})",
+            color=self.embed_color,
+        )
+        lines = []
+        for appid_str, info in slice_:
+            date = info.get("release_date") or "Date TBA"
+            lines.append(f"**{info['name']}** `{appid_str}` — {date}")
+        embed.description = "\n".join(lines)
+        embed.set_footer(text=f"Page {page + 1}/{self.total_pages}")
+        return embed
+
+
 # ─── Cog ───────────────────────────────────────────────────────────────────
 class DenuvoWatch(commands.Cog):
     """Tracks Denuvo status, build updates, and release dates for a Steam watchlist."""
@@ -564,18 +1392,43 @@ class DenuvoWatch(commands.Cog):
             notify_role_id=None,
             games={},
             history={},
+            scan_concurrency=SCAN_CONCURRENCY,
+            host_budgets={},  # budget name -> [rate, burst] overrides of HOST_BUDGETS
+            denuvo_ttl_hours=DENUVO_TTL_HOURS,
+            change_feed_url=None,
+            storage_migrated=False,  # games/history above were copied into the SQLite store
         )
-        self.session = aiohttp.ClientSession() # Added session
+        # Pooled client for all Steam/steamcmd I/O; its session also serves
+        # one-off downloads such as dimport URLs.
+        self.http = SteamClient()
+        self.session = self.http.session
+        self.store = GameStore(cog_data_path(self) / "denuvowatch.db")
         self._startup_task: Optional[asyncio.Task] = None
-
-        # In-memory cache of game names for autocomplete, so it never has to
-        # await a Config read (and risk Discord's ~3s autocomplete timeout).
-        self._name_cache: list[str] = []
-        self._name_cache_ts: float = 0.0
-        self._name_cache_ttl: float = 30.0
+        self._last_scan_stats: Optional[ScanStats] = None
+        self._denuvo_cache = DenuvoCache()
+        self._dlc_cache = DlcSizeCache()
+        self._check_lock = asyncio.Lock()
+        # appid_str -> unix time the game is next due for a tiered scan.
+        self._next_scan: dict[str, float] = {}
+        # Change-feed cursor, and the PICS change number each game was last
+        # snapshotted at. None while the feed is off or unreachable.
+        self._change_number: Optional[int] = None
+        self._app_change: dict[str, int] = {}
+
+        # In-memory name search for autocomplete and name arguments, so a
+        # keystroke never has to await storage (Discord's ~3s autocomplete window).
+        self._name_index = GameNameIndex()
 
     # ── lifecycle ────────────────────────────────────────────────────────
     async def cog_load(self):
+        await self.store.open()
+        if not await self.config.storage_migrated():
+            # One-time move of the old Config blobs into SQLite. The Config
+            # copies are left untouched as a backup but never written again.
+            await self.store.import_legacy(await self.config.games(), await self.config.history())
+            await self.config.storage_migrated.set(True)
+        # After the migration, so freshly imported rows get their keys too.
+        await self.store.backfill_release_keys(normalize_release_date)
         self._startup_task = asyncio.create_task(self._startup_sequence())
 
     def cog_unload(self):
@@ -584,19 +1437,23 @@ class DenuvoWatch(commands.Cog):
         if self.check_games_loop.is_running():
             self.check_games_loop.cancel()
         # Cleanly close the web session
-        asyncio.create_task(self.session.close())
+        asyncio.create_task(self.http.close())
+        self.store.close()
 
     async def _startup_sequence(self):
         await self.bot.wait_until_red_ready()
-        games = await self.config.games()
-        self._refresh_name_cache_from(games)
-        if games:
+        for name, (rate, burst) in (await self.config.host_budgets()).items():
+            if name in HOST_BUDGETS:
+                self.http.set_budget(name, rate, burst)
+        self._denuvo_cache.ttl = await self.config.denuvo_ttl_hours() * 3600
+        self._name_index.rebuild(await self._load_games(depots=False))
+        if len(self._name_index):
             print("[DenuvoWatch] Running startup forcecheck…")
             await self.check_games_internal(full_refresh=True)
             print("[DenuvoWatch] Startup forcecheck complete.")
         if not self.check_games_loop.is_running():
             self.check_games_loop.start()
-            print("[DenuvoWatch] Background check started (every 10 mins)")
+            print(f"[DenuvoWatch] Background check started (tiered, ticking every {SCAN_TICK_MINUTES} min)")
 
     # ── owner-only check ──────────────────────────────────────────────────
     def owner_only():
@@ -605,27 +1462,20 @@ class DenuvoWatch(commands.Cog):
         return commands.check(predicate)
 
     # ── persistence helpers ───────────────────────────────────────────────
-    async def _load_games(self) -> dict:
-        return await self.config.games()
+    async def _load_games(self, depots: bool = True) -> dict:
+        return await self.store.load_games(depots=depots)
 
     async def _save_games(self, games: dict):
-        games = dict(sorted(games.items(), key=lambda x: x[1].get("name", "").lower()))
-        await self.config.games.set(games)
-        self._refresh_name_cache_from(games)
-
-    def _refresh_name_cache_from(self, games: dict):
-        self._name_cache = [info.get("name", "") for info in games.values()]
-        self._name_cache_ts = asyncio.get_event_loop().time()
-
-    async def _refresh_name_cache(self):
-        games = await self._load_games()
-        self._refresh_name_cache_from(games)
-
-    async def _load_history(self) -> dict:
-        return await self.config.history()
+        """Upsert just the given {appid_str: entry} rows."""
+        if not games:
+            return
+        await self.store.upsert_games(games)
+        for appid_str, info in games.items():
+            self._name_index.add(appid_str, info.get("name", ""))
 
-    async def _save_history(self, history: dict):
-        await self.config.history.set(history)
+    async def _delete_game(self, appid_str: str):
+        await self.store.delete_game(appid_str)
+        self._name_index.remove(appid_str)
 
     async def _get_notify_mention(self) -> str:
         role_id = await self.config.notify_role_id()
@@ -637,7 +1487,12 @@ class DenuvoWatch(commands.Cog):
         return ""
 
     # ── background check ─────────────────────────────────────────────────
-    async def check_games_internal(self, full_refresh: bool = False) -> bool:
+    async def check_games_internal(self, full_refresh: bool = False, due_only: bool = False) -> bool:
+        """Scan the watchlist (or, with due_only, just the games whose tier slot is due)."""
+        async with self._check_lock:
+            return await self._check_games(full_refresh, due_only)
+
+    async def _check_games(self, full_refresh: bool, due_only: bool) -> bool:
         changes = False
         try:
             channel_id = await self.config.notify_channel_id()
@@ -649,46 +1504,48 @@ class DenuvoWatch(commands.Cog):
                 print(f"[DenuvoWatch][WARN] Notify channel {channel_id} not found.")
                 return False
 
-            games = await self._load_games()
-            if not games:
+            watchlist = await self._load_games(depots=False)
+            if not watchlist:
                 return False
 
+            if due_only:
+                scan_ids = await self._select_due(watchlist)
+                if not scan_ids:
+                    return False
+            else:
+                scan_ids = list(watchlist)
+
+            # Full entries (with depot maps) only for the games being scanned.
+            games = await self.store.get_games(scan_ids)
+            originals = {a: dict(info) for a, info in games.items()}
+
             allowed = discord.AllowedMentions(users=True, roles=True)
 
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] Checking {len(games)} games…")
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Checking {len(scan_ids)}/{len(watchlist)} games…")
 
-            async def check_single(appid_str, old):
-                await asyncio.sleep(0.5)
-                appid = int(appid_str)
-                new = await asyncio.to_thread(get_game_snapshot, appid)
-                if new is None:
-                    return appid_str, None
-                return appid_str, new
-
-            results = await asyncio.gather(*[
-                check_single(appid_str, old)
-                for appid_str, old in games.items()
-            ])
+            stats = self.http.begin_cycle()
+            results = await self._scan_snapshots(scan_ids)
             changed_appids = set()
+            notices = []        # (embed, pings) in the order changes were seen
+            superseded = []     # history rows for builds replaced this cycle
 
             for appid_str, new in results:
-                if new is None:
+                if new is None or appid_str not in games:
                     continue
                 old = games[appid_str]
                 appid = int(appid_str)
+                if new.get("change_number") is not None:
+                    self._app_change[appid_str] = new["change_number"]
 
                 # Denuvo change
                 if old.get("denuvo") and not new["denuvo"]:
-                    await channel.send(embed=build_denuvo_embed(appid, "denuvo_removed", old, new))
-                    changes = True
+                    notices.append((build_denuvo_embed(appid, "denuvo_removed", old, new), False))
                 elif not old.get("denuvo") and new["denuvo"]:
-                    await channel.send(embed=build_denuvo_embed(appid, "denuvo_added", old, new))
-                    changes = True
+                    notices.append((build_denuvo_embed(appid, "denuvo_added", old, new), False))
 
                 # Release notification
                 if old.get("coming_soon") and not new.get("coming_soon"):
-                    await channel.send(embed=build_release_embed(appid, old, new))
-                    changes = True
+                    notices.append((build_release_embed(appid, old, new), False))
                     print(f"[INFO] {new['name']} has released!")
 
                 # Build ID change
@@ -697,7 +1554,9 @@ class DenuvoWatch(commands.Cog):
                 build_actually_changed = False 
                 if old_build and new_build and old_build != new_build:
                     changed_appids.add(appid_str)
-                    _, _, new_manifests, new_depot_sizes = await asyncio.to_thread(fetch_build_id, appid)
+                    new_manifests, new_depot_sizes = await with_subdlc_depots(
+                        self.http, appid, new["manifests"], new["depot_sizes"]
+                    )
                     old_manifests = old.get("manifests", {})
                     if new_manifests != old_manifests:
                         build_actually_changed = True
@@ -706,31 +1565,13 @@ class DenuvoWatch(commands.Cog):
                         new["old_build_size_bytes"] = old_total_bytes
                         new["new_build_size_bytes"] = new_total_bytes
 
-                        mention = await self._get_notify_mention()
-                        await channel.send(
-                            content=mention, 
-                            embed=build_depot_embed(appid, old_build, new_build, new),
-                            allowed_mentions=allowed
-                        )
-                        changes = True
+                        notices.append((build_depot_embed(appid, old_build, new_build, new), True))
 
-                        history = await self._load_history()
-                        game_history = history.setdefault(appid_str, {})
                         if old_build and old.get("manifests"):
-                            last_entry = next(iter(reversed(game_history.values())), None)
-                            old_manifests_changed = (
-                                last_entry is None or
-                                last_entry.get("manifests") != old["manifests"]
-                            )
-                            if old_manifests_changed:
-                                game_history[old_build] = {
-                                    "manifests": old["manifests"],
-                                    "depot_sizes": old.get("depot_sizes", {}),
-                                }
-                        if len(game_history) > 3:
-                            oldest = list(game_history.keys())[0]
-                            del game_history[oldest]
-                        await self._save_history(history)
+                            superseded.append((
+                                appid_str, old_build, old.get("build_time"),
+                                old["manifests"], old.get("depot_sizes", {}),
+                            ))
                         games[appid_str]["manifests"] = new_manifests
                         games[appid_str]["depot_sizes"] = new_depot_sizes
                     else:
@@ -747,26 +1588,33 @@ class DenuvoWatch(commands.Cog):
 
                 if new.get("coming_soon"):
                     games[appid_str]["coming_soon"] = True
-                    if new.get("release_date"):
+                    if new.get("release_date") and new["release_date"] != old.get("release_date"):
+                        # Normalised only when the text changes; dupcoming sorts on the key.
                         games[appid_str]["release_date"] = new["release_date"]
+                        with_release_key(games[appid_str])
                 else:
                     dropped = False
-                    for key in ("coming_soon", "release_date"):
+                    for key in ("coming_soon", "release_date", "release_key", "release_precision"):
                         if key in games[appid_str]:
                             games[appid_str].pop(key)
                             dropped = True
                     if dropped:
                         print(f"[INFO] {new['name']} has released, cleared coming_soon + release_date.")
 
-            # Full refresh for unchanged games
+            # Full refresh for unchanged games, reusing this cycle's snapshots
             if full_refresh:
-                refresh_targets = [a for a in games if a not in changed_appids]
-
-                async def refresh_single(appid_str):
-                    _, _, manifests, depot_sizes = await asyncio.to_thread(fetch_build_id, int(appid_str))
+                refresh_targets = [
+                    (appid_str, new) for appid_str, new in results
+                    if new is not None and appid_str in games and appid_str not in changed_appids
+                ]
+
+                async def refresh_single(appid_str, new):
+                    manifests, depot_sizes = await with_subdlc_depots(
+                        self.http, int(appid_str), new["manifests"], new["depot_sizes"]
+                    )
                     return appid_str, manifests, depot_sizes
 
-                refresh_results = await asyncio.gather(*[refresh_single(a) for a in refresh_targets])
+                refresh_results = await asyncio.gather(*[refresh_single(a, n) for a, n in refresh_targets])
 
                 for appid_str, manifests, depot_sizes in refresh_results:
                     if manifests:
@@ -774,8 +1622,23 @@ class DenuvoWatch(commands.Cog):
                     if depot_sizes:
                         games[appid_str]["depot_sizes"] = depot_sizes
 
-            await self._save_games(games)
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] Check complete.")
+            # Notify before persisting, so a failed send is retried next cycle.
+            if notices:
+                changes = True
+                mention = await self._get_notify_mention() if any(p for _, p in notices) else ""
+                await send_batched(channel, notices, mention, allowed)
+
+            await self.store.add_history(superseded, keep=HISTORY_KEEP)
+            await self._save_games({
+                appid_str: info for appid_str, info in games.items()
+                if info != originals[appid_str]
+            })
+            self._schedule_next_scans(
+                games, await self.store.history_counts(since=time.time() - PATCHER_WINDOW)
+            )
+            stats.finish(len(results))
+            self._last_scan_stats = stats
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] Check complete: {stats.summary()}")
 
         except Exception as e:
             print(f"[DenuvoWatch][ERROR] check_games crashed: {e}")
@@ -784,9 +1647,72 @@ class DenuvoWatch(commands.Cog):
 
         return changes
 
-    @tasks.loop(minutes=10)
+    async def _scan_snapshots(self, appids: list) -> list:
+        """Snapshot `appids` with at most `scan_concurrency` games in flight.
+
+        Host pacing is left to the client's token buckets; this only bounds
+        how many games are being worked on at once. Returns (appid_str,
+        snapshot_or_None) pairs in input order.
+        """
+        sem = asyncio.Semaphore(max(1, await self.config.scan_concurrency()))
+
+        async def check_single(appid_str):
+            async with sem:
+                return appid_str, await get_game_snapshot(
+                    self.http, int(appid_str), self._denuvo_cache
+                )
+
+        return await asyncio.gather(*[check_single(a) for a in appids])
+
+    async def _select_due(self, games: dict) -> list:
+        """Games to scan this tick: change-feed hits plus sweep/tier slots that are due."""
+        url = await self.config.change_feed_url()
+        if not url:
+            self._change_number = None
+            return self._due_appids(games)
+
+        polled = await fetch_changed_apps(self.http, url, self._change_number or 0)
+        if polled is None:
+            if self._change_number is not None:
+                print("[DenuvoWatch][WARN] Change feed unreachable, falling back to tiered scans.")
+                self._change_number = None
+                self._next_scan.clear()  # sweep slots are hours out; rescan on tiers
+            return self._due_appids(games)
+
+        current, apps = polled
+        first_poll = self._change_number is None
+        self._change_number = current
+        changed = set()
+        if not first_poll:
+            # The first reply only sets the cursor; tier/sweep slots cover the gap.
+            changed = {
+                a for a, n in apps.items()
+                if a in games and n > self._app_change.get(a, -1)
+            }
+        return sorted(changed | set(self._due_appids(games)))
+
+    def _due_appids(self, games: dict) -> list:
+        """AppIDs whose next tiered scan time has passed (unscheduled games are due)."""
+        for appid_str in set(self._next_scan) - set(games):
+            del self._next_scan[appid_str]
+        now = time.time()
+        return [a for a in games if self._next_scan.get(a, 0) <= now]
+
+    def _schedule_next_scans(self, games: dict, build_counts: dict):
+        now = time.time()
+        for appid_str, info in games.items():
+            tier = scan_tier(info, build_counts.get(appid_str, 0), now)
+            if self._change_number is not None and tier != "hot":
+                interval = CHANGE_FEED_SWEEP
+            else:
+                interval = SCAN_TIERS[tier]
+            self._next_scan[appid_str] = next_scan_time(int(appid_str), interval, now)
+
+    @tasks.loop(minutes=SCAN_TICK_MINUTES)
     async def check_games_loop(self):
-        await self.check_games_internal()
+        if self._check_lock.locked():
+            return  # a long scan (or dforcecheck) is still running
+        await self.check_games_internal(due_only=True)
 
     # ── shared add logic ──────────────────────────────────────────────────
     async def _add_appid(self, ctx_or_interaction, games: dict, appid: int, send_func):
@@ -798,27 +1724,18 @@ class DenuvoWatch(commands.Cog):
             await send_func(f"❌ Watchlist is full ({MAX_GAMES} games max).")
             return
 
-        snapshot = await asyncio.to_thread(get_game_snapshot, appid)
+        snapshot = await get_game_snapshot(self.http, appid, self._denuvo_cache)
         if snapshot is None:
             await send_func(f"❌ Couldn't fetch data for AppID `{appid}`.")
             return
 
-        _, _, manifests, depot_sizes = await asyncio.to_thread(fetch_build_id, appid)
-
-        entry = {
-            "name": snapshot["name"],
-            "denuvo": snapshot["denuvo"],
-            "build_id": snapshot["build_id"],
-        }
-        if snapshot.get("coming_soon"):
-            entry["coming_soon"] = True
-            if snapshot.get("release_date"):
-                entry["release_date"] = snapshot["release_date"]
-        entry["manifests"] = manifests
-        entry["depot_sizes"] = depot_sizes
+        manifests, depot_sizes = await with_subdlc_depots(
+            self.http, appid, snapshot["manifests"], snapshot["depot_sizes"]
+        )
+        entry = entry_from_snapshot(snapshot, manifests, depot_sizes)
 
         games[str(appid)] = entry
-        await self._save_games(games)
+        await self._save_games({str(appid): entry})
 
         embed = discord.Embed(
             title="✅ Added to Watchlist",
@@ -836,87 +1753,27 @@ class DenuvoWatch(commands.Cog):
     async def _game_name_autocomplete(
         self, interaction: discord.Interaction, current: str
     ) -> list:
-        now = asyncio.get_event_loop().time()
-        if now - self._name_cache_ts > self._name_cache_ttl:
-            try:
-                await asyncio.wait_for(self._refresh_name_cache(), timeout=1.5)
-            except Exception:
-                pass  # fall back to whatever's already cached (even if empty/stale)
-
-        current_lower = current.lower()
-        matches = [name for name in self._name_cache if current_lower in name.lower()]
+        names = self._name_index.names
         return [
-            discord.app_commands.Choice(name=name, value=name)
-            for name in matches[:25]
+            discord.app_commands.Choice(name=names[appid_str][:100], value=names[appid_str][:100])
+            for appid_str in self._name_index.search(current, limit=25)
         ]
 
-    async def fetch_dlc_depots_info(self, dlc_appid: int) -> dict[str, int]:
-        depot_sizes = {}
-        try:
-            r = await asyncio.to_thread(
-                requests.get,
-                f"https://api.steamcmd.net/v1/info/{dlc_appid}",
-                headers=HEADERS,
-                timeout=10,
-            )
-            data = r.json()
-            app_data = data.get("data", {}).get(str(dlc_appid), {})
-
-            app_type = app_data.get("common", {}).get("type", "").lower()
-            if app_type != "dlc":
-                return depot_sizes  # skip demos, base-game cross-refs, tools, etc.
-
-            dlc_depots = app_data.get("depots", {})
-            if not dlc_depots:
-                return depot_sizes
-
-            for depot_id, depot_info in dlc_depots.items():
-                if not depot_id.isdigit() or not isinstance(depot_info, dict):
-                    continue
-
-                depot_oslist = depot_info.get("config", {}).get("oslist")
-                if depot_oslist and not any(os_ in depot_oslist for os_ in OSLIST_FILTER):
-                    continue
-
-                manifest = depot_info.get("manifests", {}).get("public")
-                size = 0
-                if isinstance(manifest, dict):
-                    size = int(manifest.get("size", 0))
-                elif "maxsize" in depot_info:
-                    try:
-                        size = int(depot_info.get("maxsize", 0))
-                    except (ValueError, TypeError):
-                        pass
+    async def get_total_size_with_dlc(
+        self, appid: int, snapshot: Optional[dict] = None
+    ) -> tuple[int, dict[str, int]]:
+        """Dynamic DLC size lookup used exclusively for ad-hoc / unwatched checks.
 
-                if size > 0:
-                    depot_sizes[depot_id] = size
-        except Exception:
-            pass
-
-        return depot_sizes
+        Pass the snapshot the caller already fetched to skip re-requesting the
+        base app's store and steamcmd data.
+        """
+        if snapshot is None:
+            snapshot = await get_game_snapshot(self.http, appid)
+        if snapshot is None:
+            return 0, {}
 
-    async def get_total_size_with_dlc(self, appid: int) -> tuple[int, dict[str, int]]:
-        """Dynamic DLC size lookup used exclusively for ad-hoc / unwatched checks."""
-        # 1. Base game depots (via fetch_build_id which includes SUBDLC_APPIDS)
-        _, _, _, base_depots = await asyncio.to_thread(fetch_build_id, appid)
-        depot_sizes = dict(base_depots)
-
-        # 2. Discover all DLC AppIDs
-        details = await asyncio.to_thread(fetch_app_details, appid)
-        store_dlc_ids = set((details or {}).get("dlc", []))
-        steamcmd_dlc_ids = set(await asyncio.to_thread(get_dlc_appids_from_steamcmd, appid))
-        all_dlc_ids = store_dlc_ids | steamcmd_dlc_ids
-
-        # 3. Fetch sizes for all discovered DLCs concurrently
-        if all_dlc_ids:
-            tasks = [self.fetch_dlc_depots_info(d) for d in all_dlc_ids]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for dlc_sizes in results:
-                if isinstance(dlc_sizes, dict):
-                    depot_sizes.update(dlc_sizes)
-
-        total_bytes = sum(depot_sizes.values())
-        return total_bytes, depot_sizes
+        depot_sizes = await self._dlc_cache.sizes(self.http, appid, snapshot)
+        return sum(depot_sizes.values()), depot_sizes
 
     # ── command group (denuvowatch) ───────────────────────────────────────
 
@@ -926,17 +1783,17 @@ class DenuvoWatch(commands.Cog):
     async def dadd(self, ctx: commands.Context, *, query: str):
         """Add a game to the watchlist by name or AppID."""
         async with ctx.typing():
-            games = await self._load_games()
+            games = await self._load_games(depots=False)
 
             if query.isdigit():
                 appid = int(query)
-                snapshot = await asyncio.to_thread(get_game_snapshot, appid)
+                snapshot = await get_game_snapshot(self.http, appid)
                 if snapshot is None:
                     await ctx.send(f"❌ Couldn't find a game with AppID `{appid}`.")
                     return
                 candidates = [{"appid": appid, "name": snapshot["name"]}]
             else:
-                raw_candidates = await asyncio.to_thread(search_steam, query)
+                raw_candidates = await search_steam(self.http, query)
                 raw_candidates = raw_candidates[:10]
                 if not raw_candidates:
                     await ctx.send("❌ No results found on Steam.")
@@ -947,7 +1804,7 @@ class DenuvoWatch(commands.Cog):
                 else:
                     candidates = []
                     for c in raw_candidates:
-                        details = await asyncio.to_thread(fetch_app_details, c["appid"])
+                        details = await fetch_app_details(self.http, c["appid"])
                         if details.get("type") == "game":
                             candidates.append(c)
                         if len(candidates) >= 5:
@@ -968,7 +1825,7 @@ class DenuvoWatch(commands.Cog):
 
         async def select_callback(inter: discord.Interaction):
             await inter.response.defer(thinking=True)
-            fresh_games = await self._load_games()
+            fresh_games = await self._load_games(depots=False)
             await self._add_appid(inter, fresh_games, int(select.values[0]), inter.followup.send)
 
         select.callback = select_callback
@@ -981,37 +1838,23 @@ class DenuvoWatch(commands.Cog):
     @discord.app_commands.describe(query="Game name or AppID")
     async def dremove(self, ctx: commands.Context, *, query: str):
         """Remove a game from the watchlist."""
-        games = await self._load_games()
+        games = await self._load_games(depots=False)
         if not games:
             await ctx.send("📭 Watchlist is empty.", ephemeral=True)
             return
 
-        matches = []
-        query_lower = query.lower()
-
-        # Exact name match first (covers autocomplete selections, which supply the exact stored name)
-        exact_matches = [
-            (appid_str, info) for appid_str, info in games.items()
-            if info["name"].lower() == query_lower
+        # AppID, then exact name (covers autocomplete selections), then ranked search
+        matches = [
+            (appid_str, games[appid_str]) for appid_str in self._name_index.resolve(query)
+            if appid_str in games
         ]
-        if exact_matches:
-            matches = exact_matches
-        else:
-            for appid_str, info in games.items():
-                if query.isdigit() and appid_str == query:
-                    matches = [(appid_str, info)]
-                    break
-                elif query_lower in info["name"].lower():
-                    matches.append((appid_str, info))
-
-            if not matches:
-                await ctx.send(f"❌ No game matching `{query}` on the watchlist.", ephemeral=True)
-                return
+        if not matches:
+            await ctx.send(f"❌ No game matching `{query}` on the watchlist.", ephemeral=True)
+            return
 
         if len(matches) == 1:
             appid_str, info = matches[0]
-            del games[appid_str]
-            await self._save_games(games)
+            await self._delete_game(appid_str)
             await ctx.send(f"🗑️ Removed **{info['name']}** from the watchlist.", ephemeral=True)
             return
 
@@ -1022,11 +1865,10 @@ class DenuvoWatch(commands.Cog):
         select = discord.ui.Select(placeholder="Which game to remove?", options=options)
 
         async def cb(inter: discord.Interaction):
-            fresh_games = await self._load_games()
             chosen_id = select.values[0]
-            name = fresh_games[chosen_id]["name"]
-            del fresh_games[chosen_id]
-            await self._save_games(fresh_games)
+            fresh = await self.store.get_game(chosen_id)
+            name = fresh["name"] if fresh else chosen_id
+            await self._delete_game(chosen_id)
             await inter.response.send_message(f"🗑️ Removed **{name}** from the watchlist.", ephemeral=True)
 
         select.callback = cb
@@ -1041,7 +1883,7 @@ class DenuvoWatch(commands.Cog):
     @commands.hybrid_command(name="dlist")
     async def dlist(self, ctx: commands.Context):
         """Show all watched games and their status."""
-        games_dict = await self._load_games()
+        games_dict = await self._load_games(depots=False)
         if not games_dict:
             await ctx.send("📭 Watchlist is empty. Use `dadd` to add games.")
             return
@@ -1063,7 +1905,7 @@ class DenuvoWatch(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        view = ListView(ctx, games, discord.Color.blurple())
+        view = ListView(ctx, games, discord.Color.blurple(), max_games=MAX_GAMES)
         msg = await ctx.send(embed=view.build_embed(), view=view)
         view.message = msg
 
@@ -1074,34 +1916,31 @@ class DenuvoWatch(commands.Cog):
     async def dcheck(self, ctx: commands.Context, *, query: str):
         """Instantly check a game's current status."""
         async with ctx.typing():
-            games = await self._load_games()
-
             appid = None
             if query.isdigit():
                 appid = int(query)
             else:
-                for appid_str, info in games.items():
-                    if query.lower() in info["name"].lower():
-                        appid = int(appid_str)
-                        break
-                if appid is None:
-                    appid = await resolve_best_game_match(query)
+                hits = self._name_index.resolve(query)
+                if hits:
+                    appid = int(hits[0])
+                else:
+                    appid = await resolve_best_game_match(self.http, query)
 
             if appid is None:
                 await ctx.send(f"❌ Couldn't resolve `{query}` to a Steam game.")
                 return
 
-            snapshot = await asyncio.to_thread(get_game_snapshot, appid)
+            snapshot = await get_game_snapshot(self.http, appid)
             if snapshot is None:
                 await ctx.send(f"❌ Couldn't fetch data for AppID `{appid}`.")
                 return
 
-            in_watchlist = str(appid) in games
-            stored = games.get(str(appid), {})
+            in_watchlist = str(appid) in self._name_index.names
+            stored = (await self.store.get_game(str(appid)) or {}) if in_watchlist else {}
 
             depot_sizes = stored.get("depot_sizes", {})
             if not depot_sizes:
-                _, depot_sizes = await self.get_total_size_with_dlc(appid)
+                _, depot_sizes = await self.get_total_size_with_dlc(appid, snapshot)
 
         embed = discord.Embed(
             title=f"🔍 {snapshot['name']}",
@@ -1155,34 +1994,13 @@ class DenuvoWatch(commands.Cog):
     @commands.hybrid_command(name="dupcoming")
     async def dupcoming(self, ctx: commands.Context):
         """Show all upcoming (unreleased) games in the watchlist."""
-        games = await self._load_games()
-
-        upcoming = [
-            (appid_str, info) for appid_str, info in games.items()
-            if info.get("coming_soon")
-        ]
-
+        upcoming = await self.store.load_upcoming()
         if not upcoming:
             await ctx.send("📭 No upcoming games on the watchlist right now.")
             return
 
-        def sort_key(item):
-            _, info = item
-            parsed = parse_release_date(info.get("release_date"))
-            return (parsed is None, parsed or datetime.max)
-
-        upcoming.sort(key=sort_key)
-
-        embed = discord.Embed(
-            title=f"🚀 Upcoming Games ({len(upcoming)})",
-            color=discord.Color.gold()
-        )
-        lines = []
-        for appid_str, info in upcoming:
-            date = info.get("release_date") or "Date TBA"
-            lines.append(f"**{info['name']}** `{appid_str}` — {date}")
-        embed.description = "\n".join(lines)
-        await ctx.send(embed=embed)
+        view = UpcomingView(ctx, upcoming, discord.Color.gold())
+        view.message = await ctx.send(embed=view.build_embed(), view=view)
 
     @commands.hybrid_command(name="dsummary")
     @discord.app_commands.describe(query="Game name or Steam AppID")
@@ -1193,13 +2011,13 @@ class DenuvoWatch(commands.Cog):
             if query.isdigit():
                 appid = int(query)
             else:
-                appid = await resolve_best_game_match(query)
+                appid = await resolve_best_game_match(self.http, query)
 
             if appid is None:
                 await ctx.send(f"❌ Couldn't resolve `{query}` to a Steam game.")
                 return
 
-            data = await asyncio.to_thread(fetch_app_details, appid)
+            data = await fetch_app_details(self.http, appid)
             if not data:
                 await ctx.send(f"❌ Couldn't fetch data for AppID `{appid}`.")
                 return
@@ -1253,33 +2071,24 @@ class DenuvoWatch(commands.Cog):
     @commands.hybrid_command(name="ddepots")
     @discord.app_commands.describe(
         query="Game name or AppID",
-        index="Which build: 0=current (default), 1=previous, 2=two builds ago, 3=three builds ago",
+        index="Which build: 0=current (default), 1=previous, 2=two builds ago, …",
         show_manifests="Also show manifest IDs (default: False)"
     )
     async def ddepots(self, ctx: commands.Context, query: str, index: int = 0, show_manifests: bool = False):
         """Show depot info for a watched game."""
-        games = await self._load_games()
-
-        appid = None
-        if query.isdigit():
-            appid = int(query)
-        else:
-            for appid_str, info in games.items():
-                if query.lower() in info["name"].lower():
-                    appid = int(appid_str)
-                    break
-
-        if appid is None:
+        hits = self._name_index.resolve(query)
+        if not hits:
             await ctx.send(f"❌ `{query}` not found in your watchlist.")
             return
+        appid = int(hits[0])
 
-        info = games.get(str(appid))
+        info = await self.store.get_game(hits[0])
         if not info:
             await ctx.send(f"❌ `{query}` not found in your watchlist.")
             return
 
-        if index < 0 or index > 3:
-            await ctx.send("❌ Index must be 0 (current), 1, 2, or 3.")
+        if index < 0:
+            await ctx.send("❌ Index must be 0 (current) or a positive number of builds back.")
             return
 
         if index == 0:
@@ -1291,16 +2100,14 @@ class DenuvoWatch(commands.Cog):
                 await ctx.send("No depot data recorded yet — run `dforcecheck` to populate.")
                 return
         else:
-            history = await self._load_history()
-            game_history = history.get(str(appid), {})
-            history_entries = list(reversed(list(game_history.items())))
-            if index > len(history_entries):
-                await ctx.send(f"❌ Only {len(history_entries)} previous build(s) recorded so far.")
+            entry = await self.store.get_build(str(appid), index)
+            if entry is None:
+                count = await self.store.build_count(str(appid))
+                await ctx.send(f"❌ Only {count} previous build(s) recorded so far.")
                 return
-            build_id, entry = history_entries[index - 1]
             manifests = entry["manifests"]
-            depot_sizes = entry.get("depot_sizes", {})
-            label = f"Previous {index} (build `{build_id}`)"
+            depot_sizes = entry["depot_sizes"]
+            label = f"Previous {index} (build `{entry['build_id']}`)"
 
         all_depots = set(list(manifests.keys()) + list(depot_sizes.keys()))
         lines = []
@@ -1320,7 +2127,7 @@ class DenuvoWatch(commands.Cog):
             color=discord.Color.blue()
         )
         embed.add_field(name=label, value="\n".join(lines)[:1024], inline=False)
-        embed.set_footer(text=f"AppID {appid} • 0=current, 1-3=previous builds")
+        embed.set_footer(text=f"AppID {appid} • 0=current, 1+=previous builds")
         embed.timestamp = datetime.now(timezone.utc)
         await ctx.send(embed=embed)
 
@@ -1328,6 +2135,82 @@ class DenuvoWatch(commands.Cog):
     async def ddepots_query_autocomplete(self, interaction: discord.Interaction, current: str):
         return await self._game_name_autocomplete(interaction, current)
 
+    @commands.hybrid_command(name="dtrend")
+    @discord.app_commands.describe(query="Game name or AppID")
+    async def dtrend(self, ctx: commands.Context, *, query: str):
+        """Show a watched game's install-size growth and patch cadence."""
+        hits = self._name_index.resolve(query)
+        if not hits:
+            await ctx.send(f"❌ `{query}` not found in your watchlist.")
+            return
+        appid_str = hits[0]
+        info = await self.store.get_game(appid_str)
+        if not info:
+            await ctx.send(f"❌ `{query}` not found in your watchlist.")
+            return
+
+        series = await self.store.size_series(appid_str)
+        series.append({
+            "build_id": info.get("build_id"),
+            "build_time": info.get("build_time"),
+            "recorded_at": int(time.time()),
+            "total_size": sum(info.get("depot_sizes", {}).values()),
+        })
+        if len(series) < 2:
+            await ctx.send(f"ℹ️ No earlier builds of **{info['name']}** recorded yet.")
+            return
+
+        trend = summarize_build_series(series)
+        embed = discord.Embed(
+            title=f"📈 Build Trend — {info['name']}",
+            url=f"https://steamdb.info/app/{appid_str}/patchnotes/",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Builds Recorded", value=str(len(series)), inline=True)
+        embed.add_field(name="Since", value=f"<t:{trend['first_time']}:D>", inline=True)
+        embed.add_field(
+            name="Patches (30d / 90d)",
+            value=f"{trend['last_30d']} / {trend['last_90d']}",
+            inline=True,
+        )
+        if trend["median_gap"] is not None:
+            embed.add_field(
+                name="Cadence",
+                value=f"median {format_duration(trend['median_gap'])}, "
+                      f"shortest {format_duration(trend['min_gap'])}",
+                inline=True,
+            )
+        first, last = trend["first_size"], trend["last_size"]
+        if first and last:
+            diff = last - first
+            sign = "+" if diff >= 0 else "-"
+            embed.add_field(
+                name="Size",
+                value=f"`{format_size(first)}` → `{format_size(last)}` (`{sign}{format_size(abs(diff))}`)",
+                inline=True,
+            )
+        if trend["largest_jump"]:
+            build_id, jump = trend["largest_jump"]
+            sign = "+" if jump >= 0 else "-"
+            embed.add_field(
+                name="Largest Change",
+                value=f"`{sign}{format_size(abs(jump))}` in build `{build_id}`",
+                inline=True,
+            )
+        if trend["sparkline"]:
+            embed.add_field(
+                name=f"Size, last {len(trend['sparkline'])} builds",
+                value=f"`{trend['sparkline']}`",
+                inline=False,
+            )
+        embed.set_footer(text=f"AppID {appid_str} • DenuvoWatch")
+        embed.timestamp = datetime.now(timezone.utc)
+        await ctx.send(embed=embed)
+
+    @dtrend.autocomplete("query")
+    async def dtrend_query_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self._game_name_autocomplete(interaction, current)
+
     @commands.hybrid_command(name="dexport")
     async def dexport(self, ctx: commands.Context):
         """Export the current watchlist as a JSON file (re-importable via dimport)."""
@@ -1348,29 +2231,19 @@ class DenuvoWatch(commands.Cog):
     @commands.hybrid_command(name="dimport")
     @owner_only()
     async def dimport(self, ctx: commands.Context, url: str = None):
-        """Import games into the watchlist from a JSON file or URL."""
-        raw = None
+        """Import games into the watchlist from a JSON file or URL.
 
+        The file is parsed as it downloads, and every new AppID is
+        re-snapshotted from Steam before it's saved, so imported entries
+        start out with current build and Denuvo data.
+        """
         if url:
             url = url.strip("<>")
             if not url.lower().startswith(("http://", "https://")):
                 await ctx.send("❌ That doesn't look like a valid URL.")
                 return
-            try:
-                async with self.session.get(
-                    url, timeout=aiohttp.ClientTimeout(total=20)
-                ) as r:
-                    r.raise_for_status()
-                    raw = await r.read()
-            except Exception as e:
-                await ctx.send(f"❌ Couldn't download the file: `{e}`")
-                return
         elif ctx.message.attachments:
-            try:
-                raw = await ctx.message.attachments[0].read()
-            except Exception as e:
-                await ctx.send(f"❌ Couldn't read the attached file: `{e}`")
-                return
+            url = ctx.message.attachments[0].url
         else:
             await ctx.send(
                 "❌ Attach a JSON file or pass a direct JSON URL "
@@ -1378,68 +2251,99 @@ class DenuvoWatch(commands.Cog):
             )
             return
 
-        try:
-            text = raw.decode("utf-8").lstrip()
-            if text[:1] not in ("{", "["):
-                await ctx.send("❌ The source didn't return JSON (got HTML/other).")
+        games = await self._load_games(depots=False)
+        counts = {"added": 0, "existing": 0, "full": 0, "invalid": 0, "failed": 0}
+        progress = await ctx.send("📥 Importing…")
+        last_edit = 0.0
+
+        async def report(done: bool = False):
+            nonlocal last_edit
+            now = time.monotonic()
+            if not done and now - last_edit < IMPORT_PROGRESS_EVERY:
                 return
-            payload = json.loads(text)
-        except Exception as e:
-            await ctx.send(f"❌ Couldn't parse the JSON: `{e}`")
+            last_edit = now
+            head = "✅ Import finished." if done else "📥 Importing…"
+            lines = [f"{head} Added **{counts['added']}** game(s). Watchlist now {len(games)}/{MAX_GAMES}."]
+            if counts["existing"]:
+                lines.append(f"• Skipped {counts['existing']} already on the watchlist.")
+            if counts["full"]:
+                lines.append(f"• Skipped {counts['full']} — watchlist full ({MAX_GAMES} cap).")
+            if counts["invalid"]:
+                lines.append(f"• Ignored {counts['invalid']} invalid entr(y/ies).")
+            if counts["failed"]:
+                lines.append(f"• {counts['failed']} AppID(s) couldn't be fetched from Steam.")
+            try:
+                await progress.edit(content="\n".join(lines))
+            except discord.HTTPException:
+                pass
+
+        pending: list[int] = []
+        try:
+            async for appid_str, info in self._stream_import(url):
+                if not appid_str.isdigit() or not isinstance(info, dict):
+                    counts["invalid"] += 1
+                    continue
+                if appid_str in games or int(appid_str) in pending:
+                    counts["existing"] += 1
+                    continue
+                if len(games) + len(pending) >= MAX_GAMES:
+                    counts["full"] += 1
+                    continue
+                pending.append(int(appid_str))
+                if len(pending) >= IMPORT_BATCH:
+                    await self._import_batch(pending, games, counts)
+                    pending = []
+                    await report()
+            if pending:
+                await self._import_batch(pending, games, counts)
+        except ImportFormatError as e:
+            await progress.edit(content=f"❌ Couldn't parse the JSON: `{e}` (kept {counts['added']} game(s) imported so far).")
+            return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            await progress.edit(content=f"❌ Couldn't download the file: `{e}` (kept {counts['added']} game(s) imported so far).")
             return
 
-        incoming = payload.get("games", payload) if isinstance(payload, dict) else None
-        if not isinstance(incoming, dict) or not incoming:
-            await ctx.send("❌ No games found in the file.")
+        if not any(counts.values()):
+            await progress.edit(content="❌ No games found in the file.")
             return
+        await report(done=True)
+
+    async def _stream_import(self, url: str):
+        """Yield (appid_str, entry) pairs from an export file as it downloads."""
+        parser = WatchlistStreamParser()
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=None, sock_read=30)) as r:
+            r.raise_for_status()
+            async for chunk in r.content.iter_chunked(IMPORT_CHUNK):
+                for item in parser.feed(decoder.decode(chunk)):
+                    yield item
+        for item in parser.feed(decoder.decode(b"", final=True), final=True):
+            yield item
+
+    async def _import_batch(self, appids: list, games: dict, counts: dict):
+        """Snapshot a batch of imported AppIDs and commit the ones Steam knows."""
+        sem = asyncio.Semaphore(await self.config.scan_concurrency())
+
+        async def one(appid: int):
+            async with sem:
+                snapshot = await get_game_snapshot(self.http, appid, self._denuvo_cache)
+                if snapshot is None:
+                    return appid, None
+                manifests, depot_sizes = await with_subdlc_depots(
+                    self.http, appid, snapshot["manifests"], snapshot["depot_sizes"]
+                )
+                return appid, entry_from_snapshot(snapshot, manifests, depot_sizes)
 
-        games = await self._load_games()
-        added, skipped_existing, skipped_full, invalid = 0, 0, 0, 0
+        batch = {}
+        for appid, entry in await asyncio.gather(*(one(a) for a in appids)):
+            if entry is None:
+                counts["failed"] += 1
+            else:
+                batch[str(appid)] = entry
+        await self._save_games(batch)
+        games.update(batch)
+        counts["added"] += len(batch)
 
-        for appid_str, info in incoming.items():
-            if not str(appid_str).isdigit() or not isinstance(info, dict):
-                invalid += 1
-                continue
-            
-            appid_str = str(appid_str)
-            if appid_str in games:
-                skipped_existing += 1
-                continue
-            if len(games) >= MAX_GAMES:
-                skipped_full += 1
-                continue
-            
-            # Safely extract all fields the current bot relies on
-            games[appid_str] = {
-                "name": info.get("name", f"AppID {appid_str}"),
-                "denuvo": bool(info.get("denuvo", False)),
-                "build_id": info.get("build_id"),
-                "build_time": info.get("build_time"),
-                "manifests": info.get("manifests", {}),
-                "depot_sizes": info.get("depot_sizes", {}),
-            }
-            
-            # Only add release data if it exists in the import
-            if info.get("coming_soon"):
-                games[appid_str]["coming_soon"] = True
-                if info.get("release_date"):
-                    games[appid_str]["release_date"] = info["release_date"]
-                    
-            added += 1
-
-        # Use our custom helper to ensure alphabetical sorting
-        await self._save_games(games)
-
-        lines = [f"✅ Imported **{added}** game(s). Watchlist now {len(games)}/{MAX_GAMES}."]
-        if skipped_existing:
-            lines.append(f"• Skipped {skipped_existing} already on the watchlist.")
-        if skipped_full:
-            lines.append(f"• Skipped {skipped_full} — watchlist full ({MAX_GAMES} cap).")
-        if invalid:
-            lines.append(f"• Ignored {invalid} invalid entr(y/ies).")
-            
-        await ctx.send("\n".join(lines))
-    	
     # ── settings commands (Prefix Only) ───────────────────────────────────
     @commands.group(name="denuvowatch", invoke_without_command=True)
     @owner_only()
@@ -1458,6 +2362,15 @@ class DenuvoWatch(commands.Cog):
         embed.add_field(name="Notify Channel", value=f"<#{channel_id}>" if channel_id else "Not set", inline=False)
         embed.add_field(name="Notify User", value=f"<@{user_id}>" if user_id else "Not set", inline=True)
         embed.add_field(name="Notify Role", value=f"<@&{role_id}>" if role_id else "Not set", inline=True)
+        embed.add_field(name="Scan Concurrency", value=str(await self.config.scan_concurrency()), inline=True)
+        embed.add_field(name="Denuvo Scrape TTL", value=f"{await self.config.denuvo_ttl_hours():g}h", inline=True)
+        feed_url = await self.config.change_feed_url()
+        embed.add_field(name="Change Feed", value=f"<{feed_url}>" if feed_url else "Off (tiered polling)", inline=False)
+        budgets = "\n".join(
+            f"`{name}`: {bucket.base_rate:g}/s, burst {bucket.burst}"
+            for name, bucket in self.http.buckets.items()
+        )
+        embed.add_field(name="Host Budgets", value=budgets, inline=False)
         await ctx.send(embed=embed)
 
     @denuvowatch.command(name="channel", with_app_command=False)
@@ -1479,4 +2392,110 @@ class DenuvoWatch(commands.Cog):
     async def denuvowatch_user(self, ctx: commands.Context, user: Optional[discord.User] = None):
         """Set (or clear, if omitted) the user pinged on build changes."""
         await self.config.notify_user_id.set(user.id if user else None)
-        await ctx.send(f"✅ Notify user set to {user.mention}." if user else "✅ Notify user cleared.")
\ No newline at end of file
+        await ctx.send(f"✅ Notify user set to {user.mention}." if user else "✅ Notify user cleared.")
+
+    @denuvowatch.command(name="concurrency", with_app_command=False)
+    @owner_only()
+    async def denuvowatch_concurrency(self, ctx: commands.Context, games: int):
+        """Set how many games are snapshotted at once during a scan."""
+        if not 1 <= games <= 32:
+            await ctx.send("❌ Concurrency must be between 1 and 32.")
+            return
+        await self.config.scan_concurrency.set(games)
+        await ctx.send(f"✅ Scan concurrency set to **{games}**.")
+
+    @denuvowatch.command(name="budget", with_app_command=False)
+    @owner_only()
+    async def denuvowatch_budget(self, ctx: commands.Context, host: str, rate: float, burst: int = None):
+        """Set a host's request budget (requests/second and burst).
+
+        Hosts: `store_api`, `store_html`, `steamcmd`.
+        """
+        host = host.lower()
+        if host not in HOST_BUDGETS:
+            await ctx.send(f"❌ Unknown host. Pick one of: {', '.join(f'`{h}`' for h in HOST_BUDGETS)}.")
+            return
+        if rate <= 0 or (burst is not None and burst < 1):
+            await ctx.send("❌ Rate must be positive and burst at least 1.")
+            return
+        burst = burst if burst is not None else HOST_BUDGETS[host][1]
+        async with self.config.host_budgets() as budgets:
+            budgets[host] = [rate, burst]
+        self.http.set_budget(host, rate, burst)
+        await ctx.send(f"✅ `{host}` budget set to **{rate:g}/s** (burst {burst}).")
+
+    @denuvowatch.command(name="changefeed", with_app_command=False)
+    @owner_only()
+    async def denuvowatch_changefeed(self, ctx: commands.Context, url: Optional[str] = None):
+        """Set (or clear, if omitted) a PICS change-feed URL.
+
+        The feed is called as `<url>?since=<change number>` and must return
+        `{"change_number": N, "apps": {"<appid>": N, ...}}`. While it answers,
+        only changed games are snapshotted each tick; otherwise scans fall
+        back to the hot/warm/cold tiers.
+        """
+        if url is not None and not url.startswith(("http://", "https://")):
+            await ctx.send("❌ The feed URL must start with http:// or https://.")
+            return
+        if url is not None:
+            polled = await fetch_changed_apps(self.http, url, 0)
+            if polled is None:
+                await ctx.send("❌ That URL didn't answer with a change feed.")
+                return
+        await self.config.change_feed_url.set(url)
+        self._change_number = None
+        self._next_scan.clear()
+        if url:
+            await ctx.send(f"✅ Change feed enabled (currently at change `{polled[0]}`).")
+        else:
+            await ctx.send("✅ Change feed cleared; back to tiered polling.")
+
+    @denuvowatch.command(name="scanstats", with_app_command=False)
+    @owner_only()
+    async def denuvowatch_scanstats(self, ctx: commands.Context):
+        """Show request counters from the last completed scan."""
+        stats = self._last_scan_stats
+        if stats is None:
+            await ctx.send("No scan has completed since the cog was loaded.")
+            return
+        embed = discord.Embed(title="📊 Last Scan", color=discord.Color.blurple())
+        embed.add_field(name="Games", value=str(stats.games), inline=True)
+        embed.add_field(name="Duration", value=f"{stats.duration:.1f}s", inline=True)
+        embed.add_field(name="Requests", value=str(stats.requests), inline=True)
+        embed.add_field(name="Retries", value=str(stats.retries), inline=True)
+        embed.add_field(name="Throttled (429)", value=str(stats.throttled), inline=True)
+        embed.add_field(name="Server Errors", value=str(stats.errors), inline=True)
+        games = await self._load_games(depots=False)
+        now = time.time()
+        build_counts = await self.store.history_counts(since=now - PATCHER_WINDOW)
+        tiers = {name: 0 for name in SCAN_TIERS}
+        for appid_str, info in games.items():
+            tiers[scan_tier(info, build_counts.get(appid_str, 0), now)] += 1
+        embed.add_field(
+            name="Scan Tiers",
+            value="\n".join(
+                f"`{name}` every {SCAN_TIERS[name] // 60} min: {count} game(s)"
+                for name, count in tiers.items()
+            ),
+            inline=False,
+        )
+        if self._change_number is not None:
+            embed.add_field(
+                name="Change Feed",
+                value=f"At change `{self._change_number}`; unchanged warm/cold games swept every "
+                      f"{CHANGE_FEED_SWEEP // 3600}h",
+                inline=False,
+            )
+        embed.timestamp = stats.finished_at
+        await ctx.send(embed=embed)
+
+    @denuvowatch.command(name="denuvottl", with_app_command=False)
+    @owner_only()
+    async def denuvowatch_denuvottl(self, ctx: commands.Context, hours: float):
+        """Set how long a stable store-page Denuvo result is reused (0 = every scan)."""
+        if hours < 0 or hours > 168:
+            await ctx.send("❌ TTL must be between 0 and 168 hours.")
+            return
+        await self.config.denuvo_ttl_hours.set(hours)
+        self._denuvo_cache.ttl = hours * 3600
+        await ctx.send(f"✅ Stable games are re-scraped every **{hours:g}h** at most.")
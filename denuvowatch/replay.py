@@ -0,0 +1,401 @@
+"""
+Offline recording, replay and benchmarking for DenuvoWatch scans.
+
+    # Record real responses for some games into a corpus (needs network):
+    python denuvowatch/replay.py record corpus.json 2358720 1245620 ...
+    python denuvowatch/replay.py record corpus.json --export steam_data_export.json
+
+    # Serve a corpus (plus a simulated PICS change feed) on localhost:
+    python denuvowatch/replay.py serve corpus.json --port 8765
+    [p]denuvowatch changefeed http://127.0.0.1:8765/changes
+    curl -X POST 127.0.0.1:8765/changes -d '{"apps": [2358720]}'
+
+    # Time the cog's real check cycle on 100/500/2000 games against the corpus
+    # (run from the repo root; needs the cog's own dependencies):
+    python -m denuvowatch.replay bench corpus.json --sizes 100 500 2000
+    python -m denuvowatch.replay bench corpus.json --feed 0.05
+
+Corpus layout:
+
+    {
+      "games": {
+        "<appid>": {
+          "appdetails": {"status": 200, "headers": {}, "body": {...}},
+          "store":      {"status": 200, "headers": {"ETag": "..."}, "body": "<html>…"},
+          "steamcmd":   {"status": 200, "headers": {}, "body": {...}}
+        }
+      },
+      "responses": {"/some/path?query": {"status": 200, "headers": {}, "body": ...}},
+      "changes": [{"change_number": 100, "apps": [2358720]}, ...]
+    }
+
+`responses` holds anything that isn't per-game; keys are the request path,
+optionally with its query string (the exact `path?query` key wins). A body
+that isn't a string is sent as JSON. Recorded ETag/Last-Modified headers are
+honoured, so conditional requests get a 304 like they would from Steam.
+
+With `--synthetic`, AppIDs missing from the corpus are served by cloning a
+recorded game (chosen by AppID modulo corpus size) with its AppID swapped in,
+which is how the benchmark scales past the games that were recorded.
+
+`serve` and `record` only need aiohttp and don't import the cog.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+RECORD_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+RECORD_DELAY = 1.5  # seconds between games while recording; appdetails is ~1 req/s
+SYNTHETIC_BASE = 10_000_000  # first AppID handed to benchmark games beyond the corpus
+
+_APP_PAGE_RE = re.compile(r"^/app/(\d+)/?$")
+_STEAMCMD_RE = re.compile(r"^/v1/info/(\d+)$")
+
+
+def classify(path: str, query) -> tuple:
+    """(kind, appid) for a per-game Steam URL, or (None, None)."""
+    if path == "/api/appdetails" and query.get("appids", "").isdigit():
+        return "appdetails", query["appids"]
+    m = _APP_PAGE_RE.match(path)
+    if m:
+        return "store", m.group(1)
+    m = _STEAMCMD_RE.match(path)
+    if m:
+        return "steamcmd", m.group(1)
+    return None, None
+
+
+class ReplayServer:
+    def __init__(self, corpus: dict, synthetic: bool = False):
+        self.games: dict = corpus.get("games", {})
+        self.responses: dict = corpus.get("responses", {})
+        self.changes: list = sorted(
+            corpus.get("changes", []), key=lambda c: c["change_number"]
+        )
+        self.synthetic = synthetic
+        self._templates = sorted(self.games, key=int)
+        self.requests = 0
+
+    @property
+    def change_number(self) -> int:
+        return self.changes[-1]["change_number"] if self.changes else 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/changes", self.get_changes)
+        app.router.add_post("/changes", self.post_change)
+        app.router.add_get("/stats", self.get_stats)
+        app.router.add_route("GET", "/{tail:.*}", self.replay)
+        return app
+
+    # ── change feed ──────────────────────────────────────────────────────
+    async def get_changes(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        try:
+            since = int(request.query.get("since", 0))
+        except ValueError:
+            return web.json_response({"error": "bad since"}, status=400)
+        apps = {}
+        for change in self.changes:
+            if change["change_number"] > since:
+                for appid in change["apps"]:
+                    apps[str(appid)] = change["change_number"]
+        return web.json_response({"change_number": self.change_number, "apps": apps})
+
+    async def post_change(self, request: web.Request) -> web.Response:
+        """Append a change touching the posted apps: {"apps": [appid, ...]}."""
+        data = await request.json()
+        change = {"change_number": self.change_number + 1, "apps": [int(a) for a in data.get("apps", [])]}
+        self.changes.append(change)
+        return web.json_response(change)
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests})
+
+    # ── recorded responses ───────────────────────────────────────────────
+    def _lookup(self, request: web.Request):
+        kind, appid = classify(request.path, request.query)
+        if kind is None:
+            return self.responses.get(request.path_qs) or self.responses.get(request.path), None
+        game = self.games.get(appid)
+        if game is not None:
+            return game.get(kind), None
+        if self.synthetic and self._templates:
+            template = self._templates[int(appid) % len(self._templates)]
+            return self.games[template].get(kind), (template, appid)
+        return None, None
+
+    async def replay(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        entry, swap = self._lookup(request)
+        if entry is None:
+            return web.json_response({"error": f"no recording for {request.path_qs}"}, status=404)
+
+        headers = dict(entry.get("headers", {}))
+        etag, modified = headers.get("ETag"), headers.get("Last-Modified")
+        if (etag and request.headers.get("If-None-Match") == etag) or (
+            modified and request.headers.get("If-Modified-Since") == modified
+        ):
+            return web.Response(status=304, headers={k: v for k, v in headers.items() if k != "Content-Type"})
+
+        body = entry.get("body", "")
+        if not isinstance(body, str):
+            body = json.dumps(body)
+            headers.setdefault("Content-Type", "application/json")
+        if swap is not None:
+            template, appid = swap
+            body = body.replace(f'"{template}"', f'"{appid}"')
+        return web.Response(status=entry.get("status", 200), headers=headers, text=body)
+
+
+# ─── record ──────────────────────────────────────────────────────────────────
+async def _record_one(session: aiohttp.ClientSession, url: str, as_json: bool, **kwargs) -> dict:
+    async with session.get(url, **kwargs) as r:
+        raw = await r.read()
+        body = raw.decode("utf-8", "replace")
+        if as_json:
+            try:
+                body = json.loads(body)
+            except ValueError:
+                pass
+        return {
+            "status": r.status,
+            "headers": {h: r.headers[h] for h in RECORD_HEADERS if h in r.headers},
+            "body": body,
+        }
+
+
+async def record(out: Path, appids: list):
+    corpus = json.loads(out.read_text(encoding="utf-8")) if out.exists() else {}
+    games = corpus.setdefault("games", {})
+    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+    async with aiohttp.ClientSession(headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as session:
+        for i, appid in enumerate(appids):
+            try:
+                games[str(appid)] = {
+                    "appdetails": await _record_one(
+                        session, "https://store.steampowered.com/api/appdetails", True,
+                        params={"appids": appid, "cc": "us", "l": "en"},
+                    ),
+                    "store": await _record_one(
+                        session, f"https://store.steampowered.com/app/{appid}/", False,
+                        cookies={"birthtime": "0", "mature_content": "1"},
+                    ),
+                    "steamcmd": await _record_one(
+                        session, f"https://api.steamcmd.net/v1/info/{appid}", True,
+                    ),
+                }
+                print(f"[{i + 1}/{len(appids)}] recorded {appid}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"[{i + 1}/{len(appids)}] {appid} failed: {e}")
+            await asyncio.sleep(RECORD_DELAY)
+    out.write_text(json.dumps(corpus), encoding="utf-8")
+    print(f"Corpus now holds {len(games)} game(s): {out}")
+
+
+# ─── bench ───────────────────────────────────────────────────────────────────
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_for(url: str, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(url) as r:
+                    return await r.json()
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+class _BenchConfig:
+    """In-memory stand-in for Red's Config, just enough for the cog's globals."""
+
+    def __init__(self):
+        self._values = {}
+
+    @classmethod
+    def get_conf(cls, cog, identifier, force_registration=False):
+        return cls()
+
+    def register_global(self, **defaults):
+        for key, value in defaults.items():
+            self._values.setdefault(key, value)
+
+    def __getattr__(self, key):
+        values = self._values
+
+        class Value:
+            async def __call__(self):
+                return values.get(key)
+
+            async def set(self, value):
+                values[key] = value
+
+        return Value()
+
+
+class _BenchChannel:
+    id = 1
+
+    def __init__(self):
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, content=None, embeds=(), **kwargs):
+        self.messages += 1
+        self.embeds += len(embeds)
+
+
+class _BenchBot:
+    def __init__(self, channel: _BenchChannel):
+        self.channel = channel
+
+    def get_channel(self, channel_id):
+        return self.channel
+
+    async def wait_until_red_ready(self):
+        await asyncio.Event().wait()  # keeps the cog's startup forcecheck from running
+
+
+async def bench(corpus_path: Path, sizes: list, concurrency: int, throttled: bool, feed: float):
+    """Time the cog's real check cycle (DenuvoWatch.check_games_internal).
+
+    Each size gets a fresh cog on a temp GameStore, with Red's Config swapped
+    for an in-memory stand-in and notices going to a counting fake channel, so
+    tier selection, the change feed, DenuvoCache, history and send_batched all
+    run as they do in the bot.
+    """
+    # Imported here so serve/record keep working without the cog's dependencies.
+    import contextlib
+    import io
+    import tempfile
+    from denuvowatch import denuvowatch as dw
+
+    recorded = sorted(json.loads(corpus_path.read_text(encoding="utf-8")).get("games", {}), key=int)
+    if not recorded:
+        sys.exit("The corpus has no games; record some first.")
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    # Separate process, so the CPU/memory figures below are the scanner's alone.
+    server = subprocess.Popen([
+        sys.executable, str(Path(__file__).resolve()), "serve", str(corpus_path),
+        "--port", str(port), "--synthetic",
+    ])
+    dw.Config = _BenchConfig
+    try:
+        await _wait_for(f"{base}/stats")
+        print("Cycles run DenuvoWatch.check_games_internal against the replay server. "
+              "cold/warm scan every game; tick is a due-only loop tick"
+              + (f" after a feed change touching {feed:.0%} of games." if feed else "."))
+        print(f"{'games':>6} {'cycle':>5} {'scanned':>8} {'wall s':>8} {'cpu s':>7} {'requests':>9} "
+              f"{'served':>7} {'peak MiB':>9} {'errors':>7} {'msgs':>5}")
+        for size in sizes:
+            appids = [int(a) for a in recorded[:size]]
+            appids += range(SYNTHETIC_BASE, SYNTHETIC_BASE + size - len(appids))
+            with tempfile.TemporaryDirectory() as tmp:
+                dw.cog_data_path = lambda cog: Path(tmp)
+                channel = _BenchChannel()
+                cog = dw.DenuvoWatch(_BenchBot(channel))
+                await cog.http.close()
+                cog.http = dw.SteamClient(base_url=base)
+                cog.session = cog.http.session
+                if not throttled:
+                    for name in list(cog.http.buckets):
+                        cog.http.set_budget(name, 1_000_000, 1_000)
+                await cog.config.notify_channel_id.set(channel.id)
+                await cog.config.scan_concurrency.set(concurrency)
+                if feed:
+                    await cog.config.change_feed_url.set(f"{base}/changes")
+                await cog.cog_load()
+                await cog._save_games({str(a): {"name": f"AppID {a}"} for a in appids})
+                try:
+                    for cycle in ("cold", "warm", "tick"):
+                        if cycle == "tick" and feed:
+                            # The first feed poll only sets the cursor.
+                            with contextlib.redirect_stdout(io.StringIO()):
+                                await cog.check_games_internal(due_only=True)
+                            changed = appids[:max(1, int(len(appids) * feed))]
+                            async with aiohttp.ClientSession() as session:
+                                await session.post(f"{base}/changes", json={"apps": changed})
+                        served_before = (await _wait_for(f"{base}/stats"))["requests"]
+                        sent_before = channel.messages
+                        cog._last_scan_stats = None
+                        tracemalloc.start()
+                        wall, cpu = time.perf_counter(), time.process_time()
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            await cog.check_games_internal(due_only=cycle == "tick")
+                        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+                        served = (await _wait_for(f"{base}/stats"))["requests"] - served_before
+                        stats = cog._last_scan_stats or dw.ScanStats()
+                        print(f"{size:>6} {cycle:>5} {stats.games:>8} {wall:>8.2f} {cpu:>7.2f} "
+                              f"{stats.requests:>9} {served:>7} {peak / 1_048_576:>9.1f} "
+                              f"{stats.errors:>7} {channel.messages - sent_before:>5}")
+                finally:
+                    cog.cog_unload()
+                    await asyncio.sleep(0)  # let the unload's client close run
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    serve_p = sub.add_parser("serve", help="serve a corpus on localhost")
+    serve_p.add_argument("corpus", type=Path)
+    serve_p.add_argument("--host", default="127.0.0.1")
+    serve_p.add_argument("--port", type=int, default=8765)
+    serve_p.add_argument("--synthetic", action="store_true", help="clone recorded games for unknown AppIDs")
+
+    record_p = sub.add_parser("record", help="record live Steam responses into a corpus")
+    record_p.add_argument("corpus", type=Path)
+    record_p.add_argument("appids", nargs="*", type=int)
+    record_p.add_argument("--export", type=Path, help="take AppIDs from a dexport file")
+
+    bench_p = sub.add_parser("bench", help="replay scan cycles against a corpus")
+    bench_p.add_argument("corpus", type=Path)
+    bench_p.add_argument("--sizes", nargs="+", type=int, default=[100, 500, 2000])
+    bench_p.add_argument("--concurrency", type=int, default=8)
+    bench_p.add_argument("--throttled", action="store_true", help="keep the real host budgets")
+    bench_p.add_argument("--feed", type=float, default=0.0, metavar="FRACTION",
+                         help="enable the change feed; the tick cycle scans this share of games")
+
+    args = parser.parse_args()
+    if args.cmd == "serve":
+        server = ReplayServer(json.loads(args.corpus.read_text(encoding="utf-8")), args.synthetic)
+        web.run_app(server.app(), host=args.host, port=args.port, print=None)
+    elif args.cmd == "record":
+        appids = list(args.appids)
+        if args.export:
+            payload = json.loads(args.export.read_text(encoding="utf-8"))
+            appids += [int(a) for a in payload.get("games", payload) if str(a).isdigit()]
+        if not appids:
+            parser.error("give AppIDs or --export")
+        asyncio.run(record(args.corpus, appids))
+    elif args.cmd == "bench":
+        asyncio.run(bench(args.corpus, args.sizes, args.concurrency, args.throttled, args.feed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""
+GameStore - SQLite-backed watchlist storage for DenuvoWatch.
+
+One row per watched AppID plus one row per recorded historical build, so a
+check cycle only reads the games it scans and only writes the ones that
+changed, instead of round-tripping the whole watchlist through Red Config.
+
+Build history is an append-only log per game: `builds` holds one row per
+superseded build (ID, push time, total size, depot count) and doubles as the
+size/cadence series, while `depot_deltas` stores only the depots whose
+manifest or size differ from the previous build. Every KEYFRAME_EVERY builds
+(and at the oldest kept build) the full depot set is written, so rebuilding
+any build reads one keyframe plus a bounded run of deltas.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    appid        INTEGER PRIMARY KEY,
+    name         TEXT NOT NULL,
+    name_key     TEXT NOT NULL,
+    denuvo       INTEGER NOT NULL DEFAULT 0,
+    build_id     TEXT,
+    build_time   INTEGER,
+    coming_soon  INTEGER NOT NULL DEFAULT 0,
+    release_date TEXT,
+    manifests    TEXT NOT NULL DEFAULT '{}',
+    depot_sizes  TEXT NOT NULL DEFAULT '{}',
+    release_key       INTEGER,
+    release_precision TEXT
+);
+CREATE INDEX IF NOT EXISTS games_by_name ON games (name_key);
+
+CREATE TABLE IF NOT EXISTS builds (
+    appid       INTEGER NOT NULL,
+    seq         INTEGER NOT NULL,
+    build_id    TEXT NOT NULL,
+    build_time  INTEGER,
+    recorded_at INTEGER NOT NULL,
+    total_size  INTEGER NOT NULL,
+    depot_count INTEGER NOT NULL,
+    keyframe    INTEGER NOT NULL,
+    PRIMARY KEY (appid, seq)
+);
+
+CREATE TABLE IF NOT EXISTS depot_deltas (
+    appid    INTEGER NOT NULL,
+    seq      INTEGER NOT NULL,
+    depot_id TEXT NOT NULL,
+    manifest TEXT,
+    size     INTEGER,
+    removed  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (appid, seq, depot_id)
+);
+"""
+
+SCHEMA_VERSION = 3
+KEYFRAME_EVERY = 25
+
+_LIGHT_COLUMNS = (
+    "appid, name, denuvo, build_id, build_time, coming_soon, release_date, "
+    "release_key, release_precision"
+)
+_FULL_COLUMNS = _LIGHT_COLUMNS + ", manifests, depot_sizes"
+_INSERT_GAME = (
+    "INSERT OR REPLACE INTO games (appid, name, name_key, denuvo, build_id, build_time, "
+    "coming_soon, release_date, release_key, release_precision, manifests, depot_sizes) "
+    "VALUES (?,?,?,?,?,?,?,?,?,?,?,?)"
+)
+
+
+def _row_to_entry(row: tuple) -> dict:
+    """Rebuild the dict shape the cog has always used for a watchlist entry."""
+    entry = {
+        "name": row[1],
+        "denuvo": bool(row[2]),
+        "build_id": row[3],
+        "build_time": row[4],
+    }
+    if row[5]:
+        entry["coming_soon"] = True
+        if row[6]:
+            entry["release_date"] = row[6]
+            entry["release_key"] = row[7]
+            entry["release_precision"] = row[8]
+    if len(row) > 9:
+        entry["manifests"] = json.loads(row[9])
+        entry["depot_sizes"] = json.loads(row[10])
+    return entry
+
+
+def _entry_to_row(appid_str: str, info: dict) -> tuple:
+    name = info.get("name") or f"AppID {appid_str}"
+    return (
+        int(appid_str),
+        name,
+        name.lower(),
+        int(bool(info.get("denuvo"))),
+        info.get("build_id"),
+        info.get("build_time"),
+        int(bool(info.get("coming_soon"))),
+        info.get("release_date"),
+        info.get("release_key"),
+        info.get("release_precision"),
+        json.dumps(info.get("manifests") or {}, separators=(",", ":")),
+        json.dumps(info.get("depot_sizes") or {}, separators=(",", ":")),
+    )
+
+
+class GameStore:
+    """Watchlist + build history in a single SQLite file.
+
+    All methods are coroutines that run the query in a worker thread; a lock
+    serialises access to the one shared connection.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    # ── plumbing ─────────────────────────────────────────────────────────
+    def _open(self):
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with conn:
+                if version < 2:
+                    _migrate_flat_history(conn)
+                if version < 3:
+                    _add_release_columns(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        self._conn = conn
+
+    def _run(self, fn, *args):
+        with self._lock:
+            return fn(self._conn, *args)
+
+    async def _call(self, fn, *args):
+        return await asyncio.to_thread(self._run, fn, *args)
+
+    async def open(self):
+        await asyncio.to_thread(self._open)
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    # ── games ────────────────────────────────────────────────────────────
+    async def count(self) -> int:
+        def q(conn):
+            return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        return await self._call(q)
+
+    async def load_games(self, depots: bool = True) -> dict:
+        """All games as {appid_str: entry}, ordered by name.
+
+        With depots=False the manifest/depot-size maps are left out, which
+        keeps listing and scheduling cheap on large watchlists.
+        """
+        cols = _FULL_COLUMNS if depots else _LIGHT_COLUMNS
+
+        def q(conn):
+            rows = conn.execute(f"SELECT {cols} FROM games ORDER BY name_key").fetchall()
+            return {str(row[0]): _row_to_entry(row) for row in rows}
+        return await self._call(q)
+
+    async def get_games(self, appids: Iterable[str]) -> dict:
+        """Full entries for the given AppIDs (missing ones are skipped)."""
+        ids = [int(a) for a in appids]
+
+        def q(conn):
+            out = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT {_FULL_COLUMNS} FROM games WHERE appid IN ({marks})", chunk
+                ):
+                    out[str(row[0])] = _row_to_entry(row)
+            return out
+        return await self._call(q)
+
+    async def load_upcoming(self) -> list:
+        """Unreleased games as [(appid_str, entry)], soonest first, TBA last."""
+        def q(conn):
+            rows = conn.execute(
+                f"SELECT {_LIGHT_COLUMNS} FROM games WHERE coming_soon = 1 "
+                "ORDER BY release_key IS NULL, release_key, name_key"
+            ).fetchall()
+            return [(str(row[0]), _row_to_entry(row)) for row in rows]
+        return await self._call(q)
+
+    async def backfill_release_keys(self, normalize: Callable[[str], tuple]) -> int:
+        """Fill release_key/release_precision for rows stored before they existed."""
+        def q(conn):
+            rows = conn.execute(
+                "SELECT appid, release_date FROM games WHERE coming_soon = 1 "
+                "AND release_date IS NOT NULL AND release_precision IS NULL"
+            ).fetchall()
+            with conn:
+                conn.executemany(
+                    "UPDATE games SET release_key = ?, release_precision = ? WHERE appid = ?",
+                    [(*normalize(date), appid) for appid, date in rows],
+                )
+            return len(rows)
+        return await self._call(q)
+
+    async def get_game(self, appid_str: str) -> Optional[dict]:
+        return (await self.get_games([appid_str])).get(str(appid_str))
+
+    async def upsert_games(self, games: dict):
+        """Insert or replace the given {appid_str: entry} rows in one transaction."""
+        rows = [_entry_to_row(a, info) for a, info in games.items()]
+        if not rows:
+            return
+
+        def q(conn):
+            with conn:
+                conn.executemany(
+                    _INSERT_GAME, rows
+                )
+        await self._call(q)
+
+    async def delete_game(self, appid_str: str):
+        def q(conn):
+            with conn:
+                conn.execute("DELETE FROM games WHERE appid = ?", (int(appid_str),))
+                conn.execute("DELETE FROM builds WHERE appid = ?", (int(appid_str),))
+                conn.execute("DELETE FROM depot_deltas WHERE appid = ?", (int(appid_str),))
+        await self._call(q)
+
+    async def clear(self):
+        def q(conn):
+            with conn:
+                conn.execute("DELETE FROM games")
+                conn.execute("DELETE FROM builds")
+                conn.execute("DELETE FROM depot_deltas")
+        await self._call(q)
+
+    # ── history ──────────────────────────────────────────────────────────
+    async def get_build(self, appid_str: str, back: int) -> Optional[dict]:
+        """The `back`-th most recent superseded build (1 = previous), or None.
+
+        Returns {"build_id", "build_time", "manifests", "depot_sizes"}.
+        """
+        appid = int(appid_str)
+
+        def q(conn):
+            row = conn.execute(
+                "SELECT seq, build_id, build_time FROM builds WHERE appid = ? "
+                "ORDER BY seq DESC LIMIT 1 OFFSET ?",
+                (appid, back - 1),
+            ).fetchone()
+            if row is None:
+                return None
+            manifests, depot_sizes = _split_state(_state_at(conn, appid, row[0]))
+            return {
+                "build_id": row[1],
+                "build_time": row[2],
+                "manifests": manifests,
+                "depot_sizes": depot_sizes,
+            }
+        return await self._call(q)
+
+    async def build_count(self, appid_str: str) -> int:
+        def q(conn):
+            return conn.execute(
+                "SELECT COUNT(*) FROM builds WHERE appid = ?", (int(appid_str),)
+            ).fetchone()[0]
+        return await self._call(q)
+
+    async def history_counts(self, since: Optional[float] = None) -> dict:
+        """{appid_str: recorded builds} for every game with history.
+
+        With `since`, only builds pushed (or, lacking a push time, recorded)
+        at or after that unix time are counted.
+        """
+        def q(conn):
+            if since is None:
+                rows = conn.execute("SELECT appid, COUNT(*) FROM builds GROUP BY appid")
+            else:
+                rows = conn.execute(
+                    "SELECT appid, COUNT(*) FROM builds "
+                    "WHERE COALESCE(build_time, recorded_at) >= ? GROUP BY appid",
+                    (int(since),),
+                )
+            return {str(a): n for a, n in rows.fetchall()}
+        return await self._call(q)
+
+    async def size_series(self, appid_str: str) -> list:
+        """Superseded builds oldest first, without touching the depot deltas.
+
+        Each item is {"build_id", "build_time", "recorded_at", "total_size", "depot_count"}.
+        """
+        def q(conn):
+            rows = conn.execute(
+                "SELECT build_id, build_time, recorded_at, total_size, depot_count "
+                "FROM builds WHERE appid = ? ORDER BY seq",
+                (int(appid_str),),
+            ).fetchall()
+            return [
+                {
+                    "build_id": b,
+                    "build_time": bt,
+                    "recorded_at": ra,
+                    "total_size": ts,
+                    "depot_count": dc,
+                }
+                for b, bt, ra, ts, dc in rows
+            ]
+        return await self._call(q)
+
+    async def add_history(self, entries: list, keep: int):
+        """Record superseded builds in one transaction.
+
+        `entries` holds (appid_str, build_id, build_time, manifests, depot_sizes)
+        tuples. A build is skipped when the game's latest entry already has
+        the same manifests, and only the newest `keep` builds per game are kept.
+        """
+        if not entries:
+            return
+
+        def q(conn):
+            with conn:
+                for appid_str, build_id, build_time, manifests, depot_sizes in entries:
+                    appid = int(appid_str)
+                    _append_build(conn, appid, build_id, build_time, manifests, depot_sizes)
+                    _trim_builds(conn, appid, keep)
+        await self._call(q)
+
+    # ── migration ────────────────────────────────────────────────────────
+    async def import_legacy(self, games: dict, history: dict):
+        """Bulk-load the old Config `games` and `history` blobs."""
+        rows = [
+            _entry_to_row(a, info)
+            for a, info in games.items()
+            if str(a).isdigit() and isinstance(info, dict)
+        ]
+
+        def q(conn):
+            with conn:
+                conn.executemany(
+                    _INSERT_GAME, rows
+                )
+                for appid_str, builds in history.items():
+                    if not str(appid_str).isdigit() or not isinstance(builds, dict):
+                        continue
+                    for build_id, entry in builds.items():
+                        _append_build(
+                            conn, int(appid_str), build_id, None,
+                            entry.get("manifests", {}), entry.get("depot_sizes", {}),
+                        )
+        await self._call(q)
+
+
+# ─── Build history encoding ──────────────────────────────────────────────────
+# A depot state is {depot_id: (manifest or None, size or None)}.
+
+def _split_state(state: dict) -> tuple:
+    manifests = {d: m for d, (m, _) in state.items() if m is not None}
+    depot_sizes = {d: s for d, (_, s) in state.items() if s is not None}
+    return manifests, depot_sizes
+
+
+def _state_at(conn: sqlite3.Connection, appid: int, seq: int) -> dict:
+    """Rebuild a build's depots from the nearest keyframe at or before it."""
+    start = conn.execute(
+        "SELECT MAX(seq) FROM builds WHERE appid = ? AND seq <= ? AND keyframe = 1",
+        (appid, seq),
+    ).fetchone()[0]
+    state = {}
+    if start is None:
+        return state
+    for depot_id, manifest, size, removed in conn.execute(
+        "SELECT depot_id, manifest, size, removed FROM depot_deltas "
+        "WHERE appid = ? AND seq BETWEEN ? AND ? ORDER BY seq",
+        (appid, start, seq),
+    ):
+        if removed:
+            state.pop(depot_id, None)
+        else:
+            state[depot_id] = (manifest, size)
+    return state
+
+
+def _append_build(conn, appid: int, build_id, build_time, manifests: dict, depot_sizes: dict):
+    last = conn.execute(
+        "SELECT seq, build_id FROM builds WHERE appid = ? ORDER BY seq DESC LIMIT 1",
+        (appid,),
+    ).fetchone()
+    prev = _state_at(conn, appid, last[0]) if last is not None else {}
+    if last is not None and (last[1] == str(build_id) or _split_state(prev)[0] == manifests):
+        return
+
+    state = {
+        str(d): (
+            str(manifests[d]) if d in manifests else None,
+            int(depot_sizes[d]) if d in depot_sizes else None,
+        )
+        for d in set(manifests) | set(depot_sizes)
+    }
+    seq = last[0] + 1 if last is not None else 0
+    last_key = conn.execute(
+        "SELECT MAX(seq) FROM builds WHERE appid = ? AND keyframe = 1", (appid,)
+    ).fetchone()[0]
+    keyframe = last_key is None or seq - last_key >= KEYFRAME_EVERY
+
+    if keyframe:
+        deltas = [(appid, seq, d, m, s, 0) for d, (m, s) in state.items()]
+    else:
+        deltas = [(appid, seq, d, m, s, 0) for d, (m, s) in state.items() if prev.get(d) != (m, s)]
+        deltas += [(appid, seq, d, None, None, 1) for d in prev if d not in state]
+
+    conn.execute(
+        "INSERT INTO builds VALUES (?,?,?,?,?,?,?,?)",
+        (
+            appid, seq, str(build_id), build_time, int(time.time()),
+            sum(s for _, s in state.values() if s), len(state), int(keyframe),
+        ),
+    )
+    conn.executemany("INSERT INTO depot_deltas VALUES (?,?,?,?,?,?)", deltas)
+
+
+def _trim_builds(conn, appid: int, keep: int):
+    """Drop builds beyond the newest `keep`, re-keyframing the new oldest one."""
+    row = conn.execute(
+        "SELECT seq, keyframe FROM builds WHERE appid = ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+        (appid, keep - 1),
+    ).fetchone()
+    if row is None:
+        return
+    oldest, is_key = row
+    if not is_key:
+        state = _state_at(conn, appid, oldest)
+        conn.execute("DELETE FROM depot_deltas WHERE appid = ? AND seq = ?", (appid, oldest))
+        conn.executemany(
+            "INSERT INTO depot_deltas VALUES (?,?,?,?,?,0)",
+            [(appid, oldest, d, m, s) for d, (m, s) in state.items()],
+        )
+        conn.execute("UPDATE builds SET keyframe = 1 WHERE appid = ? AND seq = ?", (appid, oldest))
+    conn.execute("DELETE FROM builds WHERE appid = ? AND seq < ?", (appid, oldest))
+    conn.execute("DELETE FROM depot_deltas WHERE appid = ? AND seq < ?", (appid, oldest))
+
+
+# ─── Schema migrations ───────────────────────────────────────────────────────
+def _add_release_columns(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(games)")}
+    if "release_key" not in columns:
+        conn.execute("ALTER TABLE games ADD COLUMN release_key INTEGER")
+        conn.execute("ALTER TABLE games ADD COLUMN release_precision TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS games_upcoming ON games (coming_soon, release_key)")
+
+
+def _migrate_flat_history(conn):
+    """Move rows from the old one-JSON-blob-per-build `history` table into the log."""
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history'"
+    ).fetchone() is None:
+        return
+    for appid, build_id, manifests, depot_sizes in conn.execute(
+        "SELECT appid, build_id, manifests, depot_sizes FROM history ORDER BY appid, seq"
+    ).fetchall():
+        _append_build(conn, appid, build_id, None, json.loads(manifests), json.loads(depot_sizes))
+    conn.execute("DROP TABLE history")